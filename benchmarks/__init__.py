@@ -0,0 +1,5 @@
+"""
+Benchmarks for the LMSystems SDK against a local fake backend.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
@@ -0,0 +1,130 @@
+"""
+Run the benchmark scenarios and write machine-readable results.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --scenario concurrent_stream --chunks 50 --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from typing import Optional
+
+from .scenarios import SCENARIOS, BenchmarkOptions
+from .server import FakeServer, ServerSettings
+
+
+def _version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("lmsystems")
+    except Exception:
+        return "unknown"
+
+
+def _flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not name.endswith(".count"):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    List measurements that regressed by more than ``threshold`` (a fraction).
+
+    Throughput (``*_per_s``) regresses when it drops, everything else (latency)
+    when it grows.
+    """
+    before = _flatten(baseline.get("scenarios", {}))
+    after = _flatten(current.get("scenarios", {}))
+    regressions = []
+    for name, old in before.items():
+        new = after.get(name)
+        if new is None or not old:
+            continue
+        change = (new - old) / old
+        if name.endswith("_per_s"):
+            change = -change
+        if change > threshold:
+            regressions.append((name, old, new, change))
+    return regressions
+
+
+def run(scenarios: list, settings: ServerSettings, options: BenchmarkOptions) -> dict:
+    results = {
+        "lmsystems_version": _version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "server": settings.to_dict(),
+        "options": vars(options),
+        "scenarios": {},
+    }
+    with FakeServer(settings) as server:
+        for name in scenarios:
+            server.reset_counts()
+            started = time.perf_counter()
+            scenario_results = asyncio.run(SCENARIOS[name](server, options))
+            scenario_results["wall_time"] = time.perf_counter() - started
+            scenario_results["requests"] = dict(server.requests)
+            results["scenarios"][name] = scenario_results
+            print(f"{name}: {scenario_results['wall_time']:.2f}s", file=sys.stderr)
+    return results
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--output", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change that counts as a regression (default: 0.10)")
+    parser.add_argument("--iterations", type=int, default=BenchmarkOptions.iterations)
+    parser.add_argument("--concurrency", type=int, default=BenchmarkOptions.concurrency)
+    parser.add_argument("--runs", type=int, default=BenchmarkOptions.runs)
+    parser.add_argument("--latency", type=float, default=ServerSettings.latency,
+                        help="Seconds the server waits before each response")
+    parser.add_argument("--graph-info-latency", type=float, default=ServerSettings.graph_info_latency)
+    parser.add_argument("--chunks", type=int, default=ServerSettings.chunks)
+    parser.add_argument("--chunk-interval", type=float, default=ServerSettings.chunk_interval)
+    parser.add_argument("--chunk-size", type=int, default=ServerSettings.chunk_size)
+    args = parser.parse_args(argv)
+
+    settings = ServerSettings(
+        latency=args.latency,
+        chunks=args.chunks,
+        chunk_interval=args.chunk_interval,
+        chunk_size=args.chunk_size,
+        graph_info_latency=args.graph_info_latency,
+    )
+    options = BenchmarkOptions(iterations=args.iterations, concurrency=args.concurrency, runs=args.runs)
+    results = run(args.scenario or list(SCENARIOS), settings, options)
+
+    encoded = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: {old:.6g} -> {new:.6g} ({change:+.1%})", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Import-time budget for the SDK's entry points.
+
+Each entry point is imported in a fresh interpreter, several times, and the
+best time is compared against its budget. Entry points that must stay light
+are also checked for heavy modules they must not load.
+
+    python -m benchmarks.imports
+    python -m benchmarks.imports --output imports.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Optional
+
+# Budgets in milliseconds, with headroom for slower machines
+BUDGETS = {
+    "lmsystems": 20,
+    "lmsystems.client": 250,
+    "lmsystems.purchased_graph": 3000,
+}
+FORBIDDEN = {
+    "lmsystems": ("httpx", "jwt", "langgraph", "langgraph_sdk", "langchain_core"),
+    "lmsystems.client": ("jwt", "langgraph", "langgraph_sdk", "langchain_core"),
+}
+
+_PROBE = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(elapsed, *[name for name in {forbidden!r} if name in sys.modules])
+"""
+
+
+def measure(module: str, repeat: int = 5) -> dict:
+    """Import ``module`` in ``repeat`` fresh interpreters and keep the best time."""
+    times = []
+    loaded = set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, forbidden=FORBIDDEN.get(module, ()))],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        times.append(float(output[0]) * 1000)
+        loaded.update(output[1:])
+    best = min(times)
+    return {
+        "best_ms": best,
+        "budget_ms": BUDGETS[module],
+        "forbidden_loaded": sorted(loaded),
+        "ok": best <= BUDGETS[module] and not loaded,
+    }
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.imports", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    results = {module: measure(module, args.repeat) for module in BUDGETS}
+    for module, result in results.items():
+        status = "ok" if result["ok"] else "OVER BUDGET"
+        extra = f" (loads {', '.join(result['forbidden_loaded'])})" if result["forbidden_loaded"] else ""
+        print(f"{module}: {result['best_ms']:.1f}ms / {result['budget_ms']}ms {status}{extra}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    return 0 if all(result["ok"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
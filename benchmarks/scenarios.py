@@ -0,0 +1,217 @@
+"""
+Benchmark scenarios run against a ``FakeServer``.
+
+Each scenario takes the running server and a ``BenchmarkOptions`` and returns a
+dict of measurements: latency summaries in seconds and throughput per second.
+Every scenario builds its own transport and graph info cache, so results don't
+depend on the order scenarios run in.
+"""
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from lmsystems.client import LmsystemsClient, SyncLmsystemsClient
+from lmsystems.graph_info import GraphInfoCache
+from lmsystems.transport import Transport
+
+from .server import FakeServer
+
+GRAPH_NAME = "benchmark-graph"
+API_KEY = "benchmark-api-key"
+INPUT = {"messages": [{"role": "user", "content": "benchmark"}]}
+
+
+@dataclass
+class BenchmarkOptions:
+    """
+    Size of each scenario.
+
+    Attributes:
+        iterations: Repetitions of sequential measurements
+        concurrency: Number of concurrent runs or invocations
+        runs: Total runs per concurrent scenario
+    """
+
+    iterations: int = 20
+    concurrency: int = 32
+    runs: int = 200
+
+
+def summarize(values: list) -> dict:
+    """Latency summary of a list of measurements."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "min": ordered[0],
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": ordered[-1],
+    }
+
+
+def _client_kwargs(server: FakeServer, transport: Transport) -> dict:
+    return {
+        "graph_name": GRAPH_NAME,
+        "api_key": API_KEY,
+        "base_url": server.url,
+        "graph_info_cache": GraphInfoCache(),
+        "transport": transport,
+    }
+
+
+async def _consume(stream: Any, started: float) -> tuple:
+    """Drain a stream, returning (time to first chunk, chunk count)."""
+    first_chunk = None
+    chunks = 0
+    async for _ in stream:
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        chunks += 1
+    return first_chunk, chunks
+
+
+async def cold_start(server: FakeServer, options: BenchmarkOptions) -> dict:
+    """Client creation and first streamed chunk with nothing cached or pooled."""
+    create, first_chunk = [], []
+    for _ in range(options.iterations):
+        transport = Transport()
+        started = time.perf_counter()
+        client = await LmsystemsClient.create(**_client_kwargs(server, transport))
+        create.append(time.perf_counter() - started)
+        ttfc, _ = await _consume(client.stream(INPUT), started)
+        first_chunk.append(ttfc)
+        await transport.aclose()
+    return {"create": summarize(create), "first_chunk": summarize(first_chunk)}
+
+
+async def _concurrent(server: FakeServer, options: BenchmarkOptions, run_one: Callable) -> dict:
+    transport = Transport(max_connections=options.concurrency * 2)
+    client = await LmsystemsClient.create(**_client_kwargs(server, transport))
+    semaphore = asyncio.Semaphore(options.concurrency)
+    first_chunk, total, chunks = [], [], []
+
+    async def task() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            ttfc, count = await run_one(client, started)
+            first_chunk.append(ttfc)
+            total.append(time.perf_counter() - started)
+            chunks.append(count)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(task() for _ in range(options.runs)))
+    elapsed = time.perf_counter() - started
+    await transport.aclose()
+    return {
+        "first_chunk": summarize(first_chunk),
+        "run": summarize(total),
+        "runs_per_s": options.runs / elapsed,
+        "chunks_per_s": sum(chunks) / elapsed,
+    }
+
+
+async def concurrent_stream_run(server: FakeServer, options: BenchmarkOptions) -> dict:
+    """Concurrent create_thread, create_run and stream_run sequences."""
+
+    async def run_one(client: LmsystemsClient, started: float) -> tuple:
+        thread = await client.create_thread()
+        run = await client.create_run(thread, input=INPUT)
+        return await _consume(client.stream_run(thread, run), started)
+
+    return await _concurrent(server, options, run_one)
+
+
+async def concurrent_stream(server: FakeServer, options: BenchmarkOptions) -> dict:
+    """Concurrent single-request ``client.stream`` runs."""
+
+    async def run_one(client: LmsystemsClient, started: float) -> tuple:
+        return await _consume(client.stream(INPUT), started)
+
+    return await _concurrent(server, options, run_one)
+
+
+async def purchased_graph_invoke(server: FakeServer, options: BenchmarkOptions) -> dict:
+    """PurchasedGraph.abatch throughput and sequential invoke latency."""
+    from lmsystems.purchased_graph import PurchasedGraph
+
+    transport = Transport(max_connections=options.concurrency * 2)
+    graph = await PurchasedGraph.acreate(
+        GRAPH_NAME,
+        API_KEY,
+        base_url=server.url,
+        graph_info_cache=GraphInfoCache(),
+        transport=transport,
+        max_concurrency=options.concurrency,
+    )
+
+    started = time.perf_counter()
+    await graph.abatch([INPUT] * options.runs)
+    batch_elapsed = time.perf_counter() - started
+
+    latencies = []
+    for _ in range(options.iterations):
+        started = time.perf_counter()
+        await graph.ainvoke(INPUT)
+        latencies.append(time.perf_counter() - started)
+
+    sync_latencies = []
+    for _ in range(options.iterations):
+        started = time.perf_counter()
+        await asyncio.to_thread(graph.invoke, INPUT)
+        sync_latencies.append(time.perf_counter() - started)
+
+    await transport.aclose()
+    transport.close()
+    return {
+        "abatch_invokes_per_s": options.runs / batch_elapsed,
+        "ainvoke": summarize(latencies),
+        "invoke": summarize(sync_latencies),
+    }
+
+
+async def sync_vs_async(server: FakeServer, options: BenchmarkOptions) -> dict:
+    """Sequential thread, run and join with the sync and the async client."""
+    transport = Transport()
+    async_client = await LmsystemsClient.create(**_client_kwargs(server, transport))
+    async_latencies = []
+    for _ in range(options.iterations):
+        started = time.perf_counter()
+        thread = await async_client.create_thread()
+        run = await async_client.create_run(thread, input=INPUT)
+        await async_client.runs.join(thread["thread_id"], run["run_id"])
+        async_latencies.append(time.perf_counter() - started)
+
+    def run_sync() -> list:
+        sync_client = SyncLmsystemsClient(stream_mode=False, **_client_kwargs(server, transport))
+        latencies = []
+        for _ in range(options.iterations):
+            started = time.perf_counter()
+            thread = sync_client.threads.create()
+            run = sync_client.create_run(thread, input=INPUT)
+            sync_client.join_run(thread, run)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    sync_latencies = await asyncio.to_thread(run_sync)
+    await transport.aclose()
+    transport.close()
+    return {"async": summarize(async_latencies), "sync": summarize(sync_latencies)}
+
+
+SCENARIOS = {
+    "cold_start": cold_start,
+    "concurrent_stream_run": concurrent_stream_run,
+    "concurrent_stream": concurrent_stream,
+    "purchased_graph_invoke": purchased_graph_invoke,
+    "sync_vs_async": sync_vs_async,
+}
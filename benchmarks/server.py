@@ -0,0 +1,265 @@
+"""
+Local stand-in for the LMSystems backend and a LangGraph deployment.
+
+Serves ``/api/get_graph_info`` plus the thread, run and SSE stream endpoints the
+SDK uses, with configurable latency, chunk count, chunk size and chunk rate.
+It runs on its own event loop in a background thread so sync clients can be
+benchmarked against it too.
+"""
+import asyncio
+import itertools
+import json
+import threading
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+
+@dataclass
+class ServerSettings:
+    """
+    Behaviour of the fake server.
+
+    Attributes:
+        latency: Seconds added before every response
+        chunks: Number of ``values`` events per streamed run
+        chunk_interval: Seconds between streamed events
+        chunk_size: Approximate size of each event payload, in bytes
+        graph_info_latency: Extra seconds added to ``/api/get_graph_info``
+        graph_info_status: Status code of ``/api/get_graph_info`` (an error body unless 200)
+        missing_graphs: Graph names ``/api/get_graph_info`` answers with a 404
+    """
+
+    latency: float = 0.0
+    chunks: int = 20
+    chunk_interval: float = 0.0
+    chunk_size: int = 256
+    graph_info_latency: float = 0.0
+    graph_info_status: int = 200
+    missing_graphs: tuple = ()
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class FakeServer:
+    """
+    Minimal HTTP/1.1 server faking the LMSystems and LangGraph APIs.
+
+    Attributes:
+        settings: Current server behaviour, may be changed between scenarios
+        url: Base URL once started
+        requests: Number of requests served per route
+        paths: Path of the last request served per route
+        bodies: Decoded JSON body of the last request served per route, if it had one
+    """
+
+    def __init__(self, settings: Optional[ServerSettings] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.settings = settings or ServerSettings()
+        self.host = host
+        self.port = port
+        self.url: Optional[str] = None
+        self.requests: dict[str, int] = {}
+        self.paths: dict[str, str] = {}
+        self.bodies: dict[str, dict] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ids = itertools.count()
+
+    def start(self) -> "FakeServer":
+        """Start serving in a background thread and wait until it accepts connections."""
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            self.url = f"http://{self.host}:{self.port}"
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="lmsystems-benchmark-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+
+        async def shutdown() -> None:
+            self._server.close()
+            # Close connections still open, so no handler outlives the loop
+            handlers = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in handlers:
+                task.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_counts(self) -> None:
+        self.requests = {}
+        self.paths = {}
+        self.bodies = {}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if line:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                body = b""
+                if int(headers.get("content-length", 0)):
+                    body = await reader.readexactly(int(headers["content-length"]))
+                path = target.split("?", 1)[0]
+                await self._route(method, path, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Cancelled by stop()
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        settings = self.settings
+        parts = [part for part in path.split("/") if part]
+        route = self._route_name(method, parts)
+        self.requests[route] = self.requests.get(route, 0) + 1
+        self.paths[route] = path
+        if body:
+            self.bodies[route] = json.loads(body)
+
+        if settings.latency:
+            await asyncio.sleep(settings.latency)
+
+        if route == "get_graph_info":
+            if settings.graph_info_latency:
+                await asyncio.sleep(settings.graph_info_latency)
+            graph_name = json.loads(body or b"{}").get("graph_name", "benchmark-graph")
+            status = 404 if graph_name in settings.missing_graphs else settings.graph_info_status
+            if status != 200:
+                await self._respond(writer, status, b'{"detail":"error"}', "application/json")
+                return
+            await self._json(writer, {
+                "graph_name": graph_name,
+                "graph_url": self.url,
+                "lgraph_api_key": "benchmark-key",
+                "assistant_id": "benchmark-assistant",
+                "configurables": {"configurable": {"model": "benchmark"}},
+            })
+        elif route == "ok":
+            await self._json(writer, {"ok": True})
+        elif route == "create_thread":
+            thread_id = json.loads(body or b"{}").get("thread_id") or str(uuid.uuid4())
+            await self._json(writer, {"thread_id": thread_id, "metadata": {}, "status": "idle"})
+        elif route == "create_run":
+            await self._json(writer, self._run(parts[1]))
+        elif route == "join_run":
+            await self._json(writer, self._values(settings.chunks - 1))
+        elif route in ("stream_run", "join_stream"):
+            thread_id = parts[1] if parts[0] == "threads" else None
+            await self._stream(writer, self._run(thread_id))
+        elif route == "wait_run":
+            await self._json(writer, self._values(settings.chunks - 1))
+        elif route == "get_run":
+            await self._json(writer, {**self._run(parts[1]), "run_id": parts[3], "status": "success"})
+        elif route == "cancel_run":
+            await self._respond(writer, 204, b"", "application/json")
+        elif route == "delete_thread":
+            await self._respond(writer, 204, b"", "application/json")
+        else:
+            await self._respond(writer, 404, b'{"detail":"Not Found"}', "application/json")
+
+    @staticmethod
+    def _route_name(method: str, parts: list) -> str:
+        if parts == ["api", "get_graph_info"]:
+            return "get_graph_info"
+        if parts == ["ok"]:
+            return "ok"
+        if method == "POST" and parts == ["threads"]:
+            return "create_thread"
+        if method == "DELETE" and len(parts) == 2 and parts[0] == "threads":
+            return "delete_thread"
+        if parts[-1:] == ["stream"]:
+            return "join_stream" if method == "GET" else "stream_run"
+        if parts[-1:] == ["wait"]:
+            return "wait_run"
+        if parts[-1:] == ["join"]:
+            return "join_run"
+        if method == "POST" and parts[-1:] == ["cancel"]:
+            return "cancel_run"
+        if method == "POST" and len(parts) == 3 and parts[0] == "threads" and parts[2] == "runs":
+            return "create_run"
+        if method == "GET" and len(parts) == 4 and parts[0] == "threads" and parts[2] == "runs":
+            return "get_run"
+        return "unknown"
+
+    def _run(self, thread_id: Optional[str]) -> dict:
+        return {
+            "run_id": f"run-{next(self._ids)}",
+            "thread_id": thread_id,
+            "assistant_id": "benchmark-assistant",
+            "status": "pending",
+        }
+
+    def _values(self, index: int) -> dict:
+        return {"messages": [{"type": "ai", "content": "x" * self.settings.chunk_size}], "step": index}
+
+    async def _stream(self, writer: asyncio.StreamWriter, run: dict) -> None:
+        settings = self.settings
+        location = f"/runs/{run['run_id']}"
+        if run["thread_id"]:
+            location = f"/threads/{run['thread_id']}{location}"
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            + f"Content-Location: {location}\r\n\r\n".encode()
+        )
+        self._chunk(writer, f"event: metadata\r\ndata: {json.dumps({'run_id': run['run_id']})}\r\nid: 0\r\n\r\n".encode())
+        for index in range(settings.chunks):
+            if settings.chunk_interval:
+                await writer.drain()
+                await asyncio.sleep(settings.chunk_interval)
+            payload = json.dumps(self._values(index))
+            self._chunk(writer, f"event: values\r\ndata: {payload}\r\nid: {index + 1}\r\n\r\n".encode())
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    async def _json(self, writer: asyncio.StreamWriter, payload: dict) -> None:
+        await self._respond(writer, 200, json.dumps(payload).encode(), "application/json")
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, body: bytes, content_type: str) -> None:
+        reason = {200: "OK", 204: "No Content", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
@@ -1,3 +1,30 @@
-from .purchased_graph import PurchasedGraph
+from typing import TYPE_CHECKING
 
-__all__ = ['PurchasedGraph']
+if TYPE_CHECKING:
+    from .client import LmsystemsClient, SyncLmsystemsClient
+    from .purchased_graph import PurchasedGraph
+
+__all__ = ['PurchasedGraph', 'LmsystemsClient', 'SyncLmsystemsClient']
+
+# Submodules are imported on first access, so `import lmsystems` stays cheap and
+# code using only the clients never loads langgraph
+_LAZY_ATTRIBUTES = {
+    'PurchasedGraph': '.purchased_graph',
+    'LmsystemsClient': '.client',
+    'SyncLmsystemsClient': '.client',
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
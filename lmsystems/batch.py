@@ -0,0 +1,135 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Optional, Union
+
+_DONE = object()
+
+# Ordered results buffered behind a slow item, per unit of concurrency
+ORDERED_WINDOW_FACTOR = 4
+
+
+@dataclass
+class RunResult:
+    """
+    Outcome of one item in a batch.
+
+    Attributes:
+        index: Position of the item in the batch input
+        input: The input that was run
+        output: The run result (or the list of streamed chunks)
+        error: The exception raised for this item, if any
+        thread: Thread the run was created on, when applicable
+        run: The created run, when applicable
+        duration: Seconds spent on the item
+    """
+
+    index: int
+    input: Any
+    output: Any = None
+    error: Optional[BaseException] = None
+    thread: Optional[dict] = None
+    run: Optional[dict] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def bounded_map(
+    func: Callable[[int, Any], Awaitable[Any]],
+    items: Union[Iterable, AsyncIterable],
+    concurrency: int,
+    ordered: bool = False,
+    window: Optional[int] = None,
+) -> AsyncIterator[Any]:
+    """
+    Run ``func(index, item)`` over ``items`` with at most ``concurrency`` calls in flight.
+
+    Items are pulled lazily, so a large or unbounded input is never held in memory.
+    Results are yielded as they complete, or in input order when ``ordered`` is set.
+    In ordered mode no item more than ``window`` positions past the oldest
+    unfinished one is started, so a slow item holds back at most ``window``
+    finished results instead of letting them pile up.
+    ``func`` is expected to report its own per-item errors; an exception escaping
+    it stops the whole batch. Closing the iterator early cancels the workers.
+
+    Args:
+        func: Coroutine function called with the item index and the item
+        items: Sync or async iterable of inputs
+        concurrency: Maximum number of concurrent calls
+        ordered: Yield results in input order instead of completion order
+        window: Most items in flight or waiting to be yielded in ordered mode
+            (defaults to ``concurrency * ORDERED_WINDOW_FACTOR``)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if window is None:
+        window = concurrency * ORDERED_WINDOW_FACTOR
+    elif window < concurrency:
+        raise ValueError("window must be at least concurrency")
+
+    if isinstance(items, AsyncIterable):
+        source = items.__aiter__()
+        is_async = True
+    else:
+        source = iter(items)
+        is_async = False
+
+    source_lock = asyncio.Lock()
+    next_index = 0
+    expected = 0
+    advanced = asyncio.Event()
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def pull() -> tuple:
+        nonlocal next_index
+        async with source_lock:
+            while ordered and next_index >= expected + window:
+                advanced.clear()
+                await advanced.wait()
+            try:
+                item = await source.__anext__() if is_async else next(source)
+            except (StopIteration, StopAsyncIteration):
+                return _DONE, None
+            index = next_index
+            next_index += 1
+            return index, item
+
+    async def worker() -> None:
+        try:
+            while True:
+                index, item = await pull()
+                if index is _DONE:
+                    break
+                await results.put((index, await func(index, item)))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await results.put((_DONE, e))
+            return
+        await results.put((_DONE, None))
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    pending: dict[int, Any] = {}
+    running = len(workers)
+    try:
+        while running:
+            index, value = await results.get()
+            if index is _DONE:
+                running -= 1
+                if value is not None:
+                    raise value
+                continue
+            if not ordered:
+                yield value
+                continue
+            pending[index] = value
+            while expected in pending:
+                yield pending.pop(expected)
+                expected += 1
+                advanced.set()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
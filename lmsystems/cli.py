@@ -0,0 +1,259 @@
+"""
+Command line interface.
+
+    lmsystems batch --graph graph-name-id inputs.jsonl outputs.jsonl --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from typing import IO, Iterator, Optional
+
+from .codec import dumps, loads
+from .config import Config
+
+DEFAULT_STATS_INTERVAL = 2.0
+
+
+class Checkpoint:
+    """
+    Append-only record of the batch items that have been written out.
+
+    Each line is ``<index> ok`` or ``<index> error``. An item's output line is
+    written before its checkpoint line, so after a crash an item is at worst
+    run and written twice, never lost.
+
+    Attributes:
+        path: File the checkpoint is kept in
+        done: Indices of items that succeeded
+        failed: Indices of items that failed
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.done: set = set()
+        self.failed: set = set()
+        torn = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    # A line cut short by a crash has no newline and is ignored
+                    torn = not line.endswith("\n")
+                    index, _, status = line.strip().partition(" ")
+                    if torn or not index.isdigit():
+                        continue
+                    if status == "ok":
+                        self.done.add(int(index))
+                        self.failed.discard(int(index))
+                    elif status == "error":
+                        self.failed.add(int(index))
+        self._file: IO = open(path, "a", encoding="utf-8")
+        if torn:
+            # End the torn line so the next record doesn't run into it
+            self._file.write("\n")
+
+    def record(self, index: int, ok: bool) -> None:
+        self._file.write(f"{index} {'ok' if ok else 'error'}\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BatchStats:
+    """
+    Running throughput and latency figures of a batch.
+
+    Attributes:
+        succeeded: Items that succeeded in this process
+        failed: Items that failed in this process
+        skipped: Items skipped because the checkpoint has them
+        submitted: Items started so far
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        self.started = time.perf_counter()
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.submitted = 0
+        self._latencies: deque = deque(maxlen=window)
+
+    def record(self, ok: bool, duration: float) -> None:
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self._latencies.append(duration)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency percentile, in seconds, over the most recent items."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        completed = self.succeeded + self.failed
+        in_flight = self.submitted - completed
+        parts = [
+            f"{completed} done ({self.failed} failed, {self.skipped} skipped)",
+            f"{in_flight} in flight",
+            f"{completed / elapsed if elapsed > 0 else 0.0:.1f}/s",
+        ]
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        if p50 is not None:
+            parts.append(f"p50 {p50:.2f}s p95 {p95:.2f}s")
+        return " | ".join(parts)
+
+
+def _read_inputs(path: str, checkpoint: Optional[Checkpoint], retry_errors: bool, stats: BatchStats) -> Iterator[tuple]:
+    """Yield ``(index, line)`` for each input line still to run, reading lazily."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for index, line in enumerate(f):
+            if not line.strip():
+                continue
+            if checkpoint is not None and (
+                index in checkpoint.done or (index in checkpoint.failed and not retry_errors)
+            ):
+                stats.skipped += 1
+                continue
+            yield index, line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+async def run_batch(args: argparse.Namespace) -> int:
+    from .client import LmsystemsClient
+    from .projection import output_key_set, project_part
+    from .transport import Transport
+
+    transport = Transport()
+    try:
+        client = await LmsystemsClient.create(args.graph, args.api_key, args.base_url, transport=transport)
+    except BaseException:
+        await transport.aclose()
+        raise
+    stats = BatchStats()
+    checkpoint_path = args.checkpoint or (f"{args.output}.checkpoint" if args.output != "-" else None)
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "ab")
+    keys = output_key_set(args.output_keys)
+    # Original line index of each item run_many has been given, by run_many's index
+    positions: dict = {}
+
+    def write(index: int, ok: bool, output: object = None, error: Optional[str] = None, duration: float = 0.0) -> None:
+        record = {"index": index, "output": output} if ok else {"index": index, "error": error}
+        record["duration"] = round(duration, 4)
+        out.write(dumps(record) + b"\n")
+        out.flush()
+        if checkpoint is not None:
+            checkpoint.record(index, ok)
+        stats.record(ok, duration)
+
+    def inputs() -> Iterator:
+        handed = 0
+        for index, line in _read_inputs(args.input, checkpoint, args.retry_errors, stats):
+            stats.submitted += 1
+            try:
+                item = loads(line)
+            except ValueError as e:
+                write(index, False, error=f"Invalid JSON input: {e}")
+                continue
+            positions[handed] = index
+            handed += 1
+            yield item
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            print(stats.summary(), file=sys.stderr, flush=True)
+
+    reporter = asyncio.ensure_future(report()) if args.stats_interval > 0 else None
+    try:
+        # Every item is a stateless run, so neither a batch nor its resumes leave threads behind
+        async for result in client.run_many(
+            inputs(),
+            concurrency=args.concurrency,
+            ordered=args.ordered,
+            assistant_id=args.assistant_id,
+            config=args.config,
+        ):
+            index = positions.pop(result.index)
+            if result.ok:
+                output = result.output if keys is None else project_part("values", result.output, keys)
+                write(index, True, output, duration=result.duration)
+            else:
+                write(index, False, error=str(result.error), duration=result.duration)
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        await client.aclose()
+        await transport.aclose()
+        if checkpoint is not None:
+            checkpoint.close()
+        if out is not sys.stdout.buffer:
+            out.close()
+        print(stats.summary(), file=sys.stderr, flush=True)
+    return 1 if stats.failed else 0
+
+
+def _json_arg(value: str) -> dict:
+    try:
+        return json.loads(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid JSON: {e}")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="lmsystems", description="LMSystems SDK command line tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch",
+        help="Run a JSONL file of inputs through a graph",
+        description=(
+            "Run each line of a JSONL file as the input of one run and write one JSON line per "
+            "result. Progress is checkpointed, so running the same command again after a crash "
+            "or interrupt resumes where it stopped."
+        ),
+    )
+    batch.add_argument("input", help="JSONL file of run inputs ('-' for stdin)")
+    batch.add_argument("output", help="JSONL file results are appended to ('-' for stdout)")
+    batch.add_argument("--graph", required=True, help="Name of the purchased graph")
+    batch.add_argument("--api-key", default=os.environ.get("LMSYSTEMS_API_KEY"),
+                       help="LMSystems API key (default: $LMSYSTEMS_API_KEY)")
+    batch.add_argument("--base-url", default=Config.get_base_url())
+    batch.add_argument("--concurrency", type=int, default=8, help="Runs in flight at once (default: 8)")
+    batch.add_argument("--ordered", action="store_true", help="Write results in input order")
+    batch.add_argument("--assistant-id", help="Assistant to run (default: the graph's assistant)")
+    batch.add_argument("--config", type=_json_arg, help="Run config as JSON, merged over the stored configurables")
+    batch.add_argument("--output-keys", nargs="+", metavar="KEY", help="Only write these state keys of each result")
+    batch.add_argument("--checkpoint", help="Checkpoint file (default: OUTPUT.checkpoint)")
+    batch.add_argument("--retry-errors", action="store_true", help="On resume, run failed items again")
+    batch.add_argument("--stats-interval", type=float, default=DEFAULT_STATS_INTERVAL,
+                       help="Seconds between progress lines on stderr (0 disables them)")
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        if not args.api_key:
+            parser.error("an API key is required (--api-key or $LMSYSTEMS_API_KEY)")
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        try:
+            return asyncio.run(run_batch(args))
+        except KeyboardInterrupt:
+            print("Interrupted; run the same command again to resume.", file=sys.stderr)
+            return 130
+    return 2
+
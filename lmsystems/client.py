@@ -1,9 +1,36 @@
+import asyncio
 import httpx
-from typing import Optional, Any, AsyncIterator, Union, Iterator
-import jwt
-from langgraph_sdk import get_client, get_sync_client
-from .exceptions import AuthenticationError, GraphError, APIError
+import time
+import weakref
+from typing import Optional, Any, AsyncIterable, AsyncIterator, Iterable, Union, Iterator, Sequence
+from .exceptions import AuthenticationError, GraphError, APIError, DeadlineExceededError
 from .config import Config
+from .graph_info import GraphInfoCache, get_default_graph_info_cache, _status_code
+from .transport import Transport, get_default_transport
+from .batch import RunResult, bounded_map
+from .ratelimit import AdaptiveRateLimiter, RetryPolicy
+from .stream import RunStream, SyncRunStream
+from .multicast import DEFAULT_BLOCK_TIMEOUT, DEFAULT_REPLAY_SIZE, MulticastStream
+from .coalesce import DeltaCoalescer
+from .result_cache import ResultCache, SingleFlight, cacheable_config, make_cache_key
+from .codec import dumps, loads
+from .run_template import RunTemplate, without_stream_kwargs
+from .threads import ThreadManager
+from .metrics import Instrumentation
+from .credentials import CredentialManager
+from .completion import CompletionTracker
+from .deadline import Deadline, RunGuard, as_deadline
+
+
+def _lgraph_api_key(graph_info: dict, extract_api_key) -> str:
+    """LangGraph API key from graph info, read from the access token when not given directly."""
+    lgraph_api_key = graph_info.get('lgraph_api_key')
+    if not lgraph_api_key and graph_info.get('access_token'):
+        lgraph_api_key = extract_api_key(graph_info['access_token'])
+    if not lgraph_api_key:
+        raise AuthenticationError("LangGraph API key not found in graph info")
+    return lgraph_api_key
+
 
 class LmsystemsClient:
     """
@@ -19,6 +46,13 @@ class LmsystemsClient:
         graph_name: str,
         api_key: str,
         base_url: str = Config.DEFAULT_BASE_URL,
+        graph_info_cache: Optional[GraphInfoCache] = None,
+        transport: Optional[Transport] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        result_cache: Optional[ResultCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        refresh_credentials: bool = False,
     ) -> None:
         """
         Initialize the Lmsystems client.
@@ -27,6 +61,14 @@ class LmsystemsClient:
             graph_name: The name of the purchased graph
             api_key: The Lmsystems API key
             base_url: Base URL for the Lmsystems API
+            graph_info_cache: Cache for graph info lookups (defaults to the shared cache)
+            transport: Pooled HTTP transport (defaults to the shared transport)
+            retry_policy: Retry settings for graph calls (defaults to ``RetryPolicy()``)
+            rate_limiter: Optional client-side rate limiter shared by graph calls
+            result_cache: Opt-in cache for ``invoke`` results
+            instrumentation: Optional receiver of latency and throughput metrics
+            refresh_credentials: Opt in to refreshing graph info in an asyncio task
+                before the graph credentials expire
         """
         self.graph_name = graph_name
         self.api_key = api_key
@@ -38,8 +80,25 @@ class LmsystemsClient:
             base_url = f"https://{base_url}"
         self.base_url = base_url.rstrip('/')  # Remove trailing slash if present
 
+        self.graph_info_cache = graph_info_cache or get_default_graph_info_cache()
+        self.transport = transport or get_default_transport()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.result_cache = result_cache
+        self.instrumentation = instrumentation
+        self._single_flight = SingleFlight()
+        self.credentials = (
+            CredentialManager(self._bind_graph_info, afetch=self._refresh_graph_info)
+            if refresh_credentials else None
+        )
+
         self.client = None
         self.default_assistant_id = None
+        self.default_template: Optional[RunTemplate] = None
+        self._thread_manager: Optional[ThreadManager] = None
+        self._completion_tracker: Optional[CompletionTracker] = None
+        # Deadlines of runs created with one, for stream_run to pick up
+        self._run_guards: "weakref.WeakValueDictionary[str, RunGuard]" = weakref.WeakValueDictionary()
 
     @classmethod
     async def create(
@@ -47,56 +106,162 @@ class LmsystemsClient:
         graph_name: str,
         api_key: str,
         base_url: str = Config.DEFAULT_BASE_URL,
+        graph_info_cache: Optional[GraphInfoCache] = None,
+        transport: Optional[Transport] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        result_cache: Optional[ResultCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        refresh_credentials: bool = False,
     ) -> "LmsystemsClient":
         """Async factory method to create and initialize the client."""
-        client = cls(graph_name, api_key, base_url)
+        client = cls(
+            graph_name,
+            api_key,
+            base_url,
+            graph_info_cache=graph_info_cache,
+            transport=transport,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            result_cache=result_cache,
+            instrumentation=instrumentation,
+            refresh_credentials=refresh_credentials,
+        )
         await client.setup()
         return client
 
     async def setup(self) -> None:
         """Initialize the client asynchronously."""
+        started = time.perf_counter()
         try:
             # Store graph info for later use of configurables
-            self.graph_info = await self._get_graph_info()
-
-            # Store default assistant_id and use lgraph_api_key directly
-            self.default_assistant_id = self.graph_info.get('assistant_id')
-
-            self.client = get_client(
-                url=self.graph_info['graph_url'],
-                api_key=self.graph_info['lgraph_api_key']
-            )
+            self._bind_graph_info(await self._get_graph_info())
         except Exception as e:
+            if self.instrumentation is not None:
+                self.instrumentation.operation(self.graph_name, "graph_info", time.perf_counter() - started, e)
             raise APIError(f"Failed to initialize client: {str(e)}")
+        if self.instrumentation is not None:
+            self.instrumentation.operation(self.graph_name, "graph_info", time.perf_counter() - started)
+        if self.credentials is not None:
+            self.credentials.start(self.graph_info)
+
+    async def aclose(self) -> None:
+        """Stop background credential refresh and run tracking. Pooled connections belong to the transport."""
+        if self.credentials is not None:
+            await self.credentials.aclose()
+        if self._completion_tracker is not None:
+            await self._completion_tracker.aclose()
+
+    def _bind_graph_info(self, graph_info: dict) -> None:
+        """
+        Point the client at the deployment described by already resolved graph info.
+
+        Also swaps in refreshed credentials: the new LangGraph client is built
+        first and replaces the old one in a single assignment, so calls already
+        running finish on the client they started with.
+        """
+        client = self.transport.get_client(
+            url=graph_info['graph_url'],
+            api_key=_lgraph_api_key(graph_info, self._extract_api_key)
+        )
+
+        # Store default assistant_id and configurables for later runs
+        self.graph_info = graph_info
+        self.default_assistant_id = graph_info.get('assistant_id')
+        self.default_template = RunTemplate(self.default_assistant_id, graph_info.get('configurables'))
+        self.client = client
 
     async def _get_graph_info(self) -> dict:
         """Authenticate and retrieve graph connection details."""
+        cached = self.graph_info_cache.get(self.base_url, self.api_key, self.graph_name)
+        if cached is not None:
+            return cached
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/api/get_graph_info",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={"graph_name": self.graph_name}
-                )
-
-                if response.status_code == 401:
-                    raise AuthenticationError("Invalid API key")
-                elif response.status_code == 403:
-                    raise GraphError(f"Graph '{self.graph_name}' has not been purchased")
-                elif response.status_code == 404:
-                    raise GraphError(f"Graph '{self.graph_name}' not found")
-                elif response.status_code != 200:
-                    raise APIError(f"Backend API error: {response.text}")
-
-                return response.json()
+            response = await self.transport.async_http.post(
+                f"{self.base_url}/api/get_graph_info",
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                content=dumps({"graph_name": self.graph_name})
+            )
+
+            if response.status_code in (401, 403):
+                self._invalidate_graph_info()
+            if response.status_code == 401:
+                raise AuthenticationError("Invalid API key")
+            elif response.status_code == 403:
+                raise GraphError(f"Graph '{self.graph_name}' has not been purchased")
+            elif response.status_code == 404:
+                raise GraphError(f"Graph '{self.graph_name}' not found")
+            elif response.status_code != 200:
+                raise APIError(f"Backend API error: {response.text}")
+
+            graph_info = loads(response.content)
+            self.graph_info_cache.set(self.base_url, self.api_key, self.graph_name, graph_info)
+            return graph_info
         except httpx.RequestError as e:
             raise APIError(f"Failed to communicate with server: {str(e)}")
 
+    async def _refresh_graph_info(self) -> dict:
+        """Fetch graph info from the backend, skipping the cache."""
+        self._invalidate_graph_info()
+        return await self._get_graph_info()
+
+    def _invalidate_graph_info(self) -> None:
+        """Drop cached graph info so the next lookup hits the backend again."""
+        self.graph_info_cache.invalidate(self.base_url, self.api_key, self.graph_name)
+
+    def _check_auth_error(self, error: Exception) -> None:
+        """Invalidate cached graph info when the graph rejects our credentials."""
+        if _status_code(error) in (401, 403):
+            self._invalidate_graph_info()
+
+    def _to_api_error(self, action: str, error: Exception) -> APIError:
+        """Turn a graph call failure into a structured APIError and feed the limiter."""
+        self._check_auth_error(error)
+        api_error = APIError.from_exception(f"Failed to {action}", error)
+        if self.rate_limiter is not None and api_error.status_code == 429:
+            self.rate_limiter.on_throttle(api_error.retry_after)
+        return api_error
+
+    async def _call(self, action: str, func, *, idempotent: bool) -> Any:
+        """Run a graph call through the rate limiter, retrying per the retry policy."""
+        if self.credentials is not None and self.credentials.deferred:
+            # Bound outside an event loop, so the refresh couldn't start until now
+            self.credentials.start(self.graph_info)
+        started = time.perf_counter() if self.instrumentation is not None else 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            try:
+                result = await func()
+            except Exception as e:
+                api_error = self._to_api_error(action, e)
+                if not self.retry_policy.should_retry(attempt, api_error, idempotent):
+                    self._record(action, started, api_error)
+                    raise api_error from e
+                await asyncio.sleep(self.retry_policy.delay(attempt, api_error.retry_after))
+                continue
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_success()
+            self._record(action, started)
+            return result
+
+    def _record(self, action: str, started: float, error: Optional[BaseException] = None) -> None:
+        """Report a finished graph call to the instrumentation, if any."""
+        if self.instrumentation is not None:
+            self.instrumentation.operation(
+                self.graph_name, action.replace(" ", "_"), time.perf_counter() - started, error
+            )
+
     def _extract_api_key(self, access_token: str) -> str:
         """Extract LangGraph API key from JWT token."""
+        import jwt
+
         try:
             decoded = jwt.decode(access_token, options={"verify_signature": False})
             lgraph_api_key = decoded.get("lgraph_api_key")
@@ -118,64 +283,419 @@ class LmsystemsClient:
     # Delegate methods with improved error handling
     async def create_thread(self, **kwargs) -> dict:
         """Create a new thread with error handling."""
+        # Creating a thread with an explicit ID can be repeated safely
+        return await self._call(
+            "create thread",
+            lambda: self.client.threads.create(**kwargs),
+            idempotent=bool(kwargs.get("thread_id")),
+        )
+
+    def template(
+        self,
+        *,
+        assistant_id: Optional[str] = None,
+        config: Optional[dict] = None,
+        stream_mode: Optional[Any] = None,
+        input: Optional[Any] = None,
+        **kwargs,
+    ) -> RunTemplate:
+        """
+        Pre-resolve run settings for reuse across many runs.
+
+        Args:
+            assistant_id: Assistant to run (defaults to the graph's assistant)
+            config: Config merged over the stored configurables
+            stream_mode: Default stream mode(s)
+            input: Default input; dict inputs given per run are merged over it
+            **kwargs: Other default arguments for ``runs.create``
+
+        Returns:
+            A ``RunTemplate`` to pass as ``template=`` to ``create_run``, ``invoke`` or ``run_many``
+        """
+        return self.default_template.with_overrides(
+            assistant_id=assistant_id, config=config, stream_mode=stream_mode, input=input, **kwargs
+        )
+
+    async def create_run(
+        self,
+        thread: dict,
+        *,
+        assistant_id: Optional[str] = None,
+        template: Optional[RunTemplate] = None,
+        deadline: Union[Deadline, float, None] = None,
+        **kwargs
+    ) -> dict:
+        """Create a run with proper thread ID handling.
+
+        Settings come from ``template`` (or the graph's default template), with
+        ``assistant_id``, ``config``, ``input`` and other kwargs layered on top.
+        With a ``deadline`` (a ``Deadline`` or seconds from now), the run is
+        cancelled if it is still going when the deadline passes, and
+        ``stream_run`` on it stops at the same deadline.
+        """
         try:
-            return await self.client.threads.create(**kwargs)
+            thread_id = self._get_thread_id(thread)
+            run_kwargs = (template or self.default_template).bind(assistant_id=assistant_id, **kwargs)
+            deadline = as_deadline(deadline)
         except Exception as e:
-            raise APIError(f"Failed to create thread: {str(e)}")
+            raise APIError(f"Failed to create run: {str(e)}")
 
-    async def create_run(self, thread: dict, *, assistant_id: Optional[str] = None, **kwargs) -> dict:
-        """Create a run with proper thread ID handling."""
+        run = await self._call(
+            "create run",
+            lambda: self.client.runs.create(thread_id=thread_id, **run_kwargs),
+            idempotent=False,
+        )
+        run_id = run.get("run_id") or run.get("id")
+        if deadline is not None and run_id:
+            guard = RunGuard(self, thread_id, run_id, deadline)
+            guard.arm()
+            # The armed timer keeps the guard alive until the deadline
+            self._run_guards[run_id] = guard
+        return run
+
+    async def join_run(self, thread: dict, run: dict) -> dict:
+        """Wait for a run to finish and return the thread's final values.
+
+        A deadline the run was created with is disarmed once it finishes, so the
+        run isn't cancelled afterwards. Joining is read-only, so it is retried.
+        """
         try:
             thread_id = self._get_thread_id(thread)
+            run_id = run.get("run_id") or run.get("id")
+            if not run_id:
+                raise APIError("Invalid run response format")
+        except Exception as e:
+            raise APIError(f"Failed to join run: {str(e)}")
 
-            # Use default assistant_id if none provided
-            if assistant_id is None:
-                if self.default_assistant_id is None:
-                    raise APIError("No assistant_id provided and no default available")
-                assistant_id = self.default_assistant_id
-
-            # Get stored configurables from graph info
-            stored_config = self.graph_info.get('configurables', {})
-
-            # Get user-provided config from kwargs
-            user_config = kwargs.pop('config', {})
-
-            # Merge configs, with user-provided values taking precedence
-            merged_config = stored_config.copy()
-            if user_config:
-                if 'configurable' in user_config and 'configurable' in stored_config:
-                    merged_config['configurable'].update(user_config['configurable'])
-                else:
-                    merged_config.update(user_config)
-
-            # Add merged config back to kwargs
-            kwargs['config'] = merged_config
+        result = await self._call(
+            "join run",
+            lambda: self.client.runs.join(thread_id, run_id),
+            idempotent=True,
+        )
+        self._run_finished(run_id)
+        return result
 
-            return await self.client.runs.create(
-                thread_id=thread_id,
-                assistant_id=assistant_id,
-                **kwargs
-            )
-        except Exception as e:
-            raise APIError(f"Failed to create run: {str(e)}")
+    def _run_finished(self, run_id: str) -> None:
+        """Disarm the deadline guard of a run that completed, if it has one."""
+        guard = self._run_guards.pop(run_id, None)
+        if guard is not None:
+            guard.finish()
 
-    async def stream_run(self, thread: dict, run: dict, **kwargs) -> AsyncIterator:
-        """Stream existing run results with error handling."""
+    def stream_run(
+        self,
+        thread: dict,
+        run: dict,
+        *,
+        max_reconnects: int = 10,
+        deadline: Union[Deadline, float, None] = None,
+        cancel_on_abandon: bool = False,
+        **kwargs
+    ) -> RunStream:
+        """Stream existing run results with error handling.
+
+        Returns a ``RunStream`` to iterate with ``async for``. Failures before the
+        first chunk are retried, and a connection dropped mid-stream is rejoined
+        from the last received event (see ``RunStream``), up to ``max_reconnects`` times.
+        Pass ``coalesce=DeltaCoalescer(...)`` to merge per-token message deltas, and
+        ``output_keys=[...]`` to receive only those state keys in ``values`` and
+        ``updates`` events.
+
+        Abandoning the stream (breaking out of the loop, closing it or cancelling
+        the consuming task) only stops reading, and the run keeps going. Pass
+        ``cancel_on_abandon=True`` to cancel the run instead when the stream is
+        abandoned before the run finishes. The stream stops at ``deadline``, or
+        at the deadline the run was created with, raising
+        ``DeadlineExceededError`` after cancelling the run.
+
+        The result is a ``RunStream``, not an async generator: it supports
+        ``async for``, ``asend`` and ``aclose`` but not ``athrow``.
+        """
         try:
             thread_id = self._get_thread_id(thread)
             run_id = run.get("run_id") or run.get("id")
             if not run_id:
                 raise APIError("Invalid run response format")
+            guard = self._run_guards.get(run_id)
+            deadline = as_deadline(deadline) or (guard.deadline if guard is not None else None)
+        except Exception as e:
+            raise APIError(f"Failed to stream run: {str(e)}")
+
+        return RunStream(
+            self,
+            thread_id,
+            run_id,
+            max_reconnects=max_reconnects,
+            deadline=deadline,
+            guard=guard,
+            cancel_on_abandon=cancel_on_abandon,
+            **kwargs
+        )
+
+    def multicast(
+        self,
+        thread: dict,
+        run: dict,
+        *,
+        buffer_size: int = 256,
+        policy: str = "drop",
+        replay: bool = True,
+        replay_size: Optional[int] = DEFAULT_REPLAY_SIZE,
+        block_timeout: Optional[float] = DEFAULT_BLOCK_TIMEOUT,
+        **kwargs
+    ) -> MulticastStream:
+        """Share one ``stream_run`` connection between many async subscribers.
+
+        Call ``subscribe()`` on the result for each viewer; see ``MulticastStream``
+        for the buffer, slow-consumer ``policy``, ``block_timeout`` and replay
+        options. Other kwargs go to ``stream_run``.
+        """
+        return MulticastStream(
+            self.stream_run(thread, run, **kwargs),
+            buffer_size=buffer_size,
+            policy=policy,
+            replay=replay,
+            replay_size=replay_size,
+            block_timeout=block_timeout,
+        )
+
+    def stream(
+        self,
+        input: Any = None,
+        *,
+        thread: Optional[Union[dict, str]] = None,
+        assistant_id: Optional[str] = None,
+        config: Optional[dict] = None,
+        template: Optional[RunTemplate] = None,
+        max_reconnects: int = 10,
+        coalesce: Optional[DeltaCoalescer] = None,
+        output_keys: Optional[Sequence[str]] = None,
+        deadline: Union[Deadline, float, None] = None,
+        cancel_on_abandon: bool = False,
+        **kwargs,
+    ) -> RunStream:
+        """
+        Create a run and stream its events in a single request.
 
-            async for chunk in self.client.runs.join_stream(
-                thread_id=thread_id,
-                run_id=run_id,
-                **kwargs
-            ):
-                yield chunk
+        Without ``thread`` the run is stateless. With a thread (or thread ID) the
+        run is created on it, and the thread itself is created if it doesn't exist
+        yet, so no separate ``create_thread``/``create_run`` round trips are needed.
+        Config merging and the default assistant work as in ``create_run``.
+        ``deadline`` and ``cancel_on_abandon`` cancel the run as in ``stream_run``.
+        With ``cancel_on_abandon=True``, stateless runs are also created with
+        ``on_disconnect="cancel"``, so the server cancels them as soon as the
+        connection closes.
+
+        Args:
+            input: The run input
+            thread: Thread dict or thread ID to run on, or None for a stateless run
+            assistant_id: Assistant to run (defaults to the graph's assistant)
+            config: Config merged over the stored configurables
+            template: Run settings to start from (defaults to the graph's default template)
+            max_reconnects: Maximum number of times to rejoin after progress
+            coalesce: Optional ``DeltaCoalescer`` merging per-token message deltas
+            output_keys: State keys to keep in ``values`` and ``updates`` events
+            deadline: ``Deadline`` or seconds from now at which to stop and cancel the run
+            cancel_on_abandon: Cancel the run if the stream is abandoned before it finishes
+            **kwargs: Extra arguments accepted by ``runs.stream``, e.g. ``stream_mode``
+                or ``stream_resumable=True`` to allow rejoining after a dropped connection
+
+        Returns:
+            A ``RunStream`` to iterate with ``async for``; its ``run_id`` is set once
+            the server has created the run
+        """
+        try:
+            thread_id = thread if isinstance(thread, str) or thread is None else self._get_thread_id(thread)
+            headers = kwargs.pop('headers', None)
+            params = kwargs.pop('params', None)
+            run_kwargs = (template or self.default_template).bind(
+                assistant_id=assistant_id, config=config, input=input, **kwargs
+            )
+            if thread_id is not None:
+                run_kwargs.setdefault('if_not_exists', 'create')
+            elif cancel_on_abandon:
+                # A stateless run can't be rejoined, so a closed connection means nobody will read it
+                run_kwargs.setdefault('on_disconnect', 'cancel')
+            body = {k: v for k, v in run_kwargs.items() if v is not None}
+            deadline = as_deadline(deadline)
         except Exception as e:
             raise APIError(f"Failed to stream run: {str(e)}")
 
+        return RunStream(
+            self,
+            thread_id,
+            None,
+            max_reconnects=max_reconnects,
+            create=body,
+            coalesce=coalesce,
+            output_keys=output_keys,
+            deadline=deadline,
+            cancel_on_abandon=cancel_on_abandon,
+            stream_mode=body.get('stream_mode'),
+            headers=headers,
+            params=params,
+        )
+
+    async def invoke(
+        self,
+        input: Any,
+        *,
+        assistant_id: Optional[str] = None,
+        config: Optional[dict] = None,
+        template: Optional[RunTemplate] = None,
+        deadline: Union[Deadline, float, None] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Run the graph statelessly and wait for its final state.
+
+        With a ``result_cache``, results are cached by graph, assistant, merged
+        config and input, and concurrent identical calls share one remote run.
+
+        The run is created with ``on_disconnect="cancel"``, so if the call is
+        cancelled or ``deadline`` passes, closing the connection cancels the run
+        on the server. An expired deadline raises ``DeadlineExceededError``.
+
+        Args:
+            input: The run input
+            assistant_id: Assistant to run (defaults to the graph's assistant)
+            config: Config merged over the stored configurables
+            template: Run settings to start from (defaults to the graph's default template)
+            deadline: ``Deadline`` or seconds from now by which the run must finish
+            **kwargs: Extra arguments passed to ``runs.wait``
+        """
+        try:
+            kwargs.setdefault('on_disconnect', 'cancel')
+            # runs.wait doesn't stream, so a template's stream settings don't apply
+            run_kwargs = without_stream_kwargs((template or self.default_template).bind(
+                assistant_id=assistant_id, config=config, input=input, **kwargs
+            ))
+            deadline = as_deadline(deadline)
+        except Exception as e:
+            raise APIError(f"Failed to run graph: {str(e)}")
+
+        async def run() -> Any:
+            call = self._call(
+                "run graph",
+                lambda: self.client.runs.wait(None, **run_kwargs),
+                idempotent=False,
+            )
+            if deadline is None:
+                return await call
+            try:
+                return await asyncio.wait_for(call, deadline.remaining())
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError("Deadline exceeded while waiting for the run") from None
+
+        if self.result_cache is None:
+            return await run()
+
+        extra = {k: v for k, v in run_kwargs.items() if k not in ('assistant_id', 'config', 'input')}
+        key = make_cache_key(
+            self.graph_name,
+            run_kwargs['assistant_id'],
+            cacheable_config(run_kwargs['config']),
+            run_kwargs.get('input'),
+            **extra
+        )
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def run_and_store() -> Any:
+            result = await run()
+            self.result_cache.set(key, result)
+            return result
+
+        return await self._single_flight.do(key, run_and_store)
+
+    async def run_many(
+        self,
+        inputs: Union[Iterable, AsyncIterable],
+        *,
+        concurrency: int = 8,
+        stream: bool = False,
+        ordered: bool = False,
+        assistant_id: Optional[str] = None,
+        config: Optional[dict] = None,
+        template: Optional[RunTemplate] = None,
+        **kwargs,
+    ) -> AsyncIterator[RunResult]:
+        """
+        Run many inputs through the graph with bounded concurrency.
+
+        Each input gets its own stateless run, so the batch leaves no threads
+        behind on the deployment. Up to ``concurrency`` items are in flight at
+        once. The assistant and merged config are resolved once for the whole
+        batch. Failures are reported per item in ``RunResult.error`` instead of
+        failing the batch, and closing the iterator early cancels the runs in flight.
+
+        Args:
+            inputs: Sync or async iterable of run inputs, consumed lazily
+            concurrency: Maximum number of items in flight
+            stream: Collect streamed chunks into ``output`` instead of the final state
+            ordered: Yield results in input order instead of completion order
+            assistant_id: Assistant to run (defaults to the graph's assistant)
+            config: Config merged over the stored configurables
+            template: Run settings to start from (defaults to the graph's default template)
+            **kwargs: Extra arguments passed to ``runs.wait``, or ``runs.stream`` with ``stream=True``
+
+        Yields:
+            One ``RunResult`` per input
+        """
+        kwargs.setdefault('on_disconnect', 'cancel')
+        batch_template = (template or self.default_template).with_overrides(
+            assistant_id=assistant_id, config=config, **kwargs
+        )
+
+        async def run_one(index: int, item: Any) -> RunResult:
+            result = RunResult(index=index, input=item)
+            started = time.perf_counter()
+            try:
+                if stream:
+                    result.output = [chunk async for chunk in self.stream(item, template=batch_template)]
+                else:
+                    run_kwargs = without_stream_kwargs(batch_template.bind(input=item))
+                    result.output = await self._call(
+                        "run graph",
+                        lambda: self.client.runs.wait(None, **run_kwargs),
+                        idempotent=False,
+                    )
+            except Exception as e:
+                result.error = e
+            result.duration = time.perf_counter() - started
+            return result
+
+        async for result in bounded_map(run_one, inputs, concurrency, ordered=ordered):
+            yield result
+
+    @property
+    def thread_manager(self) -> ThreadManager:
+        """Pool of ready threads and session-to-thread mapping (created on first use).
+
+        Assign a ``ThreadManager`` to use non-default settings.
+        """
+        if self._thread_manager is None:
+            self._thread_manager = ThreadManager(self)
+        return self._thread_manager
+
+    @thread_manager.setter
+    def thread_manager(self, manager: ThreadManager) -> None:
+        self._thread_manager = manager
+
+    @property
+    def completion_tracker(self) -> CompletionTracker:
+        """Scheduler that resolves futures for background runs (created on first use).
+
+        Assign a ``CompletionTracker`` to use non-default settings.
+        """
+        if self._completion_tracker is None:
+            self._completion_tracker = CompletionTracker(self)
+        return self._completion_tracker
+
+    @completion_tracker.setter
+    def completion_tracker(self, tracker: CompletionTracker) -> None:
+        self._completion_tracker = tracker
+
     @property
     def assistants(self):
         """Access the assistants API."""
@@ -214,7 +734,13 @@ class SyncLmsystemsClient:
         graph_name: str,
         api_key: str,
         base_url: str = Config.DEFAULT_BASE_URL,
-        stream_mode: bool = True
+        stream_mode: bool = True,
+        graph_info_cache: Optional[GraphInfoCache] = None,
+        transport: Optional[Transport] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        refresh_credentials: bool = False,
     ) -> None:
         """
         Initialize the synchronous Lmsystems client.
@@ -224,6 +750,14 @@ class SyncLmsystemsClient:
             api_key: The Lmsystems API key
             base_url: Base URL for the Lmsystems API (defaults to https://api.lmsystems.ai)
             stream_mode: Stream mode preference
+            graph_info_cache: Cache for graph info lookups (defaults to the shared cache)
+            transport: Pooled HTTP transport (defaults to the shared transport)
+            retry_policy: Retry settings for graph calls (defaults to ``RetryPolicy()``)
+            rate_limiter: Optional client-side rate limiter shared by graph calls
+            instrumentation: Optional receiver of latency and throughput metrics
+            refresh_credentials: Opt in to refreshing graph info before the graph
+                credentials expire, on one background thread shared by all sync
+                clients and graphs
         """
         self.graph_name = graph_name
         self.api_key = api_key
@@ -236,40 +770,130 @@ class SyncLmsystemsClient:
         self.base_url = base_url.rstrip('/')  # Remove trailing slash if present
 
         self.stream_mode = stream_mode
+        self.graph_info_cache = graph_info_cache or get_default_graph_info_cache()
+        self.transport = transport or get_default_transport()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation
+        self.credentials = (
+            CredentialManager(self._bind_graph_info, fetch=self._refresh_graph_info)
+            if refresh_credentials else None
+        )
 
         # Synchronous initialization
-        self.graph_info = self._get_graph_info()
-        self.default_assistant_id = self.graph_info.get('assistant_id')
-        self.client = get_sync_client(
-            url=self.graph_info['graph_url'],
-            api_key=self.graph_info['lgraph_api_key']
+        started = time.perf_counter()
+        try:
+            self._bind_graph_info(self._get_graph_info())
+        except Exception as e:
+            if self.instrumentation is not None:
+                self.instrumentation.operation(self.graph_name, "graph_info", time.perf_counter() - started, e)
+            raise
+        if self.instrumentation is not None:
+            self.instrumentation.operation(self.graph_name, "graph_info", time.perf_counter() - started)
+        if self.credentials is not None:
+            self.credentials.start(self.graph_info)
+
+    def close(self) -> None:
+        """Stop the background credential refresh. Pooled connections belong to the transport."""
+        if self.credentials is not None:
+            self.credentials.stop()
+
+    def _bind_graph_info(self, graph_info: dict) -> None:
+        """Point the client at the deployment described by graph info; see ``LmsystemsClient._bind_graph_info``."""
+        client = self.transport.get_sync_client(
+            url=graph_info['graph_url'],
+            api_key=_lgraph_api_key(graph_info, self._extract_api_key)
         )
+        self.graph_info = graph_info
+        self.default_assistant_id = graph_info.get('assistant_id')
+        self.default_template = RunTemplate(self.default_assistant_id, graph_info.get('configurables'))
+        self.client = client
 
     def _get_graph_info(self) -> dict:
         """Authenticate and retrieve graph connection details."""
-        with httpx.Client() as client:
-            response = client.post(
-                f"{self.base_url}/api/get_graph_info",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={"graph_name": self.graph_name}
-            )
-
-            if response.status_code == 401:
-                raise AuthenticationError("Invalid API key")
-            elif response.status_code == 403:
-                raise GraphError(f"Graph '{self.graph_name}' has not been purchased")
-            elif response.status_code == 404:
-                raise GraphError(f"Graph '{self.graph_name}' not found")
-            elif response.status_code != 200:
-                raise APIError(f"Backend API error: {response.text}")
+        cached = self.graph_info_cache.get(self.base_url, self.api_key, self.graph_name)
+        if cached is not None:
+            return cached
+
+        response = self.transport.sync_http.post(
+            f"{self.base_url}/api/get_graph_info",
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            content=dumps({"graph_name": self.graph_name})
+        )
 
-            return response.json()
+        if response.status_code in (401, 403):
+            self._invalidate_graph_info()
+        if response.status_code == 401:
+            raise AuthenticationError("Invalid API key")
+        elif response.status_code == 403:
+            raise GraphError(f"Graph '{self.graph_name}' has not been purchased")
+        elif response.status_code == 404:
+            raise GraphError(f"Graph '{self.graph_name}' not found")
+        elif response.status_code != 200:
+            raise APIError(f"Backend API error: {response.text}")
+
+        graph_info = loads(response.content)
+        self.graph_info_cache.set(self.base_url, self.api_key, self.graph_name, graph_info)
+        return graph_info
+
+    def _refresh_graph_info(self) -> dict:
+        """Fetch graph info from the backend, skipping the cache."""
+        self._invalidate_graph_info()
+        return self._get_graph_info()
+
+    def _invalidate_graph_info(self) -> None:
+        """Drop cached graph info so the next lookup hits the backend again."""
+        self.graph_info_cache.invalidate(self.base_url, self.api_key, self.graph_name)
+
+    def _check_auth_error(self, error: Exception) -> None:
+        """Invalidate cached graph info when the graph rejects our credentials."""
+        if _status_code(error) in (401, 403):
+            self._invalidate_graph_info()
+
+    def _to_api_error(self, action: str, error: Exception) -> APIError:
+        """Turn a graph call failure into a structured APIError and feed the limiter."""
+        self._check_auth_error(error)
+        api_error = APIError.from_exception(f"Failed to {action}", error)
+        if self.rate_limiter is not None and api_error.status_code == 429:
+            self.rate_limiter.on_throttle(api_error.retry_after)
+        return api_error
+
+    def _call(self, action: str, func, *, idempotent: bool) -> Any:
+        """Run a graph call through the rate limiter, retrying per the retry policy."""
+        started = time.perf_counter() if self.instrumentation is not None else 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire_sync()
+            try:
+                result = func()
+            except Exception as e:
+                api_error = self._to_api_error(action, e)
+                if not self.retry_policy.should_retry(attempt, api_error, idempotent):
+                    self._record(action, started, api_error)
+                    raise api_error from e
+                time.sleep(self.retry_policy.delay(attempt, api_error.retry_after))
+                continue
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_success()
+            self._record(action, started)
+            return result
+
+    def _record(self, action: str, started: float, error: Optional[BaseException] = None) -> None:
+        """Report a finished graph call to the instrumentation, if any."""
+        if self.instrumentation is not None:
+            self.instrumentation.operation(
+                self.graph_name, action.replace(" ", "_"), time.perf_counter() - started, error
+            )
 
     def _extract_api_key(self, access_token: str) -> str:
         """Extract LangGraph API key from JWT token."""
+        import jwt
+
         try:
             decoded = jwt.decode(access_token, options={"verify_signature": False})
             if 'lgraph_api_key' not in decoded:
@@ -303,44 +927,45 @@ class SyncLmsystemsClient:
         """Access the store API."""
         return self.client.store
 
-    def create_run(self, thread: dict, *, assistant_id: Optional[str] = None, **kwargs) -> dict:
+    def template(
+        self,
+        *,
+        assistant_id: Optional[str] = None,
+        config: Optional[dict] = None,
+        stream_mode: Optional[Any] = None,
+        input: Optional[Any] = None,
+        **kwargs,
+    ) -> RunTemplate:
+        """Pre-resolve run settings for reuse across many runs (see ``LmsystemsClient.template``)."""
+        return self.default_template.with_overrides(
+            assistant_id=assistant_id, config=config, stream_mode=stream_mode, input=input, **kwargs
+        )
+
+    def create_run(
+        self,
+        thread: dict,
+        *,
+        assistant_id: Optional[str] = None,
+        template: Optional[RunTemplate] = None,
+        **kwargs
+    ) -> dict:
         """Create a run with proper thread ID handling."""
         try:
             thread_id = thread.get("thread_id") or thread.get("id")
             if not thread_id:
                 raise APIError("Invalid thread response format")
 
-            # Use default assistant_id if none provided
-            if assistant_id is None:
-                if self.default_assistant_id is None:
-                    raise APIError("No assistant_id provided and no default available")
-                assistant_id = self.default_assistant_id
-
-            # Get stored configurables from graph info
-            stored_config = self.graph_info.get('configurables', {})
-
-            # Get user-provided config from kwargs
-            user_config = kwargs.pop('config', {})
-
-            # Merge configs, with user-provided values taking precedence
-            merged_config = stored_config.copy()
-            if user_config:
-                if 'configurable' in user_config and 'configurable' in stored_config:
-                    merged_config['configurable'].update(user_config['configurable'])
-                else:
-                    merged_config.update(user_config)
-
-            # Add merged config back to kwargs
-            kwargs['config'] = merged_config
-
-            return self.client.runs.create(
-                thread_id=thread_id,
-                assistant_id=assistant_id,
-                **kwargs
-            )
+            # Layer the call's settings over the template, user-provided values taking precedence
+            run_kwargs = (template or self.default_template).bind(assistant_id=assistant_id, **kwargs)
         except Exception as e:
             raise APIError(f"Failed to create run: {str(e)}")
 
+        return self._call(
+            "create run",
+            lambda: self.client.runs.create(thread_id=thread_id, **run_kwargs),
+            idempotent=False,
+        )
+
     def join_run(self, thread: dict, run: dict, **kwargs) -> Union[dict, Iterator]:
         """Join a run and wait for completion with error handling."""
         try:
@@ -351,20 +976,20 @@ class SyncLmsystemsClient:
             run_id = run.get("run_id") or run.get("id")
             if not run_id:
                 raise APIError("Invalid run response format")
+        except Exception as e:
+            raise APIError(f"Failed to join run: {str(e)}")
 
-            if self.stream_mode:
-                # Use join_stream for streaming mode
-                return self.client.runs.join_stream(
+        if self.stream_mode:
+            # Use join_stream for streaming mode, rejoining from the last event if the connection drops
+            return SyncRunStream(self, thread_id, run_id, **kwargs)
+        else:
+            # Use join for non-streaming mode; joining is read-only, so it can be retried
+            return self._call(
+                "join run",
+                lambda: self.client.runs.join(
                     thread_id=thread_id,
                     run_id=run_id,
                     **kwargs
-                )
-            else:
-                # Use join for non-streaming mode
-                return self.client.runs.join(
-                    thread_id=thread_id,
-                    run_id=run_id,
-                    **kwargs
-                )
-        except Exception as e:
-            raise APIError(f"Failed to join run: {str(e)}")
+                ),
+                idempotent=True,
+            )
@@ -0,0 +1,254 @@
+"""Coalescing of per-token message deltas in run streams."""
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Optional
+
+from .sse import StreamEvent
+
+# Message fields that carry deltas of their own; chunks with any of them set are never merged
+_DELTA_FIELDS = (
+    "tool_call_chunks",
+    "tool_calls",
+    "invalid_tool_calls",
+    "additional_kwargs",
+    "response_metadata",
+    "usage_metadata",
+    "chunk_position",
+)
+
+
+def _is_message_object(message: Any) -> bool:
+    return not isinstance(message, dict) and hasattr(message, "content") and hasattr(type(message), "__add__")
+
+
+def _merge_dicts(first: dict, second: dict) -> Optional[dict]:
+    """Concatenate the text of two serialized message chunks, or None if they can't be merged."""
+    for message in (first, second):
+        if not isinstance(message.get("content"), str) or any(message.get(field) for field in _DELTA_FIELDS):
+            return None
+    return {**first, "content": first["content"] + second["content"]}
+
+
+def _merge_messages(first: Any, second: Any) -> Optional[Any]:
+    if isinstance(first, dict) and isinstance(second, dict):
+        return _merge_dicts(first, second)
+    if _is_message_object(first) and type(first) is type(second):
+        # LangChain message chunks know how to add themselves, tool call chunks included
+        return first + second
+    return None
+
+
+def _message_id(message: Any) -> Optional[str]:
+    return message.get("id") if isinstance(message, dict) else getattr(message, "id", None)
+
+
+def _content_size(message: Any) -> int:
+    content = message.get("content") if isinstance(message, dict) else getattr(message, "content", None)
+    return len(content) if isinstance(content, (str, list)) else 0
+
+
+class _Delta:
+    """A message delta found in a chunk, with what's needed to put a merged message back."""
+
+    __slots__ = ("key", "message", "rebuild", "replace")
+
+    def __init__(self, key: tuple, message: Any, rebuild: Optional[Callable[[Any, Any], Any]], replace: bool = False) -> None:
+        self.key = key
+        self.message = message
+        self.rebuild = rebuild
+        self.replace = replace
+
+
+def _rebuild_event(data: Any) -> Callable[[Any, Any], Any]:
+    def rebuild(message: Any, last: Any) -> Any:
+        payload = type(data)((message, *data[1:]))
+        if isinstance(last, StreamEvent):
+            return StreamEvent(last.event, payload, last.id, last.run_id)
+        return last._replace(data=payload)
+    return rebuild
+
+
+def _split(chunk: Any) -> Optional[_Delta]:
+    """Find the message delta carried by a chunk, in any of the shapes run streams use."""
+    event = getattr(chunk, "event", None)
+    if isinstance(event, str) and hasattr(chunk, "data"):
+        # StreamEvent from stream_run, or a StreamPart from a multi-mode RemoteGraph stream
+        data = chunk.data
+        mode = event.split("|", 1)[0]
+        if mode == "messages/partial" and isinstance(data, list) and data:
+            # Partial messages are cumulative, so the latest one supersedes the ones before it
+            ids = tuple(_message_id(message) for message in data)
+            if None not in ids:
+                return _Delta((event, ids), data, None, replace=True)
+        elif mode == "messages" and isinstance(data, (list, tuple)) and len(data) == 2:
+            message_id = _message_id(data[0])
+            if message_id is not None:
+                return _Delta((event, message_id), data[0], _rebuild_event(data))
+        return None
+
+    if isinstance(chunk, dict):
+        # Version 2 stream parts: {"type": "messages", "ns": ..., "data": (message, metadata)}
+        data = chunk.get("data")
+        if chunk.get("type") == "messages" and isinstance(data, (list, tuple)) and len(data) == 2:
+            message_id = _message_id(data[0])
+            if message_id is not None:
+                return _Delta(
+                    ("messages", chunk.get("ns"), message_id),
+                    data[0],
+                    lambda message, last: {**last, "data": type(data)((message, data[1]))},
+                )
+        return None
+
+    if isinstance(chunk, tuple):
+        # (message, metadata), (ns, (message, metadata)) or (ns, "messages", (message, metadata))
+        if len(chunk) == 3 and chunk[1] == "messages":
+            namespace, data = chunk[0], chunk[2]
+            wrap = lambda pair, last: (last[0], last[1], pair)
+        elif len(chunk) == 2 and isinstance(chunk[0], tuple) and isinstance(chunk[1], tuple):
+            namespace, data = chunk[0], chunk[1]
+            wrap = lambda pair, last: (last[0], pair)
+        else:
+            namespace, data = None, chunk
+            wrap = lambda pair, last: pair
+        if len(data) == 2 and isinstance(data[1], dict) and (isinstance(data[0], dict) or _is_message_object(data[0])):
+            message_id = _message_id(data[0])
+            if message_id is not None:
+                return _Delta(
+                    (namespace, message_id),
+                    data[0],
+                    lambda message, last: wrap((message, data[1]), last),
+                )
+    return None
+
+
+class _Pending:
+    __slots__ = ("delta", "message", "last", "count", "size", "deadline")
+
+    def __init__(self, delta: _Delta, chunk: Any, deadline: float) -> None:
+        self.delta = delta
+        self.message = delta.message
+        self.last = chunk
+        self.count = 1
+        self.size = _content_size(delta.message)
+        self.deadline = deadline
+
+    def merge(self, delta: _Delta, chunk: Any) -> bool:
+        if delta.key != self.delta.key:
+            return False
+        if delta.replace:
+            merged = delta.message
+        else:
+            merged = _merge_messages(self.message, delta.message)
+            if merged is None:
+                return False
+        self.message = merged
+        self.last = chunk
+        self.count += 1
+        self.size = _content_size(merged) if delta.replace else self.size + _content_size(delta.message)
+        return True
+
+    def flush(self) -> Any:
+        if self.count == 1 or self.delta.replace:
+            return self.last
+        return self.delta.rebuild(self.message, self.last)
+
+
+class DeltaCoalescer:
+    """
+    Merges consecutive message deltas of the same message into fewer chunks.
+
+    In ``messages`` stream mode a run sends one chunk per token. The coalescer
+    buffers consecutive deltas that belong to the same message ID and emits
+    them as one chunk whose content is their concatenation, carrying the ID of
+    the last merged event. A batch is flushed when it holds ``max_chunks``
+    deltas or ``max_chars`` characters, when ``max_latency`` seconds have
+    passed since its first delta, or when any other chunk arrives. Every other
+    chunk passes through unchanged and in order. Cumulative
+    ``messages/partial`` events are coalesced by keeping the latest one.
+
+    Deltas that carry tool call chunks, usage or other extra fields are only
+    merged when they are LangChain message objects, which merge those fields
+    themselves; serialized ones are passed through as they are.
+
+    Attributes:
+        max_latency: Longest time, in seconds, a delta is held back
+        max_chunks: Most deltas merged into one chunk
+        max_chars: Content length at which a batch is flushed
+    """
+
+    def __init__(self, max_latency: float = 0.05, max_chunks: int = 64, max_chars: int = 4096) -> None:
+        """
+        Initialize the coalescer.
+
+        Args:
+            max_latency: Longest time, in seconds, a delta is held back
+            max_chunks: Most deltas merged into one chunk
+            max_chars: Content length at which a batch is flushed
+        """
+        if max_latency < 0 or max_chunks < 1 or max_chars < 1:
+            raise ValueError("max_latency must be >= 0 and max_chunks, max_chars >= 1")
+        self.max_latency = max_latency
+        self.max_chunks = max_chunks
+        self.max_chars = max_chars
+
+    def __call__(self, chunks: AsyncIterable) -> AsyncIterator:
+        """Wrap an async stream of chunks."""
+        return self._coalesce(chunks)
+
+    def _full(self, pending: _Pending) -> bool:
+        return pending.count >= self.max_chunks or pending.size >= self.max_chars
+
+    async def _coalesce(self, chunks: AsyncIterable) -> AsyncIterator:
+        loop = asyncio.get_running_loop()
+        iterator = chunks.__aiter__()
+        pending: Optional[_Pending] = None
+        # The upstream read in flight while a batch waits for its deadline; never
+        # cancelled between chunks, since cancelling it would end the upstream
+        next_chunk: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if pending is None:
+                    future, next_chunk = next_chunk, None
+                    try:
+                        # Pick up the read left in flight by a batch flushed on its deadline
+                        chunk = await (future if future is not None else iterator.__anext__())
+                    except StopAsyncIteration:
+                        return
+                else:
+                    if next_chunk is None:
+                        next_chunk = asyncio.ensure_future(iterator.__anext__())
+                    done, _ = await asyncio.wait({next_chunk}, timeout=max(0.0, pending.deadline - loop.time()))
+                    if not done:
+                        yield pending.flush()
+                        pending = None
+                        continue
+                    future, next_chunk = next_chunk, None
+                    try:
+                        chunk = future.result()
+                    except StopAsyncIteration:
+                        yield pending.flush()
+                        return
+
+                delta = _split(chunk)
+                if pending is not None:
+                    if delta is not None and pending.merge(delta, chunk):
+                        if self._full(pending):
+                            yield pending.flush()
+                            pending = None
+                        continue
+                    yield pending.flush()
+                    pending = None
+
+                if delta is None:
+                    yield chunk
+                else:
+                    pending = _Pending(delta, chunk, loop.time() + self.max_latency)
+                    if self._full(pending):
+                        yield pending.flush()
+                        pending = None
+        finally:
+            if next_chunk is not None:
+                next_chunk.cancel()
+                await asyncio.gather(next_chunk, return_exceptions=True)
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,45 @@
+"""JSON encoding and decoding, using orjson when it is installed."""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Serialize objects the JSON encoders don't know natively."""
+    if hasattr(obj, "model_dump") and callable(obj.model_dump):
+        return obj.model_dump()
+    if hasattr(obj, "dict") and callable(obj.dict):
+        return obj.dict()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Decode JSON from bytes or str."""
+        return orjson.loads(data)
+
+else:
+    _encoder = json.JSONEncoder(default=_default, separators=(",", ":"), ensure_ascii=False)
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact JSON bytes."""
+        return _encoder.encode(obj).encode("utf-8")
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Decode JSON from bytes or str."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
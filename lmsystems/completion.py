@@ -0,0 +1,383 @@
+"""Completion tracking for many background runs with batched polling and webhooks."""
+import asyncio
+import secrets
+from typing import Any, Optional
+
+from .batch import bounded_map
+from .codec import loads
+from .exceptions import APIError, GraphError
+
+# Run statuses after which a run won't change any more
+TERMINAL_STATUSES = frozenset({"success", "error", "timeout", "interrupted"})
+FAILED_STATUSES = frozenset({"error", "timeout"})
+
+
+class _Tracked:
+    __slots__ = ("thread_id", "run_id", "future", "interval", "due")
+
+    def __init__(self, thread_id: str, run_id: str, future: asyncio.Future, interval: float, due: float) -> None:
+        self.thread_id = thread_id
+        self.run_id = run_id
+        self.future = future
+        self.interval = interval
+        self.due = due
+
+
+class CompletionTracker:
+    """
+    Resolves futures for many background runs from a single scheduler.
+
+    ``track`` returns an ``asyncio.Future`` per run. One task polls the runs
+    that are due, ``batch_size`` at a time: runs on threads with several
+    tracked runs are checked with one ``runs.list`` per thread, and single-run
+    threads are checked together with one ``threads.search`` so only finished
+    ones need a ``runs.get``. A run that is still going is polled again after
+    an interval that grows by ``backoff`` from ``min_interval`` up to
+    ``max_interval``, so long runs cost few requests.
+
+    With ``start_webhook_receiver`` the tracker also accepts LangGraph run
+    webhooks on a local endpoint. Runs created through ``submit`` then report
+    their own completion, and polling only runs every ``max_interval`` as a
+    safety net for lost webhooks.
+
+    A future resolves to the run's output (the thread values from
+    ``runs.join``), or to the run itself with ``fetch_output=False``. Runs that
+    end in ``error`` or ``timeout`` fail their future with ``GraphError``.
+
+    Attributes:
+        min_interval: First delay, in seconds, before polling a new run
+        max_interval: Longest delay between polls of the same run
+        backoff: Factor the delay grows by after each poll of an unfinished run
+        batch_size: Most runs checked per polling round
+        concurrency: Most requests in flight per polling round
+        fetch_output: Resolve futures to run outputs rather than run objects
+        webhook_url: URL to pass as ``webhook`` to ``create_run``, once the receiver runs
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        min_interval: float = 0.5,
+        max_interval: float = 10.0,
+        backoff: float = 1.5,
+        batch_size: int = 100,
+        concurrency: int = 8,
+        fetch_output: bool = True,
+    ) -> None:
+        """
+        Initialize the tracker. The scheduler starts with the first tracked run.
+
+        Args:
+            client: The ``LmsystemsClient`` the runs belong to
+            min_interval: First delay, in seconds, before polling a new run
+            max_interval: Longest delay between polls of the same run
+            backoff: Factor the delay grows by after each poll of an unfinished run
+            batch_size: Most runs checked per polling round
+            concurrency: Most requests in flight per polling round
+            fetch_output: Resolve futures to run outputs rather than run objects
+        """
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.fetch_output = fetch_output
+        self.webhook_url: Optional[str] = None
+        self._tracked: dict[str, _Tracked] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._webhook_path: Optional[str] = None
+        self._search_threads = True
+        # Webhook completions in progress, referenced so they can't be collected mid-flight
+        self._finishing: set = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of runs whose future hasn't resolved yet."""
+        return len(self._tracked)
+
+    def track(self, thread: dict, run: dict) -> asyncio.Future:
+        """
+        Track a created run and return a future for its outcome.
+
+        Args:
+            thread: Thread the run belongs to
+            run: The run, as returned by ``create_run``
+        """
+        thread_id = self.client._get_thread_id(thread)
+        run_id = run.get("run_id") or run.get("id")
+        if not run_id:
+            raise APIError("Invalid run response format")
+
+        existing = self._tracked.get(run_id)
+        if existing is not None:
+            return existing.future
+
+        loop = asyncio.get_running_loop()
+        # With webhooks coming in, polling is only a fallback
+        interval = self.max_interval if self.webhook_url else self.min_interval
+        tracked = _Tracked(thread_id, run_id, loop.create_future(), interval, loop.time() + interval)
+        self._tracked[run_id] = tracked
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._schedule())
+        else:
+            self._wake.set()
+        return tracked.future
+
+    async def submit(self, thread: dict, **kwargs: Any) -> asyncio.Future:
+        """
+        Create a run with ``create_run`` and track it.
+
+        The run is created with the receiver's ``webhook_url`` when it's running.
+        Returns the run's future once the run exists.
+        """
+        if self.webhook_url is not None:
+            kwargs.setdefault("webhook", self.webhook_url)
+        run = await self.client.create_run(thread, **kwargs)
+        return self.track(thread, run)
+
+    async def start_webhook_receiver(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        public_url: Optional[str] = None,
+    ) -> str:
+        """
+        Listen for run webhooks and return the URL runs should post to.
+
+        The URL path holds a random token, so only senders that were given the
+        URL can complete runs.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            public_url: Base URL the deployment reaches the receiver at, when it
+                isn't ``http://host:port`` (e.g. behind a proxy or tunnel)
+        """
+        if self._server is None:
+            self._webhook_path = f"/lmsystems/runs/{secrets.token_urlsafe(16)}"
+            self._server = await asyncio.start_server(self._handle_webhook, host, port)
+            port = self._server.sockets[0].getsockname()[1]
+            base_url = (public_url or f"http://{host}:{port}").rstrip("/")
+            self.webhook_url = f"{base_url}{self._webhook_path}"
+        return self.webhook_url
+
+    async def aclose(self) -> None:
+        """Stop polling and the webhook receiver, cancelling futures still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            self.webhook_url = None
+        for task in list(self._finishing):
+            task.cancel()
+        for tracked in self._tracked.values():
+            tracked.future.cancel()
+        self._tracked.clear()
+
+    async def _schedule(self) -> None:
+        try:
+            await self._poll_until_done()
+        except Exception as e:
+            # Nothing would resolve the remaining futures any more, so fail them
+            for tracked in self._tracked.values():
+                if not tracked.future.done():
+                    tracked.future.set_exception(e)
+            self._tracked.clear()
+
+    async def _poll_until_done(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._tracked:
+            now = loop.time()
+            due = []
+            next_due = None
+            for tracked in list(self._tracked.values()):
+                if tracked.future.done():
+                    # Cancelled by the caller
+                    del self._tracked[tracked.run_id]
+                elif tracked.due <= now:
+                    due.append(tracked)
+                elif next_due is None or tracked.due < next_due:
+                    next_due = tracked.due
+            if not due:
+                if next_due is None:
+                    continue
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), next_due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            due.sort(key=lambda tracked: tracked.due)
+            await self._poll(due[:self.batch_size])
+
+    async def _poll(self, batch: list) -> None:
+        try:
+            statuses = await self._statuses(batch)
+        except APIError:
+            # Keep the runs and try again later
+            statuses = {}
+
+        loop = asyncio.get_running_loop()
+        finished = []
+        for tracked in batch:
+            status = statuses.get(tracked.run_id)
+            if status in TERMINAL_STATUSES and self._tracked.pop(tracked.run_id, None) is not None:
+                finished.append((tracked, status))
+            else:
+                tracked.interval = min(tracked.interval * self.backoff, self.max_interval)
+                tracked.due = loop.time() + tracked.interval
+
+        async def finish(index: int, item: tuple) -> None:
+            await self._finish(*item)
+
+        async for _ in bounded_map(finish, finished, self.concurrency):
+            pass
+
+    async def _statuses(self, batch: list) -> dict:
+        """Current status of each run in ``batch`` that could be determined."""
+        by_thread: dict[str, list] = {}
+        for tracked in batch:
+            by_thread.setdefault(tracked.thread_id, []).append(tracked)
+
+        statuses: dict[str, str] = {}
+        to_get = []
+        single = [runs[0] for runs in by_thread.values() if len(runs) == 1]
+        if single and self._search_threads:
+            try:
+                threads = await self.client._call(
+                    "search threads",
+                    lambda: self.client.client.threads.search(
+                        ids=[tracked.thread_id for tracked in single],
+                        limit=len(single),
+                        select=["thread_id", "status"],
+                    ),
+                    idempotent=True,
+                )
+            except APIError as e:
+                if e.status_code is not None and e.status_code >= 500:
+                    raise
+                # Servers or SDKs without thread search by ID (the latter fail with a
+                # TypeError, so there's no status code): fall back to one lookup per run
+                self._search_threads = False
+                to_get.extend(single)
+            else:
+                busy = {thread["thread_id"] for thread in threads if thread.get("status") == "busy"}
+                for tracked in single:
+                    if tracked.thread_id in busy:
+                        statuses[tracked.run_id] = "running"
+                    else:
+                        to_get.append(tracked)
+        else:
+            to_get.extend(single)
+
+        async def list_runs(index: int, runs: list) -> None:
+            listed = await self.client._call(
+                "list runs",
+                lambda: self.client.client.runs.list(runs[0].thread_id, limit=max(10, len(runs) * 2)),
+                idempotent=True,
+            )
+            found = {run["run_id"]: run["status"] for run in listed}
+            for tracked in runs:
+                if tracked.run_id in found:
+                    statuses[tracked.run_id] = found[tracked.run_id]
+                else:
+                    to_get.append(tracked)
+
+        async def get_run(index: int, tracked: _Tracked) -> None:
+            try:
+                run = await self.client._call(
+                    "get run",
+                    lambda: self.client.client.runs.get(tracked.thread_id, tracked.run_id),
+                    idempotent=True,
+                )
+            except APIError as e:
+                if e.status_code == 404 and self._tracked.pop(tracked.run_id, None) is not None:
+                    self.client._run_finished(tracked.run_id)
+                    tracked.future.set_exception(GraphError(f"Run {tracked.run_id} not found"))
+                return
+            statuses[tracked.run_id] = run["status"]
+
+        multi = [runs for runs in by_thread.values() if len(runs) > 1]
+        async for _ in bounded_map(list_runs, multi, self.concurrency):
+            pass
+        async for _ in bounded_map(get_run, to_get, self.concurrency):
+            pass
+        return statuses
+
+    async def _finish(self, tracked: _Tracked, status: str, run: Optional[dict] = None) -> None:
+        """Resolve a finished run's future (the run is already untracked)."""
+        # A deadline set at creation mustn't cancel the run now that it's over
+        self.client._run_finished(tracked.run_id)
+        if tracked.future.done():
+            return
+        if status in FAILED_STATUSES:
+            tracked.future.set_exception(GraphError(f"Run {tracked.run_id} ended with status '{status}'"))
+            return
+        try:
+            if not self.fetch_output:
+                result = run or await self.client._call(
+                    "get run",
+                    lambda: self.client.client.runs.get(tracked.thread_id, tracked.run_id),
+                    idempotent=True,
+                )
+            elif run is not None and "values" in run:
+                result = run["values"]
+            else:
+                result = await self.client._call(
+                    "join run",
+                    lambda: self.client.client.runs.join(tracked.thread_id, tracked.run_id),
+                    idempotent=True,
+                )
+        except Exception as e:
+            if not tracked.future.done():
+                tracked.future.set_exception(e)
+            return
+        if not tracked.future.done():
+            tracked.future.set_result(result)
+
+    async def _handle_webhook(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        status_line = "404 Not Found"
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, _ = request_line.split(" ", 2)
+            length = 0
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value.strip())
+            body = await reader.readexactly(length) if length else b""
+            if method == "POST" and target.split("?", 1)[0] == self._webhook_path:
+                status_line = "200 OK"
+                self._on_webhook(loads(body))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            return
+        except ValueError:
+            status_line = "400 Bad Request"
+        finally:
+            try:
+                writer.write(f"HTTP/1.1 {status_line}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    def _on_webhook(self, payload: Any) -> None:
+        if not isinstance(payload, dict):
+            raise ValueError("Webhook payload must be a JSON object")
+        status = payload.get("status")
+        if status not in TERMINAL_STATUSES:
+            return
+        tracked = self._tracked.pop(payload.get("run_id"), None)
+        if tracked is not None:
+            task = asyncio.get_running_loop().create_task(self._finish(tracked, status, payload))
+            self._finishing.add(task)
+            task.add_done_callback(self._finishing.discard)
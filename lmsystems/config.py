@@ -3,7 +3,16 @@ from typing import Optional
 
 class Config:
     DEFAULT_BASE_URL = os.getenv("LMSYSTEMS_BASE_URL", "https://api.lmsystems.ai")
+    DEFAULT_GRAPH_INFO_CACHE_TTL = 300.0
 
     @staticmethod
     def get_base_url() -> str:
-        return os.environ.get("LMSYSTEMS_BASE_URL", Config.DEFAULT_BASE_URL)
\ No newline at end of file
+        return os.environ.get("LMSYSTEMS_BASE_URL", Config.DEFAULT_BASE_URL)
+
+    @staticmethod
+    def get_graph_info_cache_dir() -> Optional[str]:
+        return os.environ.get("LMSYSTEMS_GRAPH_INFO_CACHE_DIR") or None
+
+    @staticmethod
+    def get_graph_info_cache_ttl() -> float:
+        return float(os.environ.get("LMSYSTEMS_GRAPH_INFO_CACHE_TTL", Config.DEFAULT_GRAPH_INFO_CACHE_TTL))
@@ -0,0 +1,285 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Optional
+
+# Graph info fields that may carry a JWT, in the order their expiry is trusted
+TOKEN_FIELDS = ("access_token", "lgraph_api_key")
+
+
+def token_expiry(graph_info: dict) -> Optional[float]:
+    """
+    Return the ``exp`` claim of the credentials in ``graph_info`` as a Unix timestamp.
+
+    The token is decoded without verifying its signature, it is only read to
+    schedule a refresh. Returns None when no field holds a JWT with an ``exp``.
+    """
+    for field in TOKEN_FIELDS:
+        token = graph_info.get(field)
+        if not isinstance(token, str) or token.count(".") != 2:
+            continue
+        import jwt
+
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False, "verify_exp": False})
+        except jwt.InvalidTokenError:
+            continue
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            return float(exp)
+    return None
+
+
+def _weak_callable(func: Optional[Callable]) -> Optional[Callable[[], Optional[Callable]]]:
+    """Reference ``func`` without keeping the object of a bound method alive."""
+    if func is None:
+        return None
+    if getattr(func, "__self__", None) is not None:
+        try:
+            return weakref.WeakMethod(func)
+        except TypeError:
+            # Builtin methods such as list.append can't be referenced weakly
+            pass
+    return lambda: func
+
+
+class _RefreshScheduler:
+    """
+    Runs the refreshes of every sync ``CredentialManager`` on one daemon thread.
+
+    Entries hold their manager weakly, so a manager whose owner was garbage
+    collected simply drops out. The thread exits once nothing is scheduled and
+    is started again by the next ``schedule``.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._heap: list = []
+        self._order = itertools.count()
+        self._dead = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, manager: "CredentialManager", delay: float) -> float:
+        """Run ``manager``'s refresh after ``delay`` seconds and return the due time."""
+        due = time.monotonic() + delay
+        with self._cond:
+            if self._dead > 64 and self._dead > len(self._heap) // 2:
+                # Entries of collected managers would otherwise linger until their due time
+                self._heap = [entry for entry in self._heap if entry[2]() is not None]
+                heapq.heapify(self._heap)
+                self._dead = 0
+            heapq.heappush(self._heap, (due, next(self._order), weakref.ref(manager, self._collected)))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="lmsystems-credentials", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return due
+
+    def _collected(self, ref: weakref.ref) -> None:
+        # May run inside garbage collection on any thread, so only count here
+        self._dead += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if not self._heap:
+                        self._thread = None
+                        return
+                    due, _, ref = self._heap[0]
+                    delay = due - time.monotonic()
+                    if delay <= 0:
+                        heapq.heappop(self._heap)
+                        break
+                    self._cond.wait(delay)
+            manager = ref()
+            if manager is not None:
+                try:
+                    manager._due(due)
+                except Exception:
+                    # One owner's failing error callback mustn't stop everyone's refreshes
+                    pass
+            del manager
+
+
+_scheduler = _RefreshScheduler()
+
+
+class CredentialManager:
+    """
+    Refreshes graph info in the background before its credentials expire.
+
+    The expiry is read from the token's ``exp`` claim. ``refresh_margin`` seconds
+    before it, fresh graph info is fetched and handed to ``apply``, which swaps
+    the owner's LangGraph client in a single attribute assignment. Requests and
+    streams already running keep the client they started with, and streams
+    reconnect through the new one. If a refresh fails, the old credentials stay
+    in place and the refresh is retried every ``retry_interval`` seconds.
+
+    Async owners pass ``afetch`` and the refresh runs as a task on the current
+    event loop; started outside a loop, it waits for the owner to call ``start``
+    again from one. Sync owners pass ``fetch`` and the refresh runs on a single
+    daemon thread shared by every sync owner in the process. Credentials without
+    an ``exp`` claim are never refreshed. Bound methods are held weakly, so the
+    background refresh doesn't keep its owner alive, and refreshing stops once
+    the owner is garbage collected.
+
+    Attributes:
+        expires_at: Expiry of the current credentials, or None if unknown
+        refreshes: Number of successful refreshes
+        failures: Number of failed refresh attempts
+        last_error: Error of the most recent failed attempt, if any
+        deferred: Whether an async refresh is waiting for an event loop to start on
+    """
+
+    def __init__(
+        self,
+        apply: Callable[[dict], None],
+        *,
+        fetch: Optional[Callable[[], dict]] = None,
+        afetch: Optional[Callable[[], Awaitable[dict]]] = None,
+        refresh_margin: float = 300.0,
+        retry_interval: float = 30.0,
+        on_error: Optional[Callable[[BaseException], Any]] = None,
+    ) -> None:
+        """
+        Initialize the credential manager.
+
+        Args:
+            apply: Called with fresh graph info to swap in the new credentials
+            fetch: Fetches fresh graph info, bypassing any cache (sync owners)
+            afetch: Async counterpart of ``fetch`` (async owners)
+            refresh_margin: Seconds before expiry at which to refresh
+            retry_interval: Seconds between attempts after a failed refresh
+            on_error: Called with the error of every failed attempt
+        """
+        if fetch is None and afetch is None:
+            raise ValueError("CredentialManager needs fetch or afetch")
+        self._apply = _weak_callable(apply)
+        self._fetch = _weak_callable(fetch)
+        self._afetch = _weak_callable(afetch)
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.on_error = on_error
+
+        self.expires_at: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error: Optional[BaseException] = None
+        self.deferred = False
+        self._attempted = False
+        self._task: Optional[asyncio.Task] = None
+        self._due_at: Optional[float] = None
+        self._stopped = threading.Event()
+        owner = getattr(apply, "__self__", None)
+        if owner is not None:
+            try:
+                weakref.finalize(owner, self.stop)
+            except TypeError:
+                pass
+
+    def next_delay(self) -> Optional[float]:
+        """Seconds until the next refresh attempt, or None if none is due."""
+        if self.expires_at is None:
+            return None
+        delay = self.expires_at - self.refresh_margin - time.time()
+        if delay > 0:
+            return delay
+        # Credentials issued with less than the margin left would otherwise be refreshed in a loop
+        return self.retry_interval if self._attempted else 0.0
+
+    def start(self, graph_info: dict) -> None:
+        """Track the credentials in ``graph_info`` and schedule their refresh."""
+        self.expires_at = token_expiry(graph_info)
+        if self.expires_at is None or self._stopped.is_set():
+            return
+        if self._afetch is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.deferred = True
+                return
+            self.deferred = False
+            if self._task is None or self._task.done():
+                self._task = loop.create_task(self._run())
+        else:
+            # Rescheduling makes any earlier entry stale
+            self._due_at = _scheduler.schedule(self, self.next_delay())
+
+    def stop(self) -> None:
+        """Stop refreshing. Credentials in use are left untouched."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def aclose(self) -> None:
+        """Stop refreshing and wait for the background task to finish."""
+        self.stop()
+        if self._task is not None:
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _applied(self, graph_info: dict) -> None:
+        apply = self._apply()
+        if apply is None:
+            return
+        apply(graph_info)
+        self.expires_at = token_expiry(graph_info)
+        self.refreshes += 1
+        self.last_error = None
+
+    def _failed(self, error: BaseException) -> None:
+        self.failures += 1
+        self.last_error = error
+        if self.on_error is not None:
+            self.on_error(error)
+
+    async def arefresh(self) -> bool:
+        """Fetch and apply fresh credentials now; returns False and keeps the old ones on failure."""
+        afetch = self._afetch()
+        if afetch is None:
+            self.stop()
+            return False
+        self._attempted = True
+        try:
+            self._applied(await afetch())
+        except Exception as e:
+            self._failed(e)
+            return False
+        return True
+
+    def refresh(self) -> bool:
+        """Sync counterpart of ``arefresh``."""
+        fetch = self._fetch()
+        if fetch is None:
+            self.stop()
+            return False
+        self._attempted = True
+        try:
+            self._applied(fetch())
+        except Exception as e:
+            self._failed(e)
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while not self._stopped.is_set():
+            delay = self.next_delay()
+            if delay is None:
+                return
+            await asyncio.sleep(delay)
+            await self.arefresh()
+
+    def _due(self, due: float) -> None:
+        """Called by the shared scheduler when a sync refresh is due."""
+        if due != self._due_at or self._stopped.is_set():
+            return
+        self.refresh()
+        delay = self.next_delay()
+        if delay is not None and not self._stopped.is_set():
+            self._due_at = _scheduler.schedule(self, delay)
@@ -0,0 +1,173 @@
+"""Per-call deadlines and cancellation of abandoned remote runs."""
+import asyncio
+import time
+from typing import Any, AsyncIterator, Optional, Union
+
+from .exceptions import APIError, DeadlineExceededError
+
+# Cancellations started from finalizers, kept alive until they finish
+_pending_cancels: set = set()
+
+
+class Deadline:
+    """
+    A point in time by which a call has to finish.
+
+    Create one with ``Deadline.after(seconds)`` and pass the same object to
+    ``create_run``, ``stream_run`` and ``invoke`` to give the whole exchange one
+    time budget. Anywhere a deadline is accepted, a number of seconds also works
+    and starts counting when the call is made.
+
+    Attributes:
+        expires_at: ``time.monotonic()`` value at which the deadline passes
+    """
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, expires_at: float) -> None:
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Deadline ``seconds`` from now."""
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, or 0 once the deadline has passed."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f})"
+
+
+def as_deadline(value: Union[Deadline, float, None]) -> Optional[Deadline]:
+    """Accept a ``Deadline``, a timeout in seconds, or None."""
+    if value is None or isinstance(value, Deadline):
+        return value
+    return Deadline.after(value)
+
+
+class RunGuard:
+    """
+    Cancels a remote run once it is abandoned or its deadline passes.
+
+    ``arm`` schedules ``runs.cancel`` for when the deadline passes, and ``finish``
+    marks the run as done so nothing gets cancelled. ``abandon`` is safe to call
+    from a finalizer, another thread or a task that is being cancelled: it
+    schedules the cancellation on the guard's event loop instead of awaiting it.
+    Runs whose thread or run ID isn't known can't be cancelled and are left alone.
+
+    Attributes:
+        thread_id: Thread of the guarded run, once known
+        run_id: The guarded run, once known
+        deadline: When the run gets cancelled, if it's still going
+        finished: Whether the run completed, so there's nothing to cancel
+        cancelled: Whether ``runs.cancel`` was issued
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        thread_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """
+        Initialize the guard. Nothing is scheduled until ``arm``.
+
+        Args:
+            client: The ``LmsystemsClient`` the run belongs to
+            thread_id: Thread of the run, if already known
+            run_id: The run, if already known
+            deadline: When to cancel the run if it's still going
+        """
+        self.client = client
+        self.thread_id = thread_id
+        self.run_id = run_id
+        self.deadline = deadline
+        self.finished = False
+        self.cancelled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def bind(self, thread_id: Optional[str], run_id: Optional[str]) -> None:
+        """Record the run's IDs once they are known."""
+        self.thread_id = self.thread_id or thread_id
+        self.run_id = self.run_id or run_id
+
+    def arm(self) -> None:
+        """Attach to the running loop and schedule the deadline, if any."""
+        self._loop = asyncio.get_running_loop()
+        if self.deadline is not None and self._timer is None and not self.finished:
+            self._timer = self._loop.call_later(self.deadline.remaining(), self._spawn)
+
+    def finish(self) -> None:
+        """Mark the run as completed."""
+        self.finished = True
+        self._stop_timer()
+
+    async def cancel(self) -> None:
+        """Cancel the run now, unless it finished or was already cancelled."""
+        self._stop_timer()
+        if self.finished or self.cancelled or self.thread_id is None or self.run_id is None:
+            return
+        self.cancelled = True
+        thread_id, run_id = self.thread_id, self.run_id
+        try:
+            await self.client._call(
+                "cancel run",
+                lambda: self.client.client.runs.cancel(thread_id, run_id),
+                idempotent=True,
+            )
+        except APIError:
+            # Most likely the run finished in the meantime
+            pass
+
+    def abandon(self) -> None:
+        """Schedule cancellation without waiting for it."""
+        loop = self._loop
+        if self.finished or self.cancelled or loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._spawn)
+        except RuntimeError:
+            # The loop closed in between
+            pass
+
+    def _spawn(self) -> None:
+        self._timer = None
+        if self.finished or self.cancelled:
+            return
+        task = self._loop.create_task(self.cancel())
+        _pending_cancels.add(task)
+        task.add_done_callback(_pending_cancels.discard)
+
+    def _stop_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+async def iter_until(chunks: AsyncIterator, deadline: Deadline) -> AsyncIterator:
+    """
+    Pass chunks through until ``deadline``, then raise ``DeadlineExceededError``.
+
+    The upstream iterator is closed either way, which closes its connection.
+    """
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), deadline.remaining())
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError("Deadline exceeded while streaming the run") from None
+            yield chunk
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
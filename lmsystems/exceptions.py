@@ -1,3 +1,10 @@
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
 class LmsystemsError(Exception):
     """Base exception for lmsystems SDK.
 
@@ -48,5 +55,93 @@ class APIError(LmsystemsError):
     - Network connectivity issues occur
     - Rate limits are exceeded
     - Unexpected API responses are received
+
+    Attributes:
+        status_code: HTTP status code of the failed response, if there was one
+        retryable: Whether repeating the request may succeed
+        retry_after: Seconds the server asked us to wait before retrying, if any
+    """
+    def __init__(
+        self,
+        message: str,
+        *,
+        status_code: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_exception(cls, message: str, error: BaseException) -> "APIError":
+        """
+        Build an APIError for ``error``, keeping its status code and retry hints.
+
+        Args:
+            message: Message prefix describing the failed operation
+            error: The underlying httpx error (or a nested APIError)
+        """
+        if isinstance(error, APIError):
+            status_code, retryable, retry_after = error.status_code, error.retryable, error.retry_after
+        else:
+            response = getattr(error, "response", None)
+            status_code = getattr(response, "status_code", None)
+            retry_after = _parse_retry_after(response)
+            if status_code is not None:
+                retryable = status_code in RETRYABLE_STATUS_CODES
+            else:
+                # No response at all means a network failure (connect/read/timeout)
+                import httpx
+                retryable = isinstance(error, httpx.TransportError)
+
+        error_cls = RateLimitError if status_code == 429 else cls
+        return error_cls(
+            f"{message}: {str(error)}",
+            status_code=status_code,
+            retryable=retryable,
+            retry_after=retry_after,
+        )
+
+
+class RateLimitError(APIError):
+    """Raised when the backend or a graph deployment answers 429 Too Many Requests.
+
+    ``retry_after`` holds the server's Retry-After hint in seconds, when sent.
     """
     pass
+
+
+class SlowConsumerError(LmsystemsError):
+    """Raised to a multicast stream subscriber that fell too far behind.
+
+    Only subscribers using the ``"disconnect"`` slow-consumer policy are
+    disconnected this way.
+    """
+    pass
+
+
+class DeadlineExceededError(LmsystemsError):
+    """Raised when a call's deadline passes before the run finishes.
+
+    The remote run is cancelled before this is raised, so it stops using
+    deployment capacity.
+    """
+    pass
+
+
+def _parse_retry_after(response) -> Optional[float]:
+    """Read a Retry-After header given in seconds or as an HTTP date."""
+    headers = getattr(response, "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
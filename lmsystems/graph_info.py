@@ -0,0 +1,171 @@
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .config import Config
+from .credentials import token_expiry
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """Return the HTTP status code carried by an httpx/requests error, if any."""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+class GraphInfoCache:
+    """
+    Cache for ``/api/get_graph_info`` responses shared by every client.
+
+    Entries are keyed by ``(base_url, sha256(api_key), graph_name)`` and live in an
+    in-process LRU with a TTL. When ``cache_dir`` is set, entries are also written
+    to disk so they survive restarts. Entries whose credentials carry a JWT
+    ``exp`` claim never outlive those credentials. The files contain the LangGraph API key for
+    the graph, so they are created readable by the current user only.
+
+    Attributes:
+        maxsize: Maximum number of entries kept in memory
+        ttl: Seconds an entry stays valid
+        cache_dir: Optional directory for the on-disk store
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 300.0,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the graph info cache.
+
+        Args:
+            maxsize: Maximum number of entries kept in memory
+            ttl: Seconds an entry stays valid, in memory and on disk
+            cache_dir: Optional directory for the on-disk store
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def make_key(base_url: str, api_key: str, graph_name: str) -> tuple:
+        """Build the cache key, never keeping the raw API key."""
+        api_key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        return (base_url.rstrip('/'), api_key_hash, graph_name)
+
+    def _path(self, key: tuple) -> str:
+        digest = hashlib.sha256("\x00".join(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, base_url: str, api_key: str, graph_name: str) -> Optional[dict]:
+        """Return the cached graph info, or None if missing or expired."""
+        key = self.make_key(base_url, api_key, graph_name)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, info = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    # Callers merge into the returned dict, so never hand out the cached one
+                    return copy.deepcopy(info)
+                del self._entries[key]
+
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as fh:
+                stored = json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+        expires_at = stored.get("expires_at", 0)
+        if expires_at <= now:
+            self._remove_file(key)
+            return None
+
+        info = stored.get("info")
+        self._remember(key, expires_at, info)
+        return copy.deepcopy(info)
+
+    def set(self, base_url: str, api_key: str, graph_name: str, info: dict) -> None:
+        """Store graph info in memory and, if configured, on disk."""
+        key = self.make_key(base_url, api_key, graph_name)
+        expires_at = time.time() + self.ttl
+        token_expires_at = token_expiry(info)
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        self._remember(key, expires_at, copy.deepcopy(info))
+
+        if not self.cache_dir:
+            return
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"expires_at": expires_at, "info": info}, fh)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # The disk store is best effort, the in-memory entry is enough
+            pass
+
+    def invalidate(self, base_url: str, api_key: str, graph_name: str) -> None:
+        """Drop a single entry, e.g. after a 401/403 from the backend or graph."""
+        key = self.make_key(base_url, api_key, graph_name)
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.cache_dir:
+            self._remove_file(key)
+
+    def clear(self) -> None:
+        """Drop every entry from memory and disk."""
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def _remember(self, key: tuple, expires_at: float, info: Any) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, info)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _remove_file(self, key: tuple) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+_default_cache: Optional[GraphInfoCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_graph_info_cache() -> GraphInfoCache:
+    """Return the process-wide cache used when a client isn't given one."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = GraphInfoCache(
+                ttl=Config.get_graph_info_cache_ttl(),
+                cache_dir=Config.get_graph_info_cache_dir(),
+            )
+        return _default_cache
@@ -0,0 +1,177 @@
+import threading
+from typing import Any, Callable, Optional
+
+OPERATION_DURATION = "lmsystems.operation.duration"
+STREAM_TIME_TO_FIRST_CHUNK = "lmsystems.stream.time_to_first_chunk"
+STREAM_DURATION = "lmsystems.stream.duration"
+STREAM_CHUNKS = "lmsystems.stream.chunks"
+STREAM_BYTES = "lmsystems.stream.bytes"
+ERRORS = "lmsystems.errors"
+
+HISTOGRAMS = {
+    OPERATION_DURATION: ("s", "Duration of SDK operations"),
+    STREAM_TIME_TO_FIRST_CHUNK: ("s", "Time from opening a stream to its first chunk"),
+    STREAM_DURATION: ("s", "Total duration of streams"),
+    STREAM_CHUNKS: ("{chunk}", "Chunks received per stream"),
+    STREAM_BYTES: ("By", "Bytes received per stream"),
+}
+COUNTERS = {
+    ERRORS: ("{error}", "Failed SDK operations by error class"),
+}
+
+
+class Instrumentation:
+    """
+    Receives latency and throughput measurements from clients and graphs.
+
+    Subclass and override ``record`` (histogram values) and ``add`` (counter
+    increments), or use ``CallbackInstrumentation``, ``InMemoryInstrumentation``
+    or ``OpenTelemetryInstrumentation``. Every measurement carries a
+    ``graph_name`` attribute; operation durations and errors also carry
+    ``operation`` (``graph_info``, ``create_thread``, ``create_run``, ...).
+    Clients built without instrumentation skip all measurement code.
+    """
+
+    def record(self, name: str, value: float, attributes: dict) -> None:
+        """Record a histogram value."""
+
+    def add(self, name: str, value: int, attributes: dict) -> None:
+        """Increment a counter."""
+
+    def operation(self, graph_name: str, operation: str, duration: float, error: Optional[BaseException] = None) -> None:
+        """Record one finished operation and, if it failed, its error class."""
+        attributes = {"graph_name": graph_name, "operation": operation}
+        self.record(OPERATION_DURATION, duration, attributes)
+        if error is not None:
+            self.add(ERRORS, 1, {**attributes, "error_class": type(error).__name__})
+
+    def stream(
+        self,
+        graph_name: str,
+        *,
+        duration: float,
+        chunks: int,
+        time_to_first_chunk: Optional[float] = None,
+        bytes_received: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record one finished stream."""
+        attributes = {"graph_name": graph_name}
+        if time_to_first_chunk is not None:
+            self.record(STREAM_TIME_TO_FIRST_CHUNK, time_to_first_chunk, attributes)
+        self.record(STREAM_DURATION, duration, attributes)
+        self.record(STREAM_CHUNKS, chunks, attributes)
+        if bytes_received is not None:
+            self.record(STREAM_BYTES, bytes_received, attributes)
+        if error is not None:
+            self.add(ERRORS, 1, {**attributes, "operation": "stream", "error_class": type(error).__name__})
+
+
+class CallbackInstrumentation(Instrumentation):
+    """Forwards measurements to plain callables."""
+
+    def __init__(
+        self,
+        on_record: Optional[Callable[[str, float, dict], None]] = None,
+        on_add: Optional[Callable[[str, int, dict], None]] = None,
+    ) -> None:
+        """
+        Initialize the instrumentation.
+
+        Args:
+            on_record: Called with ``(name, value, attributes)`` for histogram values
+            on_add: Called with ``(name, value, attributes)`` for counter increments
+        """
+        self.on_record = on_record
+        self.on_add = on_add
+
+    def record(self, name: str, value: float, attributes: dict) -> None:
+        if self.on_record is not None:
+            self.on_record(name, value, attributes)
+
+    def add(self, name: str, value: int, attributes: dict) -> None:
+        if self.on_add is not None:
+            self.on_add(name, value, attributes)
+
+
+class InMemoryInstrumentation(Instrumentation):
+    """
+    Keeps every measurement in memory, for tests, benchmarks and debugging.
+
+    Attributes:
+        values: Histogram values per ``(name, sorted attribute items)``
+        counters: Counter totals per ``(name, sorted attribute items)``
+    """
+
+    def __init__(self) -> None:
+        self.values: dict[tuple, list] = {}
+        self.counters: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, value: float, attributes: dict) -> None:
+        key = (name, tuple(sorted(attributes.items())))
+        with self._lock:
+            self.values.setdefault(key, []).append(value)
+
+    def add(self, name: str, value: int, attributes: dict) -> None:
+        key = (name, tuple(sorted(attributes.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def get(self, name: str, **attributes: Any) -> list:
+        """All values recorded for ``name`` whose attributes include ``attributes``."""
+        with self._lock:
+            return [
+                value
+                for (key_name, items), values in self.values.items()
+                if key_name == name and attributes.items() <= dict(items).items()
+                for value in values
+            ]
+
+    def count(self, name: str, **attributes: Any) -> int:
+        """Total of the counter ``name`` over entries whose attributes include ``attributes``."""
+        with self._lock:
+            return sum(
+                total
+                for (key_name, items), total in self.counters.items()
+                if key_name == name and attributes.items() <= dict(items).items()
+            )
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Reports measurements as OpenTelemetry histograms and counters.
+
+    Requires the ``opentelemetry-api`` package (``pip install lmsystems[otel]``).
+    """
+
+    def __init__(self, meter: Optional[Any] = None) -> None:
+        """
+        Initialize the instrumentation.
+
+        Args:
+            meter: OpenTelemetry meter to create instruments on (defaults to the
+                global meter provider's ``lmsystems`` meter)
+        """
+        if meter is None:
+            try:
+                from opentelemetry import metrics
+            except ImportError as e:
+                raise ImportError(
+                    "OpenTelemetryInstrumentation requires opentelemetry-api: pip install lmsystems[otel]"
+                ) from e
+            meter = metrics.get_meter("lmsystems")
+        self._histograms = {
+            name: meter.create_histogram(name, unit=unit, description=description)
+            for name, (unit, description) in HISTOGRAMS.items()
+        }
+        self._counters = {
+            name: meter.create_counter(name, unit=unit, description=description)
+            for name, (unit, description) in COUNTERS.items()
+        }
+
+    def record(self, name: str, value: float, attributes: dict) -> None:
+        self._histograms[name].record(value, attributes)
+
+    def add(self, name: str, value: int, attributes: dict) -> None:
+        self._counters[name].add(value, attributes)
@@ -0,0 +1,286 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Optional, Union
+
+from .exceptions import SlowConsumerError
+
+DROP = "drop"
+BLOCK = "block"
+DISCONNECT = "disconnect"
+POLICIES = (DROP, BLOCK, DISCONNECT)
+_DEFAULT = object()
+
+# Chunks kept for late subscribers unless told otherwise
+DEFAULT_REPLAY_SIZE = 1024
+# Seconds a "block" subscriber may hold back the upstream before it is disconnected
+DEFAULT_BLOCK_TIMEOUT = 30.0
+
+
+class Subscription:
+    """
+    One subscriber's view of a ``MulticastStream``.
+
+    Iterate it with ``async for``. Replayed chunks come first, then live
+    chunks from a buffer of at most ``buffer_size`` entries. When the buffer is
+    full, ``policy`` decides what happens to the next chunk:
+
+    - ``"drop"``: the oldest buffered chunk is discarded (counted in ``dropped``)
+    - ``"block"``: the upstream waits until this subscriber catches up, which
+      also holds back every other subscriber; after ``block_timeout`` seconds
+      the subscriber is disconnected with ``SlowConsumerError`` instead, so an
+      abandoned subscriber can't stall the rest
+    - ``"disconnect"``: the subscription ends with ``SlowConsumerError``
+
+    Attributes:
+        buffer_size: Maximum number of live chunks waiting to be read
+        policy: Slow-consumer policy, one of ``"drop"``, ``"block"`` or ``"disconnect"``
+        block_timeout: Longest wait, in seconds, for this subscriber under ``"block"`` (None waits forever)
+        dropped: Number of chunks discarded by the ``"drop"`` policy
+    """
+
+    def __init__(
+        self,
+        multicast: "MulticastStream",
+        buffer_size: int,
+        policy: str,
+        replay: list,
+        block_timeout: Optional[float] = DEFAULT_BLOCK_TIMEOUT,
+    ) -> None:
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._multicast = multicast
+        self._replay = deque(replay)
+        self._buffer: deque = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._finished = False
+        self._error: Optional[BaseException] = None
+
+    @property
+    def closed(self) -> bool:
+        return self._finished or self._error is not None
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Any:
+        while True:
+            if self._replay:
+                return self._replay.popleft()
+            if self._buffer:
+                chunk = self._buffer.popleft()
+                self._space.set()
+                return chunk
+            if self._error is not None:
+                raise self._error
+            if self._finished:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+
+    async def aclose(self) -> None:
+        """Unsubscribe. Chunks still buffered are discarded."""
+        self._multicast._unsubscribe(self)
+        self._replay.clear()
+        self._buffer.clear()
+        self._finish()
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def _offer(self, chunk: Any) -> bool:
+        """Hand a chunk over; returns False if this subscriber was disconnected."""
+        if len(self._buffer) >= self.buffer_size:
+            if self.policy == DROP:
+                self._buffer.popleft()
+                self.dropped += 1
+            elif self.policy == DISCONNECT:
+                self._fail(SlowConsumerError(f"Subscriber fell more than {self.buffer_size} chunks behind"))
+                return False
+            else:
+                loop = asyncio.get_running_loop()
+                give_up = None if self.block_timeout is None else loop.time() + self.block_timeout
+                while len(self._buffer) >= self.buffer_size and not self.closed:
+                    self._space.clear()
+                    try:
+                        await asyncio.wait_for(
+                            self._space.wait(), None if give_up is None else give_up - loop.time()
+                        )
+                    except asyncio.TimeoutError:
+                        self._fail(SlowConsumerError(
+                            f"Subscriber blocked the stream for more than {self.block_timeout} seconds"
+                        ))
+                if self.closed:
+                    return False
+        self._buffer.append(chunk)
+        self._ready.set()
+        return True
+
+    def _finish(self) -> None:
+        self._finished = True
+        self._ready.set()
+        self._space.set()
+
+    def _fail(self, error: BaseException) -> None:
+        self._error = error
+        self._ready.set()
+        self._space.set()
+
+
+class MulticastStream:
+    """
+    Fans one upstream stream out to any number of async subscribers.
+
+    The upstream (usually a ``RunStream`` from ``LmsystemsClient.stream_run``)
+    is read once, starting with the first subscriber, and every chunk is handed
+    to each subscriber's bounded buffer. The most recent ``replay_size`` chunks
+    are also kept for replay, so subscribers that join late first receive what
+    they missed. Upstream errors are raised to every subscriber.
+
+    Attributes:
+        buffer_size: Default buffer size of new subscriptions
+        policy: Default slow-consumer policy of new subscriptions
+        block_timeout: Default longest wait for a ``"block"`` subscriber, in seconds
+        replay: Whether late subscribers receive chunks seen before they joined
+        done: Whether the upstream has finished
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable,
+        *,
+        buffer_size: int = 256,
+        policy: str = DROP,
+        replay: bool = True,
+        replay_size: Optional[int] = DEFAULT_REPLAY_SIZE,
+        block_timeout: Optional[float] = DEFAULT_BLOCK_TIMEOUT,
+    ) -> None:
+        """
+        Initialize the multicast. Nothing is read until the first subscription.
+
+        Args:
+            source: The upstream async iterable
+            buffer_size: Default buffer size of new subscriptions
+            policy: Default slow-consumer policy: ``"drop"``, ``"block"`` or ``"disconnect"``
+            replay: Replay already seen chunks to late subscribers
+            replay_size: Keep only this many recent chunks for replay (None keeps all)
+            block_timeout: Seconds a ``"block"`` subscriber may hold back the
+                upstream before it is disconnected (None waits forever)
+        """
+        _check_subscription(buffer_size, policy)
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.replay = replay
+        self.done = False
+        self._source = source
+        self._history: deque = deque(maxlen=replay_size)
+        self._subscribers: list = []
+        self._error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscribers(self) -> int:
+        """Number of active subscriptions."""
+        return len(self._subscribers)
+
+    @property
+    def chunks(self) -> list:
+        """Chunks kept for replay, oldest first."""
+        return list(self._history)
+
+    def subscribe(
+        self,
+        *,
+        buffer_size: Optional[int] = None,
+        policy: Optional[str] = None,
+        replay: Optional[bool] = None,
+        block_timeout: Union[float, None, object] = _DEFAULT,
+    ) -> Subscription:
+        """
+        Add a subscriber, starting the upstream if it isn't running yet.
+
+        Args:
+            buffer_size: Override the default buffer size
+            policy: Override the default slow-consumer policy
+            replay: Override whether already seen chunks are replayed
+            block_timeout: Override the default ``block_timeout`` (None waits forever)
+        """
+        buffer_size = self.buffer_size if buffer_size is None else buffer_size
+        policy = policy or self.policy
+        _check_subscription(buffer_size, policy)
+
+        seen = list(self._history) if (self.replay if replay is None else replay) else []
+        block_timeout = self.block_timeout if block_timeout is _DEFAULT else block_timeout
+        subscription = Subscription(self, buffer_size, policy, seen, block_timeout)
+        if self._error is not None:
+            subscription._fail(self._error)
+        elif self.done:
+            subscription._finish()
+        else:
+            self._subscribers.append(subscription)
+            if self._task is None:
+                self._task = asyncio.get_running_loop().create_task(self._pump())
+        return subscription
+
+    def __aiter__(self) -> AsyncIterator:
+        return self.subscribe()
+
+    async def aclose(self) -> None:
+        """Stop reading the upstream and end every subscription."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        elif self._task is None:
+            await _aclose(self._source)
+        self._end()
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+
+    async def _pump(self) -> None:
+        try:
+            async for chunk in self._source:
+                self._history.append(chunk)
+                # Subscribers joining while a blocking one is awaited get this chunk by replay
+                for subscription in list(self._subscribers):
+                    if not await subscription._offer(chunk):
+                        self._unsubscribe(subscription)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._error = e
+            for subscription in self._subscribers:
+                subscription._fail(e)
+            self._subscribers = []
+        finally:
+            await _aclose(self._source)
+            self._end()
+
+    def _end(self) -> None:
+        self.done = True
+        for subscription in self._subscribers:
+            subscription._finish()
+        self._subscribers = []
+
+
+def _check_subscription(buffer_size: int, policy: str) -> None:
+    if buffer_size < 1:
+        raise ValueError("buffer_size must be at least 1")
+    if policy not in POLICIES:
+        raise ValueError(f"policy must be one of {', '.join(POLICIES)}, got {policy!r}")
+
+
+async def _aclose(source: Any) -> None:
+    aclose = getattr(source, "aclose", None)
+    if aclose is not None:
+        await aclose()
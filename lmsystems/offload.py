@@ -0,0 +1,175 @@
+"""Content-addressed upload of large static state values through the LangGraph store."""
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Iterable, Optional, Sequence
+
+from .result_cache import SingleFlight
+
+REF_KEY = "$lmsystems_ref"
+DEFAULT_NAMESPACE = ("lmsystems", "content")
+# Share of the store TTL after which a value is uploaded again
+REFRESH_FRACTION = 0.5
+
+
+def content_hash(value: Any) -> tuple:
+    """Return ``(sha256 hex digest, encoded size)`` of a value's canonical JSON form."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest(), len(encoded)
+
+
+def is_reference(value: Any) -> bool:
+    """Whether ``value`` is a reference left in place of an uploaded state value."""
+    return isinstance(value, dict) and len(value) == 1 and REF_KEY in value
+
+
+def resolve_references(state: dict, store: Any) -> dict:
+    """
+    Replace references in ``state`` with the values they point at.
+
+    For graph authors: call it with the node's LangGraph ``store`` to read state
+    that callers uploaded with ``StateOffload``.
+    """
+    resolved = dict(state)
+    for field, value in state.items():
+        if is_reference(value):
+            ref = value[REF_KEY]
+            item = store.get(tuple(ref["namespace"]), ref["key"])
+            if item is None:
+                raise KeyError(f"Referenced state value {ref['key']} for {field!r} is not in the store")
+            resolved[field] = item.value["value"]
+    return resolved
+
+
+async def aresolve_references(state: dict, store: Any) -> dict:
+    """Async counterpart of ``resolve_references``."""
+    resolved = dict(state)
+    for field, value in state.items():
+        if is_reference(value):
+            ref = value[REF_KEY]
+            item = await store.aget(tuple(ref["namespace"]), ref["key"])
+            if item is None:
+                raise KeyError(f"Referenced state value {ref['key']} for {field!r} is not in the store")
+            resolved[field] = item.value["value"]
+    return resolved
+
+
+class StateOffload:
+    """
+    Uploads large static state values once and sends references instead.
+
+    Each value whose JSON form is at least ``min_bytes`` long (or, if ``fields``
+    is given, each of those fields) is stored through the deployment's store API
+    under ``namespace`` with its SHA-256 digest as key, and replaced by
+    ``{"$lmsystems_ref": {"namespace": [...], "key": digest}}``. The graph
+    resolves references with ``resolve_references``.
+
+    ``stored`` is the local record of digests known to be in the store, so each
+    value is uploaded at most once per process; concurrent uploads of the same
+    digest share one request. With a ``ttl``, a record only counts for
+    ``REFRESH_FRACTION`` of the TTL (``refresh_after`` seconds) and the value is
+    uploaded again after that, so a reference sent just before the re-upload
+    still resolves for the rest of the TTL. Share one instance
+    between graphs of the same deployment to share the record.
+
+    Attributes:
+        min_bytes: Smallest encoded size of a value that gets uploaded
+        namespace: Store namespace the values are written to
+        fields: Fields to upload regardless of size (None uploads by size only)
+        ttl: Optional store TTL in minutes for uploaded values
+        stored: Digests known to be in the store, mapped to their ``time.monotonic()`` upload time
+    """
+
+    def __init__(
+        self,
+        min_bytes: int = 16 * 1024,
+        namespace: Sequence[str] = DEFAULT_NAMESPACE,
+        fields: Optional[Iterable[str]] = None,
+        ttl: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the offload.
+
+        Args:
+            min_bytes: Smallest encoded size of a value that gets uploaded
+            namespace: Store namespace the values are written to
+            fields: Fields to upload regardless of size
+            ttl: Optional store TTL in minutes for uploaded values
+        """
+        self.min_bytes = min_bytes
+        self.namespace = tuple(namespace)
+        self.fields = frozenset(fields) if fields is not None else None
+        self.ttl = ttl
+        self.stored: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._single_flight = SingleFlight()
+
+    def _is_stored(self, digest: str, now: float) -> bool:
+        uploaded = self.stored.get(digest)
+        if uploaded is None:
+            return False
+        return self.ttl is None or now - uploaded < self.refresh_after
+
+    @property
+    def refresh_after(self) -> Optional[float]:
+        """Seconds after an upload at which the value is uploaded again, or None without a TTL."""
+        if self.ttl is None:
+            return None
+        # The store TTL is in minutes
+        return self.ttl * 60 * REFRESH_FRACTION
+
+    def fresh(self, state: dict) -> bool:
+        """Whether every reference in an offloaded ``state`` still points at a stored value."""
+        now = time.monotonic()
+        with self._lock:
+            return all(
+                self._is_stored(value[REF_KEY]["key"], now)
+                for value in state.values()
+                if is_reference(value)
+            )
+
+    def _plan(self, values: dict) -> tuple:
+        """Split ``values`` into the referenced state and the uploads it needs."""
+        state = dict(values)
+        uploads = {}
+        now = time.monotonic()
+        for field, value in values.items():
+            if is_reference(value):
+                continue
+            digest, size = content_hash(value)
+            if size < self.min_bytes and (self.fields is None or field not in self.fields):
+                continue
+            state[field] = {REF_KEY: {"namespace": list(self.namespace), "key": digest}}
+            with self._lock:
+                if not self._is_stored(digest, now):
+                    uploads[digest] = value
+        return state, uploads
+
+    def _remember(self, digest: str) -> None:
+        with self._lock:
+            self.stored[digest] = time.monotonic()
+
+    def offload(self, values: dict, store: Any) -> dict:
+        """
+        Upload the large values of ``values`` with a sync store client.
+
+        Returns a copy of ``values`` with those values replaced by references.
+        """
+        state, uploads = self._plan(values)
+        for digest, value in uploads.items():
+            def put(digest: str = digest, value: Any = value) -> None:
+                store.put_item(self.namespace, digest, {"value": value}, index=False, ttl=self.ttl)
+                self._remember(digest)
+            self._single_flight.do_sync(digest, put)
+        return state
+
+    async def aoffload(self, values: dict, store: Any) -> dict:
+        """Async counterpart of ``offload`` using an async store client."""
+        state, uploads = self._plan(values)
+        for digest, value in uploads.items():
+            async def put(digest: str = digest, value: Any = value) -> None:
+                await store.put_item(self.namespace, digest, {"value": value}, index=False, ttl=self.ttl)
+                self._remember(digest)
+            await self._single_flight.do(digest, put)
+        return state
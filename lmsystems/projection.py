@@ -0,0 +1,147 @@
+"""Projection of run output onto the state keys a caller needs."""
+import re
+from typing import Any, Iterable, Optional, Union
+
+from .codec import loads
+
+# Keys a projection always keeps, so interrupts still reach the caller
+ALWAYS_KEPT = frozenset({"__interrupt__"})
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+# A whole string, or a run of opening or closing brackets
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{\[]+|[}\]]+', re.DOTALL)
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR_END = re.compile(rb"[,}\] \t\n\r]")
+
+
+def output_key_set(output_keys: Union[str, Iterable[str], None]) -> Optional[frozenset]:
+    """Normalize an ``output_keys`` argument, or return None for "everything"."""
+    if output_keys is None:
+        return None
+    if isinstance(output_keys, str):
+        output_keys = (output_keys,)
+    return frozenset(output_keys) | ALWAYS_KEPT
+
+
+def _skip_whitespace(raw: bytes, pos: int) -> int:
+    return _WHITESPACE.match(raw, pos).end()
+
+
+def _skip_string(raw: bytes, pos: int) -> int:
+    """Return the index just past the string whose opening quote is at ``pos``."""
+    match = _STRING.match(raw, pos)
+    if match is None:
+        raise ValueError("Unterminated string in JSON payload")
+    return match.end()
+
+
+def _skip_value(raw: bytes, pos: int) -> int:
+    """Return the index just past the JSON value starting at ``pos``, without decoding it."""
+    first = raw[pos:pos + 1]
+    if first == b'"':
+        return _skip_string(raw, pos)
+    if first not in (b"{", b"["):
+        match = _SCALAR_END.search(raw, pos)
+        return match.start() if match is not None else len(raw)
+
+    depth = 0
+    for match in _TOKEN.finditer(raw, pos):
+        char = raw[match.start()]
+        if char == 0x22:  # '"'
+            continue
+        if char in (0x7B, 0x5B):  # '{' or '['
+            depth += match.end() - match.start()
+            continue
+        depth -= match.end() - match.start()
+        if depth <= 0:
+            # A run like "]}" may close more than this value
+            return match.end() + depth
+    raise ValueError("Unterminated container in JSON payload")
+
+
+def _members(raw: bytes, pos: int) -> Iterable[tuple]:
+    """Yield ``(key, value_start, value_end)`` for the object starting at ``pos``."""
+    pos = _skip_whitespace(raw, pos + 1)
+    if raw[pos:pos + 1] == b"}":
+        return
+    while True:
+        if raw[pos:pos + 1] != b'"':
+            raise ValueError("Expected an object key in JSON payload")
+        key_end = _skip_string(raw, pos)
+        key_raw = raw[pos + 1:key_end - 1]
+        key = loads(raw[pos:key_end]) if b"\\" in key_raw else key_raw.decode("utf-8")
+        pos = _skip_whitespace(raw, key_end)
+        if raw[pos:pos + 1] != b":":
+            raise ValueError("Expected ':' in JSON payload")
+        start = _skip_whitespace(raw, pos + 1)
+        end = _skip_value(raw, start)
+        yield key, start, end
+        pos = _skip_whitespace(raw, end)
+        separator = raw[pos:pos + 1]
+        if separator == b"}":
+            return
+        if separator != b",":
+            raise ValueError("Expected ',' or '}' in JSON payload")
+        pos = _skip_whitespace(raw, pos + 1)
+
+
+def _project_object(raw: bytes, pos: int, keys: frozenset) -> dict:
+    return {key: loads(raw[start:end]) for key, start, end in _members(raw, pos) if key in keys}
+
+
+def project_raw(raw: bytes, mode: str, keys: frozenset) -> Any:
+    """
+    Decode a ``values`` or ``updates`` event payload, keeping only ``keys``.
+
+    The payload's objects are scanned without decoding them, and only the
+    values of kept keys are passed to the JSON decoder, so dropped fields never
+    become Python objects. Payloads that aren't objects are decoded as is.
+    """
+    pos = _skip_whitespace(raw, 0)
+    if raw[pos:pos + 1] != b"{":
+        return loads(raw)
+    if mode == "values":
+        return _project_object(raw, pos, keys)
+
+    # Updates map node names to the keys each node wrote
+    projected = {}
+    for node, start, end in _members(raw, pos):
+        if raw[start:start + 1] == b"{":
+            projected[node] = _project_object(raw, start, keys)
+        else:
+            projected[node] = loads(raw[start:end])
+    return projected
+
+
+def project_part(mode: str, data: Any, keys: frozenset) -> Any:
+    """Keep only ``keys`` of already decoded ``values`` or ``updates`` data."""
+    if not isinstance(data, dict):
+        return data
+    if mode == "values":
+        return {key: value for key, value in data.items() if key in keys}
+    if mode == "updates":
+        return {
+            node: {key: value for key, value in update.items() if key in keys} if isinstance(update, dict) else update
+            for node, update in data.items()
+        }
+    return data
+
+
+def project_chunk(chunk: Any, keys: frozenset, stream_mode: Any, subgraphs: bool = False, version: str = "v1") -> Any:
+    """Project a chunk as yielded by ``RemoteGraph.stream`` with the given settings."""
+    if version == "v2":
+        if isinstance(chunk, dict) and "type" in chunk:
+            return {**chunk, "data": project_part(chunk["type"], chunk.get("data"), keys)}
+        return chunk
+    if isinstance(stream_mode, (list, tuple)):
+        # (mode, data), or (namespace, mode, data) with subgraphs
+        if isinstance(chunk, tuple) and len(chunk) == 3:
+            return (chunk[0], chunk[1], project_part(chunk[1], chunk[2], keys))
+        if isinstance(chunk, tuple) and len(chunk) == 2:
+            return (chunk[0], project_part(chunk[0], chunk[1], keys))
+        return chunk
+    # RemoteGraph streams updates unless told otherwise
+    mode = stream_mode or "updates"
+    if subgraphs and isinstance(chunk, tuple) and len(chunk) == 2:
+        return (chunk[0], project_part(mode, chunk[1], keys))
+    return project_part(mode, chunk, keys)
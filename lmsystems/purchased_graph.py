@@ -1,19 +1,49 @@
-import jwt
-from typing import Any, Optional, Union
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence, Union
 from langgraph.pregel.remote import RemoteGraph
 from langchain_core.runnables import RunnableConfig
 from langgraph.pregel.protocol import PregelProtocol
-from langgraph_sdk.client import LangGraphClient, SyncLangGraphClient
-import requests
+import httpx
 from .exceptions import (
     LmsystemsError,
     AuthenticationError,
     GraphError,
     InputError,
-    APIError
+    APIError,
+    DeadlineExceededError
 )
 import os
 from lmsystems.config import Config
+from .graph_info import GraphInfoCache, get_default_graph_info_cache, _status_code
+from .transport import Transport, get_default_transport
+from .batch import bounded_map
+from .result_cache import ResultCache, SingleFlight, cacheable_config, make_cache_key
+from .codec import dumps, loads
+from .run_template import merge_config
+from .metrics import Instrumentation
+from .credentials import CredentialManager
+from .coalesce import DeltaCoalescer
+from .offload import StateOffload, content_hash
+from .projection import output_key_set, project_chunk, project_part
+from .deadline import Deadline, as_deadline, iter_until
+from .state import DEFAULT_PAGE_SIZE, AsyncStateHistory, StateHistory, StateSnapshotCache
+
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+def _cancel_on_disconnect(kwargs: dict) -> dict:
+    """Run arguments that make the server cancel a run whose caller went away.
+
+    RemoteGraph doesn't rejoin dropped streams, so once the connection closes
+    (the caller was cancelled, timed out or dropped the iterator) nobody reads
+    the run's output any more.
+    """
+    if "on_disconnect" in kwargs:
+        return kwargs
+    return {**kwargs, "on_disconnect": "cancel"}
 
 class PurchasedGraph(PregelProtocol):
     def __init__(
@@ -24,6 +54,15 @@ class PurchasedGraph(PregelProtocol):
         default_state_values: Optional[dict[str, Any]] = None,
         base_url: str = Config.DEFAULT_BASE_URL,
         development_mode: bool = False,
+        graph_info_cache: Optional[GraphInfoCache] = None,
+        transport: Optional[Transport] = None,
+        lazy: bool = False,
+        max_concurrency: Optional[int] = None,
+        result_cache: Optional[ResultCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        refresh_credentials: bool = False,
+        state_cache: Optional[StateSnapshotCache] = None,
+        offload: Optional[StateOffload] = None,
     ):
         """
         Initialize a PurchasedGraph instance.
@@ -35,6 +74,23 @@ class PurchasedGraph(PregelProtocol):
             default_state_values: Optional default values for required state parameters.
             base_url: The base URL of the marketplace backend.
             development_mode: Whether to run in development mode.
+            graph_info_cache: Cache for graph info lookups (defaults to the shared cache).
+            transport: Pooled HTTP transport (defaults to the shared transport).
+            lazy: Defer fetching graph info and building the RemoteGraph until the
+                first call that needs it, so construction does no network I/O.
+            max_concurrency: Default number of concurrent remote invocations in batch
+                calls, overridable per call with ``config["max_concurrency"]``.
+            result_cache: Opt-in cache for ``invoke``/``ainvoke`` results. Concurrent
+                identical calls share one remote run. Calls bound to a thread
+                (``configurable.thread_id``) are never cached.
+            instrumentation: Optional receiver of latency and throughput metrics.
+            refresh_credentials: Opt in to refreshing graph info before the graph
+                credentials expire, swapping in a new RemoteGraph. Refreshes run on
+                one background thread shared by all sync clients and graphs.
+            state_cache: Cache of state snapshots keyed by checkpoint (defaults to
+                a ``StateSnapshotCache`` of 256 snapshots per graph).
+            offload: Upload large ``default_state_values`` once through the store
+                API and send references to them instead (see ``StateOffload``).
 
         Raises:
             AuthenticationError: If the API key is invalid
@@ -51,40 +107,146 @@ class PurchasedGraph(PregelProtocol):
         self.api_key = api_key
         self.config = config
         self.default_state_values = default_state_values or {}
+        self.offload = offload
+        self._offloaded: Optional[tuple] = None
         self.base_url = base_url
         self.development_mode = development_mode
+        self.graph_info_cache = graph_info_cache or get_default_graph_info_cache()
+        self.transport = transport or get_default_transport()
+        self.max_concurrency = max_concurrency
+        self.result_cache = result_cache
+        self.instrumentation = instrumentation
+        self.state_cache = state_cache if state_cache is not None else StateSnapshotCache()
+        self._single_flight = SingleFlight()
+        self.credentials = (
+            CredentialManager(self._swap_graph_info, fetch=self._refresh_graph_info)
+            if refresh_credentials else None
+        )
+
+        self.graph_info: Optional[dict] = None
+        self._remote_graph: Optional[RemoteGraph] = None
+        self._resolve_lock = threading.Lock()
+        self._resolving: Optional[asyncio.Future] = None
+
+        if not lazy:
+            self._resolve()
+
+    @classmethod
+    async def acreate(cls, graph_name: str, api_key: str, **kwargs: Any) -> "PurchasedGraph":
+        """
+        Async factory that resolves the graph without blocking the event loop.
 
+        Takes the same arguments as ``PurchasedGraph(...)``.
+        """
+        kwargs.pop("lazy", None)
+        graph = cls(graph_name, api_key, lazy=True, **kwargs)
+        await graph._aresolve()
+        return graph
+
+    @property
+    def remote_graph(self) -> RemoteGraph:
+        """The internal RemoteGraph, resolved on first access for lazy graphs."""
+        if self._remote_graph is None:
+            self._resolve()
+        return self._remote_graph
+
+    def _resolve(self) -> None:
+        """Fetch graph info and build the RemoteGraph, once across threads."""
+        with self._resolve_lock:
+            if self._remote_graph is not None:
+                return
+            started = time.perf_counter()
+            try:
+                self._build_remote_graph(self._get_graph_info())
+            except Exception as e:
+                self._record("graph_info", started, e)
+                raise APIError(f"Failed to initialize graph: {str(e)}")
+            self._record("graph_info", started)
+            self._start_credential_refresh()
+
+    async def _aresolve(self) -> RemoteGraph:
+        """Async counterpart of ``_resolve``; concurrent first callers share one lookup."""
+        if self._remote_graph is not None:
+            return self._remote_graph
+
+        loop = asyncio.get_running_loop()
+        if self._resolving is None or self._resolving.get_loop() is not loop:
+            self._resolving = loop.create_task(self._aresolve_once())
         try:
-            # Authenticate and retrieve graph details
-            self.graph_info = self._get_graph_info()
-
-            # Merge stored configurables with any user-provided config
-            stored_config = self.graph_info.get('configurables', {})
-            merged_config = stored_config.copy()
-            if config:
-                # Deep merge the configs, with user-provided values taking precedence
-                if 'configurable' in config and 'configurable' in stored_config:
-                    merged_config['configurable'].update(config['configurable'])
-                else:
-                    merged_config.update(config)
-
-            # Get the LangGraph API key directly from response
-            lgraph_api_key = self.graph_info.get('lgraph_api_key')
-            if not lgraph_api_key:
-                raise GraphError("LangGraph API key not found in response")
-
-            # Create internal RemoteGraph instance with merged config
-            self.remote_graph = RemoteGraph(
-                self.graph_info['graph_name'],
-                url=self.graph_info['graph_url'],
-                api_key=lgraph_api_key,
-                config=merged_config,
-            )
+            await asyncio.shield(self._resolving)
+        except BaseException:
+            # Let the next caller retry after a failed lookup
+            if self._resolving.done():
+                self._resolving = None
+            raise
+        return self._remote_graph
+
+    async def _aresolve_once(self) -> None:
+        started = time.perf_counter()
+        try:
+            graph_info = await self._aget_graph_info()
+            with self._resolve_lock:
+                if self._remote_graph is None:
+                    self._build_remote_graph(graph_info)
         except Exception as e:
+            self._record("graph_info", started, e)
             raise APIError(f"Failed to initialize graph: {str(e)}")
+        self._record("graph_info", started)
+        self._start_credential_refresh()
+
+    def _start_credential_refresh(self) -> None:
+        if self.credentials is not None:
+            self.credentials.start(self.graph_info)
+
+    def close(self) -> None:
+        """Stop the background credential refresh. Pooled connections belong to the transport."""
+        if self.credentials is not None:
+            self.credentials.stop()
+
+    def _record(self, operation: str, started: float, error: Optional[BaseException] = None) -> None:
+        """Report a finished operation to the instrumentation, if any."""
+        if self.instrumentation is not None:
+            self.instrumentation.operation(self.graph_name, operation, time.perf_counter() - started, error)
+
+    def _build_remote_graph(self, graph_info: dict) -> None:
+        """Build the internal RemoteGraph from resolved graph info."""
+        # Merge stored configurables with any user-provided config, without touching the cached graph info
+        merged_config = merge_config(graph_info.get('configurables', {}), self.config)
+
+        # Get the LangGraph API key from the response, or from its access token
+        lgraph_api_key = graph_info.get('lgraph_api_key')
+        if not lgraph_api_key and graph_info.get('access_token'):
+            lgraph_api_key = self._extract_api_key(graph_info['access_token'])
+        if not lgraph_api_key:
+            raise GraphError("LangGraph API key not found in response")
+
+        # Create internal RemoteGraph instance with merged config, then swap it in
+        # with one assignment so calls already running keep the graph they started on
+        remote_graph = RemoteGraph(
+            graph_info['graph_name'],
+            client=self.transport.get_client(graph_info['graph_url'], lgraph_api_key),
+            sync_client=self.transport.get_sync_client(graph_info['graph_url'], lgraph_api_key),
+            config=merged_config,
+        )
+        self.graph_info = graph_info
+        self._remote_graph = remote_graph
+
+    def _swap_graph_info(self, graph_info: dict) -> None:
+        """Replace the RemoteGraph with one built from refreshed graph info."""
+        with self._resolve_lock:
+            self._build_remote_graph(graph_info)
+
+    def _refresh_graph_info(self) -> dict:
+        """Fetch graph info from the backend, skipping the cache."""
+        self._invalidate_graph_info()
+        return self._get_graph_info()
 
     def _get_graph_info(self) -> dict:
         """Authenticate with the marketplace backend and retrieve graph details."""
+        cached = self.graph_info_cache.get(self.base_url, self.api_key, self.graph_name)
+        if cached is not None:
+            return cached
+
         try:
             endpoint = f"{self.base_url}/api/get_graph_info"
             headers = {
@@ -93,8 +255,43 @@ class PurchasedGraph(PregelProtocol):
             }
             payload = {"graph_name": self.graph_name}
 
-            response = requests.post(endpoint, json=payload, headers=headers)
+            response = self.transport.sync_http.post(endpoint, content=dumps(payload), headers=headers)
+
+            if response.status_code in (401, 403):
+                self._invalidate_graph_info()
+            if response.status_code == 401:
+                raise AuthenticationError("Invalid API key.")
+            elif response.status_code == 403:
+                raise GraphError(f"Graph '{self.graph_name}' has not been purchased")
+            elif response.status_code == 404:
+                raise GraphError(f"Graph '{self.graph_name}' not found")
+            elif response.status_code != 200:
+                raise APIError(f"Backend API error: {response.text}")
+
+            graph_info = loads(response.content)
+            self.graph_info_cache.set(self.base_url, self.api_key, self.graph_name, graph_info)
+            return graph_info
+        except httpx.RequestError as e:
+            raise APIError(f"Failed to communicate with backend: {str(e)}")
+
+    async def _aget_graph_info(self) -> dict:
+        """Async counterpart of ``_get_graph_info`` using the async transport."""
+        cached = self.graph_info_cache.get(self.base_url, self.api_key, self.graph_name)
+        if cached is not None:
+            return cached
 
+        try:
+            response = await self.transport.async_http.post(
+                f"{self.base_url}/api/get_graph_info",
+                content=dumps({"graph_name": self.graph_name}),
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+            )
+
+            if response.status_code in (401, 403):
+                self._invalidate_graph_info()
             if response.status_code == 401:
                 raise AuthenticationError("Invalid API key.")
             elif response.status_code == 403:
@@ -104,40 +301,117 @@ class PurchasedGraph(PregelProtocol):
             elif response.status_code != 200:
                 raise APIError(f"Backend API error: {response.text}")
 
-            return response.json()
-        except requests.RequestException as e:
+            graph_info = loads(response.content)
+            self.graph_info_cache.set(self.base_url, self.api_key, self.graph_name, graph_info)
+            return graph_info
+        except httpx.RequestError as e:
             raise APIError(f"Failed to communicate with backend: {str(e)}")
 
+    def _invalidate_graph_info(self) -> None:
+        """Drop cached graph info so the next lookup hits the backend again."""
+        self.graph_info_cache.invalidate(self.base_url, self.api_key, self.graph_name)
+
     def _extract_api_key(self, access_token: str) -> str:
         """Extract the LangGraph API key from the JWT token without verification."""
+        import jwt
+
         try:
             decoded_token = jwt.decode(access_token, options={"verify_signature": False})
             lgraph_api_key = decoded_token.get("lgraph_api_key")
             if not lgraph_api_key:
-                raise GraphAuthenticationError("LangGraph API key not found in token payload")
+                raise AuthenticationError("LangGraph API key not found in token payload")
             return lgraph_api_key
         except jwt.InvalidTokenError as e:
-            raise GraphAuthenticationError(f"Invalid access token: {str(e)}")
+            raise AuthenticationError(f"Invalid access token: {str(e)}")
+
+    def _defaults(self) -> dict:
+        """Default state values to merge into inputs, with uploaded ones replaced by references."""
+        offloaded = self._offloaded
+        if offloaded is not None and offloaded[0] is self.default_state_values:
+            # _offload_defaults checked the contents just before
+            return offloaded[2]
+        return self.default_state_values
+
+    def _needs_offload(self) -> Optional[str]:
+        """Content digest of the defaults when they need uploading, else None."""
+        if self.offload is None or not self.default_state_values:
+            return None
+        # Hash the contents rather than trusting identity, so in-place changes are uploaded too
+        fingerprint = content_hash(self.default_state_values)[0]
+        offloaded = self._offloaded
+        if offloaded is not None and offloaded[1] == fingerprint and self.offload.fresh(offloaded[2]):
+            self._offloaded = (self.default_state_values, fingerprint, offloaded[2])
+            return None
+        return fingerprint
+
+    def _offload_defaults(self) -> None:
+        """Upload large default state values once per content, and again when their store TTL runs out."""
+        fingerprint = self._needs_offload()
+        if fingerprint is None:
+            return
+        defaults = self.default_state_values
+        try:
+            state = self.offload.offload(defaults, self.remote_graph.sync_client.store)
         except Exception as e:
-            raise GraphAuthenticationError(f"Failed to decode token: {str(e)}")
+            raise APIError(f"Failed to upload state values: {str(e)}")
+        self._offloaded = (defaults, fingerprint, state)
+
+    async def _aoffload_defaults(self) -> None:
+        """Async counterpart of ``_offload_defaults``."""
+        fingerprint = self._needs_offload()
+        if fingerprint is None:
+            return
+        defaults = self.default_state_values
+        remote_graph = await self._aresolve()
+        try:
+            state = await self.offload.aoffload(defaults, remote_graph.client.store)
+        except Exception as e:
+            raise APIError(f"Failed to upload state values: {str(e)}")
+        self._offloaded = (defaults, fingerprint, state)
 
     def _prepare_input(self, input: Union[dict[str, Any], Any]) -> dict[str, Any]:
         """Merge input with default state values."""
         try:
             if isinstance(input, dict):
-                return {**self.default_state_values, **input}
+                return {**self._defaults(), **input}
             return input
         except Exception as e:
-            raise ValidationError(f"Failed to prepare input: {str(e)}")
+            raise InputError(f"Failed to prepare input: {str(e)}")
+
+    def _prepare_inputs(self, inputs: Sequence[Union[dict[str, Any], Any]]) -> list:
+        """Merge a batch of inputs with default state values, reading the defaults once."""
+        defaults = self._defaults()
+        if not defaults:
+            return list(inputs)
+        try:
+            return [{**defaults, **input} if isinstance(input, dict) else input for input in inputs]
+        except Exception as e:
+            raise InputError(f"Failed to prepare input: {str(e)}")
+
+    def _graph_error(self, error: Exception) -> Exception:
+        """Map a RemoteGraph failure onto the SDK's exceptions."""
+        if isinstance(error, LmsystemsError):
+            return error
+        if _status_code(error) in (401, 403):
+            self._invalidate_graph_info()
+        return GraphError(f"Failed to execute graph: {str(error)}")
 
     # Delegate methods to the internal RemoteGraph instance
-    def invoke(self, input: Union[dict[str, Any], Any], config: Optional[RunnableConfig] = None, **kwargs: Any) -> Union[dict[str, Any], Any]:
+    def invoke(
+        self,
+        input: Union[dict[str, Any], Any],
+        config: Optional[RunnableConfig] = None,
+        *,
+        output_keys: Optional[Sequence[str]] = None,
+        **kwargs: Any
+    ) -> Union[dict[str, Any], Any]:
         """
         Invoke the graph with the given input.
 
         Args:
             input: The input for the graph
             config: Optional configuration override
+            output_keys: Only return these keys of the final state
             **kwargs: Additional arguments
 
         Raises:
@@ -145,53 +419,322 @@ class PurchasedGraph(PregelProtocol):
             GraphError: If graph execution fails
             APIError: If there are communication issues
         """
-        try:
-            prepared_input = self._prepare_input(input)
-            return self.remote_graph.invoke(prepared_input, config=config, **kwargs)
-        except Exception as e:
-            if isinstance(e, LmsystemsError):
-                raise
-            raise GraphError(f"Failed to execute graph: {str(e)}")
-
-    async def ainvoke(self, input: Union[dict[str, Any], Any], config: Optional[RunnableConfig] = None, **kwargs: Any) -> Union[dict[str, Any], Any]:
+        self._offload_defaults()
         prepared_input = self._prepare_input(input)
-        return await self.remote_graph.ainvoke(prepared_input, config=config, **kwargs)
+        if self.instrumentation is None:
+            return self._project(self._invoke_prepared(prepared_input, config, **kwargs), output_keys)
 
-    def stream(self, input: Union[dict[str, Any], Any], config: Optional[RunnableConfig] = None, **kwargs: Any):
-        prepared_input = self._prepare_input(input)
-        return self.remote_graph.stream(prepared_input, config=config, **kwargs)
-
-    async def astream(self, input: Union[dict[str, Any], Any], config: Optional[RunnableConfig] = None, **kwargs: Any):
-        async for chunk in self.remote_graph.astream(input, config=config, **kwargs):
-            yield chunk
-
-
-    def with_config(self, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
-        return self.remote_graph.with_config(config, **kwargs)
+        started = time.perf_counter()
+        try:
+            result = self._invoke_prepared(prepared_input, config, **kwargs)
+        except Exception as e:
+            self._record("invoke", started, e)
+            raise
+        self._record("invoke", started)
+        return self._project(result, output_keys)
+
+    @staticmethod
+    def _project(result: Any, output_keys: Optional[Sequence[str]]) -> Any:
+        """Keep only ``output_keys`` of a final state (the full result stays in the result cache)."""
+        keys = output_key_set(output_keys)
+        return result if keys is None else project_part("values", result, keys)
+
+    def _result_key(self, remote_graph: RemoteGraph, prepared_input: Any, config: Optional[RunnableConfig], kwargs: dict) -> Optional[str]:
+        """Cache key for an invocation, or None when it must not be cached."""
+        if self.result_cache is None:
+            return None
+        for item_config in (remote_graph.config, config):
+            # Runs on a thread depend on its state, so they aren't deterministic lookups
+            if item_config and (item_config.get("configurable") or {}).get("thread_id"):
+                return None
+        return make_cache_key(
+            self.graph_name,
+            remote_graph.assistant_id,
+            [cacheable_config(remote_graph.config), cacheable_config(config)],
+            prepared_input,
+            **kwargs,
+        )
+
+    def _invoke_prepared(self, prepared_input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        try:
+            remote_graph = self.remote_graph
+            key = self._result_key(remote_graph, prepared_input, config, kwargs)
+            if key is None:
+                return remote_graph.invoke(prepared_input, config=config, **_cancel_on_disconnect(kwargs))
 
-    def get_graph(self, config: Optional[RunnableConfig] = None, *, xray: Union[int, bool] = False) -> Any:
-        return self.remote_graph.get_graph(config=config, xray=xray)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
 
-    async def aget_graph(self, config: Optional[RunnableConfig] = None, *, xray: Union[int, bool] = False) -> Any:
-        return await self.remote_graph.aget_graph(config=config, xray=xray)
+            def run() -> Any:
+                result = remote_graph.invoke(prepared_input, config=config, **_cancel_on_disconnect(kwargs))
+                self.result_cache.set(key, result)
+                return result
 
-    def get_state(self, config: RunnableConfig, *, subgraphs: bool = False) -> Any:
-        return self.remote_graph.get_state(config=config, subgraphs=subgraphs)
+            return self._single_flight.do_sync(key, run)
+        except Exception as e:
+            raise self._graph_error(e)
 
-    async def aget_state(self, config: RunnableConfig, *, subgraphs: bool = False) -> Any:
-        return await self.remote_graph.aget_state(config=config, subgraphs=subgraphs)
+    async def ainvoke(
+        self,
+        input: Union[dict[str, Any], Any],
+        config: Optional[RunnableConfig] = None,
+        *,
+        output_keys: Optional[Sequence[str]] = None,
+        deadline: Union[Deadline, float, None] = None,
+        **kwargs: Any
+    ) -> Union[dict[str, Any], Any]:
+        """
+        Async counterpart of ``invoke``. With a ``deadline`` (a ``Deadline`` or
+        seconds from now) the call raises ``DeadlineExceededError`` once it
+        passes; closing the run's connection makes the server cancel the run.
+        """
+        await self._aoffload_defaults()
+        prepared_input = self._prepare_input(input)
+        deadline = as_deadline(deadline)
+        if self.instrumentation is None:
+            return self._project(await self._ainvoke_until(prepared_input, config, deadline, kwargs), output_keys)
 
-    def get_state_history(self, config: RunnableConfig, *, filter: Optional[dict[str, Any]] = None, before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Any:
-        return self.remote_graph.get_state_history(config=config, filter=filter, before=before, limit=limit)
+        started = time.perf_counter()
+        try:
+            result = await self._ainvoke_until(prepared_input, config, deadline, kwargs)
+        except Exception as e:
+            self._record("invoke", started, e)
+            raise
+        self._record("invoke", started)
+        return self._project(result, output_keys)
+
+    async def _ainvoke_until(self, prepared_input: Any, config: Optional[RunnableConfig], deadline: Optional[Deadline], kwargs: dict) -> Any:
+        if deadline is None:
+            return await self._ainvoke_prepared(prepared_input, config, **kwargs)
+        try:
+            return await asyncio.wait_for(self._ainvoke_prepared(prepared_input, config, **kwargs), deadline.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("Deadline exceeded while waiting for the run") from None
+
+    async def _ainvoke_prepared(self, prepared_input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        remote_graph = await self._aresolve()
+        key = self._result_key(remote_graph, prepared_input, config, kwargs)
+        if key is None:
+            return await remote_graph.ainvoke(prepared_input, config=config, **_cancel_on_disconnect(kwargs))
+
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def run() -> Any:
+            result = await remote_graph.ainvoke(prepared_input, config=config, **_cancel_on_disconnect(kwargs))
+            self.result_cache.set(key, result)
+            return result
+
+        return await self._single_flight.do(key, run)
+
+    def _batch_configs(self, config: Union[RunnableConfig, Sequence[RunnableConfig], None], size: int) -> tuple[list, int]:
+        """Split batch config into per-item configs and the concurrency limit."""
+        if config is None or isinstance(config, dict):
+            configs = [config] * size
+        else:
+            configs = list(config)
+            if len(configs) != size:
+                raise InputError("config must be a single config or one config per input")
+
+        max_concurrency = self.max_concurrency
+        for i, item_config in enumerate(configs):
+            if item_config and "max_concurrency" in item_config:
+                if item_config["max_concurrency"] is not None:
+                    max_concurrency = item_config["max_concurrency"]
+                configs[i] = {k: v for k, v in item_config.items() if k != "max_concurrency"} or None
+        return configs, max(1, min(max_concurrency or DEFAULT_MAX_CONCURRENCY, size or 1))
+
+    def batch(self, inputs: Sequence[Union[dict[str, Any], Any]], config: Union[RunnableConfig, Sequence[RunnableConfig], None] = None, *, return_exceptions: bool = False, **kwargs: Any) -> list:
+        """
+        Invoke the graph on many inputs concurrently, returning outputs in input order.
 
-    async def aget_state_history(self, config: RunnableConfig, *, filter: Optional[dict[str, Any]] = None, before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Any:
-        return await self.remote_graph.aget_state_history(config=config, filter=filter, before=before, limit=limit)
+        Args:
+            inputs: The inputs for the graph
+            config: One config for every input or one per input; ``max_concurrency``
+                caps the number of concurrent remote invocations
+            return_exceptions: Return exceptions in place of outputs instead of raising
+            **kwargs: Additional arguments passed to each invocation
+        """
+        outputs: list = [None] * len(inputs)
+        for index, output in self.batch_as_completed(inputs, config, return_exceptions=return_exceptions, **kwargs):
+            outputs[index] = output
+        return outputs
+
+    def batch_as_completed(self, inputs: Sequence[Union[dict[str, Any], Any]], config: Union[RunnableConfig, Sequence[RunnableConfig], None] = None, *, return_exceptions: bool = False, **kwargs: Any) -> Iterator[tuple[int, Any]]:
+        """Like ``batch``, but yield ``(index, output)`` pairs as each invocation completes."""
+        if not inputs:
+            return
+        self._offload_defaults()
+        prepared_inputs = self._prepare_inputs(inputs)
+        configs, max_concurrency = self._batch_configs(config, len(prepared_inputs))
+        self._resolve()
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {
+                executor.submit(self._invoke_prepared, prepared_input, item_config, **kwargs): index
+                for index, (prepared_input, item_config) in enumerate(zip(prepared_inputs, configs))
+            }
+            try:
+                for future in as_completed(futures):
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        if not return_exceptions:
+                            raise
+                        output = e
+                    yield futures[future], output
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    async def abatch(self, inputs: Sequence[Union[dict[str, Any], Any]], config: Union[RunnableConfig, Sequence[RunnableConfig], None] = None, *, return_exceptions: bool = False, **kwargs: Any) -> list:
+        """Async counterpart of ``batch``."""
+        outputs: list = [None] * len(inputs)
+        async for index, output in self.abatch_as_completed(inputs, config, return_exceptions=return_exceptions, **kwargs):
+            outputs[index] = output
+        return outputs
+
+    async def abatch_as_completed(self, inputs: Sequence[Union[dict[str, Any], Any]], config: Union[RunnableConfig, Sequence[RunnableConfig], None] = None, *, return_exceptions: bool = False, **kwargs: Any) -> AsyncIterator[tuple[int, Any]]:
+        """Async counterpart of ``batch_as_completed``."""
+        if not inputs:
+            return
+        await self._aoffload_defaults()
+        prepared_inputs = self._prepare_inputs(inputs)
+        configs, max_concurrency = self._batch_configs(config, len(prepared_inputs))
+        await self._aresolve()
+
+        async def invoke_one(index: int, prepared_input: Any) -> tuple[int, Any]:
+            try:
+                return index, await self._ainvoke_prepared(prepared_input, configs[index], **kwargs)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return index, e
+
+        async for result in bounded_map(invoke_one, prepared_inputs, max_concurrency):
+            yield result
+
+    def stream(
+        self,
+        input: Union[dict[str, Any], Any],
+        config: Optional[RunnableConfig] = None,
+        *,
+        output_keys: Optional[Sequence[str]] = None,
+        **kwargs: Any
+    ):
+        """
+        Stream the graph's output. Pass ``output_keys`` to keep only those state
+        keys in ``values`` and ``updates`` chunks.
+        """
+        self._offload_defaults()
+        prepared_input = self._prepare_input(input)
+        chunks = self.remote_graph.stream(prepared_input, config=config, **_cancel_on_disconnect(kwargs))
+        keys = output_key_set(output_keys)
+        if keys is not None:
+            chunks = (self._project_chunk(chunk, keys, kwargs) for chunk in chunks)
+        if self.instrumentation is None:
+            return chunks
+        return self._measure_stream(chunks)
+
+    @staticmethod
+    def _project_chunk(chunk: Any, keys: frozenset, kwargs: dict) -> Any:
+        return project_chunk(
+            chunk, keys, kwargs.get("stream_mode"), kwargs.get("subgraphs", False), kwargs.get("version", "v1")
+        )
+
+    def _measure_stream(self, chunks: Iterator) -> Iterator:
+        started = time.perf_counter()
+        first_chunk_at = None
+        count = 0
+        error = None
+        try:
+            for chunk in chunks:
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+                count += 1
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record_stream(started, first_chunk_at, count, error)
 
-    def update_state(self, config: RunnableConfig, values: Optional[Union[dict[str, Any], Any]], as_node: Optional[str] = None) -> RunnableConfig:
-        return self.remote_graph.update_state(config=config, values=values, as_node=as_node)
+    async def astream(
+        self,
+        input: Union[dict[str, Any], Any],
+        config: Optional[RunnableConfig] = None,
+        *,
+        coalesce: Optional[DeltaCoalescer] = None,
+        output_keys: Optional[Sequence[str]] = None,
+        deadline: Union[Deadline, float, None] = None,
+        **kwargs: Any
+    ):
+        """
+        Stream the graph's output. Pass ``coalesce=DeltaCoalescer(...)`` to merge
+        the per-token message deltas of ``stream_mode="messages"`` into fewer chunks,
+        and ``output_keys`` to keep only those state keys in ``values`` and
+        ``updates`` chunks.
+
+        The run is cancelled when the stream is abandoned (the consumer is
+        cancelled or stops iterating) and, with a ``deadline``, when the deadline
+        passes, in which case ``DeadlineExceededError`` is raised.
+        """
+        if coalesce is not None:
+            chunks = coalesce(self.astream(input, config, output_keys=output_keys, deadline=deadline, **kwargs))
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                await chunks.aclose()
+            return
+
+        await self._aoffload_defaults()
+        prepared_input = self._prepare_input(input)
+        remote_graph = await self._aresolve()
+        chunks = remote_graph.astream(prepared_input, config=config, **_cancel_on_disconnect(kwargs))
+        keys = output_key_set(output_keys)
+        if keys is not None:
+            chunks = self._aproject_chunks(chunks, keys, kwargs)
+        deadline = as_deadline(deadline)
+        if deadline is not None:
+            chunks = iter_until(chunks, deadline)
+        if self.instrumentation is None:
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        started = time.perf_counter()
+        first_chunk_at = None
+        count = 0
+        error = None
+        try:
+            async for chunk in chunks:
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+                count += 1
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record_stream(started, first_chunk_at, count, error)
+
+    async def _aproject_chunks(self, chunks: AsyncIterator, keys: frozenset, kwargs: dict) -> AsyncIterator:
+        async for chunk in chunks:
+            yield self._project_chunk(chunk, keys, kwargs)
+
+    def _record_stream(self, started: float, first_chunk_at: Optional[float], chunks: int, error: Optional[BaseException]) -> None:
+        # RemoteGraph decodes the stream itself, so bytes received aren't known here
+        self.instrumentation.stream(
+            self.graph_name,
+            duration=time.perf_counter() - started,
+            chunks=chunks,
+            time_to_first_chunk=first_chunk_at - started if first_chunk_at is not None else None,
+            error=error,
+        )
 
-    async def aupdate_state(self, config: RunnableConfig, values: Optional[Union[dict[str, Any], Any]], as_node: Optional[str] = None) -> RunnableConfig:
-        return await self.remote_graph.aupdate_state(config=config, values=values, as_node=as_node)
 
     def with_config(self, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
         return self.remote_graph.with_config(config, **kwargs)
@@ -200,22 +743,103 @@ class PurchasedGraph(PregelProtocol):
         return self.remote_graph.get_graph(config=config, xray=xray)
 
     async def aget_graph(self, config: Optional[RunnableConfig] = None, *, xray: Union[int, bool] = False) -> Any:
-        return await self.remote_graph.aget_graph(config=config, xray=xray)
+        remote_graph = await self._aresolve()
+        return await remote_graph.aget_graph(config=config, xray=xray)
+
+    @staticmethod
+    def _checkpoint_config(remote_graph: RemoteGraph, config: Optional[RunnableConfig]) -> dict:
+        """The configurable values a state lookup resolves to on the remote graph."""
+        return {"configurable": {
+            **((remote_graph.config or {}).get("configurable") or {}),
+            **((config or {}).get("configurable") or {}),
+        }}
 
     def get_state(self, config: RunnableConfig, *, subgraphs: bool = False) -> Any:
-        return self.remote_graph.get_state(config=config, subgraphs=subgraphs)
+        """
+        Get the state of a thread. Snapshots of a specific ``checkpoint_id`` are
+        served from ``state_cache`` when possible, since they never change.
+        """
+        remote_graph = self.remote_graph
+        cached = self.state_cache.get(self._checkpoint_config(remote_graph, config), subgraphs)
+        if cached is not None:
+            return cached
+        snapshot = remote_graph.get_state(config=config, subgraphs=subgraphs)
+        self.state_cache.set(snapshot, subgraphs)
+        return snapshot
 
     async def aget_state(self, config: RunnableConfig, *, subgraphs: bool = False) -> Any:
-        return await self.remote_graph.aget_state(config=config, subgraphs=subgraphs)
+        remote_graph = await self._aresolve()
+        cached = self.state_cache.get(self._checkpoint_config(remote_graph, config), subgraphs)
+        if cached is not None:
+            return cached
+        snapshot = await remote_graph.aget_state(config=config, subgraphs=subgraphs)
+        self.state_cache.set(snapshot, subgraphs)
+        return snapshot
+
+    def get_state_history(
+        self,
+        config: RunnableConfig,
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> StateHistory:
+        """
+        Iterate over a thread's state history, newest first.
 
-    def get_state_history(self, config: RunnableConfig, *, filter: Optional[dict[str, Any]] = None, before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Any:
-        return self.remote_graph.get_state_history(config=config, filter=filter, before=before, limit=limit)
+        Returns a lazy ``StateHistory`` that fetches ``page_size`` snapshots at a
+        time and prefetches the next page on a background thread. Without
+        ``limit`` it walks the whole history. Fetched snapshots are added to
+        ``state_cache``.
+        """
+        def fetch_page(page_before: Optional[dict], size: int) -> list:
+            snapshots = list(self.remote_graph.get_state_history(config=config, filter=filter, before=page_before, limit=size))
+            for snapshot in snapshots:
+                self.state_cache.set(snapshot)
+            return snapshots
 
-    async def aget_state_history(self, config: RunnableConfig, *, filter: Optional[dict[str, Any]] = None, before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Any:
-        return await self.remote_graph.aget_state_history(config=config, filter=filter, before=before, limit=limit)
+        return StateHistory(fetch_page, limit=limit, before=before, page_size=page_size, prefetch=prefetch)
+
+    def aget_state_history(
+        self,
+        config: RunnableConfig,
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncStateHistory:
+        """
+        Async counterpart of ``get_state_history``; iterate it with ``async for``.
+
+        The returned ``AsyncStateHistory`` can also be awaited first, as with the
+        earlier coroutine version of this method.
+        """
+        async def fetch_page(page_before: Optional[dict], size: int) -> list:
+            remote_graph = await self._aresolve()
+            snapshots = [
+                snapshot
+                async for snapshot in remote_graph.aget_state_history(config=config, filter=filter, before=page_before, limit=size)
+            ]
+            for snapshot in snapshots:
+                self.state_cache.set(snapshot)
+            return snapshots
+
+        return AsyncStateHistory(fetch_page, limit=limit, before=before, page_size=page_size, prefetch=prefetch)
 
     def update_state(self, config: RunnableConfig, values: Optional[Union[dict[str, Any], Any]], as_node: Optional[str] = None) -> RunnableConfig:
         return self.remote_graph.update_state(config=config, values=values, as_node=as_node)
 
     async def aupdate_state(self, config: RunnableConfig, values: Optional[Union[dict[str, Any], Any]], as_node: Optional[str] = None) -> RunnableConfig:
-        return await self.remote_graph.aupdate_state(config=config, values=values, as_node=as_node)
+        remote_graph = await self._aresolve()
+        return await remote_graph.aupdate_state(config=config, values=values, as_node=as_node)
+
+    def bulk_update_state(self, config: RunnableConfig, updates: list[tuple[Optional[dict[str, Any]], Optional[str]]]) -> RunnableConfig:
+        return self.remote_graph.bulk_update_state(config, updates)
+
+    async def abulk_update_state(self, config: RunnableConfig, updates: list[tuple[Optional[dict[str, Any]], Optional[str]]]) -> RunnableConfig:
+        remote_graph = await self._aresolve()
+        return await remote_graph.abulk_update_state(config, updates)
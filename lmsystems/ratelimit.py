@@ -0,0 +1,134 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Optional
+
+from .exceptions import APIError
+
+
+class RetryPolicy:
+    """
+    Retry settings with capped exponential backoff and full jitter.
+
+    Attributes:
+        max_attempts: Total attempts per operation, including the first one
+        base_delay: Backoff before the first retry, in seconds
+        max_delay: Upper bound for a single backoff, in seconds
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 30.0) -> None:
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts: Total attempts per operation (1 disables retries)
+            base_delay: Backoff before the first retry, in seconds
+            max_delay: Upper bound for a single backoff, in seconds
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, attempt: int, error: APIError, idempotent: bool) -> bool:
+        """
+        Decide whether to retry after ``attempt`` failed attempts.
+
+        A 429 means the request was rejected before running, so it is always safe
+        to repeat. Other retryable failures are only repeated for idempotent calls.
+        """
+        if attempt >= self.max_attempts or not error.retryable:
+            return False
+        return idempotent or error.status_code == 429
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Backoff before the next attempt; never shorter than the server's Retry-After."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        if retry_after is not None:
+            backoff = max(backoff, min(retry_after, self.max_delay))
+        return backoff
+
+
+class AdaptiveRateLimiter:
+    """
+    Client-side token bucket that adapts its rate to 429 feedback.
+
+    Every request takes a token. A 429 halves the rate (and pauses all requests
+    for the server's Retry-After), each success raises it again by a small step,
+    so throughput settles just under the server's quota. Safe to share between
+    threads and async tasks.
+
+    Attributes:
+        rate: Current rate in requests per second
+        min_rate: Lowest rate the limiter backs off to
+        max_rate: Highest rate the limiter grows to
+        burst: Bucket capacity, the number of requests allowed back to back
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        *,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        increase: Optional[float] = None,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Starting rate in requests per second
+            min_rate: Lowest rate the limiter backs off to
+            max_rate: Highest rate the limiter grows to (defaults to ``4 * rate``)
+            burst: Bucket capacity (defaults to ``rate``)
+            increase: Rate added per successful request (defaults to 1% of ``max_rate``)
+            decrease_factor: Multiplier applied to the rate on a 429
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate * 4
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.increase = increase if increase is not None else self.max_rate * 0.01
+        self.decrease_factor = decrease_factor
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    async def acquire(self) -> None:
+        """Wait for a token without blocking the event loop."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self) -> None:
+        """Wait for a token, blocking the current thread."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """Additively raise the rate after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicatively lower the rate after a 429, honouring Retry-After."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
@@ -0,0 +1,200 @@
+import asyncio
+import copy
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from .client import LmsystemsClient
+from .config import Config
+from .exceptions import GraphError
+from .graph_info import GraphInfoCache, get_default_graph_info_cache
+from .transport import Transport, get_default_transport
+
+if TYPE_CHECKING:
+    from .purchased_graph import PurchasedGraph
+
+
+@dataclass
+class WarmupTiming:
+    """Per-graph warm-up timings, in seconds."""
+
+    graph_name: str
+    graph_info: float = 0.0
+    preconnect: float = 0.0
+    metadata: float = 0.0
+    total: float = 0.0
+    error: Optional[str] = None
+
+
+class GraphRegistry:
+    """
+    Resolves many purchased graphs concurrently and hands out ready handles.
+
+    ``warm_up()`` fetches graph info for every graph in parallel, opens a pooled
+    connection to each deployment (DNS, TCP and TLS) and optionally fetches the
+    assistant and its schemas. Afterwards ``client()`` and ``purchased_graph()``
+    build handles from that warm state without any further round trips.
+
+    Attributes:
+        graph_names: Names of the graphs managed by the registry
+        timings: Warm-up timings per graph, filled by ``warm_up()``
+        assistants: Assistant metadata per graph, when ``fetch_metadata`` is set
+        schemas: Assistant schemas per graph, when ``fetch_metadata`` is set
+    """
+
+    def __init__(
+        self,
+        graph_names: Iterable[str],
+        api_key: str,
+        base_url: str = Config.DEFAULT_BASE_URL,
+        *,
+        graph_info_cache: Optional[GraphInfoCache] = None,
+        transport: Optional[Transport] = None,
+        fetch_metadata: bool = False,
+        concurrency: int = 16,
+        refresh_credentials: bool = False,
+    ) -> None:
+        """
+        Initialize the registry. Nothing is fetched until ``warm_up()``.
+
+        Args:
+            graph_names: Names of the purchased graphs
+            api_key: The Lmsystems API key
+            base_url: Base URL for the Lmsystems API
+            graph_info_cache: Cache for graph info lookups (defaults to the shared cache)
+            transport: Pooled HTTP transport (defaults to the shared transport)
+            fetch_metadata: Also fetch each graph's assistant and schemas
+            concurrency: Maximum number of graphs warmed up at once
+            refresh_credentials: Opt in to credential refresh for handles from
+                ``client()`` and ``purchased_graph()``
+        """
+        self.graph_names = list(dict.fromkeys(graph_names))
+        self.api_key = api_key
+        self.base_url = base_url
+        self.graph_info_cache = graph_info_cache or get_default_graph_info_cache()
+        self.transport = transport or get_default_transport()
+        self.fetch_metadata = fetch_metadata
+        self.concurrency = concurrency
+        self.refresh_credentials = refresh_credentials
+
+        self.timings: dict[str, WarmupTiming] = {}
+        self.assistants: dict[str, Any] = {}
+        self.schemas: dict[str, Any] = {}
+        self._graph_info: dict[str, dict] = {}
+
+    async def warm_up(self, raise_on_error: bool = False) -> dict[str, WarmupTiming]:
+        """
+        Resolve every graph concurrently.
+
+        Args:
+            raise_on_error: Raise the first failure instead of recording it in the timings
+
+        Returns:
+            Warm-up timings per graph name
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def warm(graph_name: str) -> WarmupTiming:
+            async with semaphore:
+                return await self._warm_one(graph_name, raise_on_error)
+
+        timings = await asyncio.gather(*(warm(name) for name in self.graph_names))
+        self.timings.update({timing.graph_name: timing for timing in timings})
+        return self.timings
+
+    async def _warm_one(self, graph_name: str, raise_on_error: bool) -> WarmupTiming:
+        timing = WarmupTiming(graph_name)
+        started = time.perf_counter()
+        try:
+            client = self._new_client(graph_name)
+
+            step = time.perf_counter()
+            graph_info = await client._get_graph_info()
+            client._bind_graph_info(graph_info)
+            timing.graph_info = time.perf_counter() - step
+
+            step = time.perf_counter()
+            await self._preconnect(graph_info)
+            timing.preconnect = time.perf_counter() - step
+
+            if self.fetch_metadata and client.default_assistant_id:
+                step = time.perf_counter()
+                assistant_id = client.default_assistant_id
+                self.assistants[graph_name], self.schemas[graph_name] = await asyncio.gather(
+                    client.assistants.get(assistant_id),
+                    client.assistants.get_schemas(assistant_id),
+                )
+                timing.metadata = time.perf_counter() - step
+
+            self._graph_info[graph_name] = graph_info
+        except Exception as e:
+            if raise_on_error:
+                raise
+            timing.error = str(e)
+        finally:
+            timing.total = time.perf_counter() - started
+        return timing
+
+    async def _preconnect(self, graph_info: dict) -> None:
+        """Open a pooled connection to the deployment; the response itself is ignored."""
+        try:
+            await self.transport.async_http.get(
+                f"{graph_info['graph_url'].rstrip('/')}/ok",
+                headers={"x-api-key": graph_info.get('lgraph_api_key', '')},
+            )
+        except Exception:
+            # Pre-connecting is an optimization, the first real call will retry
+            pass
+
+    def _new_client(self, graph_name: str, refresh_credentials: bool = False) -> LmsystemsClient:
+        return LmsystemsClient(
+            graph_name,
+            self.api_key,
+            self.base_url,
+            graph_info_cache=self.graph_info_cache,
+            transport=self.transport,
+            refresh_credentials=refresh_credentials,
+        )
+
+    def _require(self, graph_name: str) -> dict:
+        graph_info = self._graph_info.get(graph_name)
+        if graph_info is None:
+            timing = self.timings.get(graph_name)
+            if timing is not None and timing.error:
+                raise GraphError(f"Graph '{graph_name}' failed to warm up: {timing.error}")
+            raise GraphError(f"Graph '{graph_name}' has not been warmed up")
+        # Each handle merges its own config into the graph info, so give it a copy
+        return copy.deepcopy(graph_info)
+
+    def client(self, graph_name: str) -> LmsystemsClient:
+        """Return a ready ``LmsystemsClient`` for a warmed-up graph, with credential refresh started as in ``setup``."""
+        client = self._new_client(graph_name, self.refresh_credentials)
+        client._bind_graph_info(self._require(graph_name))
+        if client.credentials is not None:
+            client.credentials.start(client.graph_info)
+        return client
+
+    def purchased_graph(self, graph_name: str, **kwargs: Any) -> "PurchasedGraph":
+        """
+        Return a ready ``PurchasedGraph`` for a warmed-up graph.
+
+        Args:
+            graph_name: Name of the warmed-up graph
+            **kwargs: Extra ``PurchasedGraph`` arguments such as ``config`` or ``default_state_values``
+        """
+        from .purchased_graph import PurchasedGraph
+
+        graph_info = self._require(graph_name)
+        kwargs.pop("lazy", None)
+        kwargs.setdefault("base_url", self.base_url)
+        kwargs.setdefault("graph_info_cache", self.graph_info_cache)
+        kwargs.setdefault("transport", self.transport)
+        kwargs.setdefault("refresh_credentials", self.refresh_credentials)
+        graph = PurchasedGraph(graph_name, self.api_key, lazy=True, **kwargs)
+        graph._build_remote_graph(graph_info)
+        graph._start_credential_refresh()
+        return graph
+
+    def slowest(self, n: int = 5) -> list[WarmupTiming]:
+        """Return the ``n`` graphs that took longest to warm up."""
+        return sorted(self.timings.values(), key=lambda timing: timing.total, reverse=True)[:n]
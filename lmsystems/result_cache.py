@@ -0,0 +1,304 @@
+import asyncio
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+
+def make_cache_key(graph_name: str, assistant_id: Optional[str], config: Any, input: Any, **extra: Any) -> str:
+    """
+    Build a canonical hash for a graph call.
+
+    Dict ordering doesn't matter and values that aren't JSON serializable fall
+    back to ``str()``, so equal requests always map to the same key.
+    """
+    payload = {
+        "graph_name": graph_name,
+        "assistant_id": assistant_id,
+        "config": config,
+        "input": input,
+        "extra": extra,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def cacheable_config(config: Optional[dict]) -> Optional[dict]:
+    """
+    Reduce a RunnableConfig to the parts that affect the remote result.
+
+    Callbacks, run IDs and the internal ``__pregel_*`` entries a parent graph adds
+    are dropped; only ``configurable`` values and tags stay in the key.
+    """
+    if not config:
+        return None
+    configurable = {
+        k: v for k, v in (config.get("configurable") or {}).items() if not k.startswith("__")
+    }
+    return {"configurable": configurable, "tags": sorted(config.get("tags") or [])}
+
+
+class ResultCache:
+    """
+    Base class for result cache backends.
+
+    Values must be JSON serializable. Backends evict by TTL and size.
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Drop a single entry."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        raise NotImplementedError
+
+
+class MemoryResultCache(ResultCache):
+    """
+    In-process LRU result cache with TTL and size-based eviction.
+
+    Attributes:
+        maxsize: Maximum number of entries
+        max_bytes: Maximum total size of the JSON-encoded values, if set
+        ttl: Seconds an entry stays valid, if set
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, max_bytes: Optional[int] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple[Optional[float], int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self._bytes -= size
+                return None
+            self._entries.move_to_end(key)
+        # Callers may mutate the result, so never hand out the cached object
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        size = len(json.dumps(value, default=str))
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (expires_at, size, copy.deepcopy(value))
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.maxsize
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class SQLiteResultCache(ResultCache):
+    """
+    Disk-backed result cache stored in a SQLite file, shared across processes.
+
+    Eviction is least-recently-used once ``max_entries`` or ``max_bytes`` is exceeded.
+
+    Attributes:
+        path: Path of the SQLite database file
+        ttl: Seconds an entry stays valid, if set
+        max_entries: Maximum number of entries, if set
+        max_bytes: Maximum total size of the stored values, if set
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = 100_000,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)")
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        encoded = json.dumps(value, default=str)
+        size = len(encoded)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, size, expires_at, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM results WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            while total > self.max_bytes:
+                row = self._conn.execute(
+                    "SELECT key, size FROM results ORDER BY accessed_at ASC LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    break
+                self._conn.execute("DELETE FROM results WHERE key = ?", (row[0],))
+                total -= row[1]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls so only one of them does the work.
+
+    Callers with the same key that arrive while a call is in flight wait for it and
+    share its result (or its exception) instead of starting their own.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._async_calls: dict[tuple, asyncio.Future] = {}
+        self._sync_calls: dict[str, "_SyncCall"] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``func`` once per key across concurrent async callers."""
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+        future = self._async_calls.get(call_key)
+        if future is not None:
+            try:
+                return copy.deepcopy(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leading caller was cancelled, not us: do the work ourselves
+                return await self.do(key, func)
+
+        future = loop.create_future()
+        self._async_calls[call_key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._async_calls.pop(call_key, None)
+
+    def do_sync(self, key: str, func: Callable[[], Any]) -> Any:
+        """Run ``func`` once per key across concurrent threads."""
+        with self._lock:
+            call = self._sync_calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._sync_calls[key] = _SyncCall()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._sync_calls.pop(key, None)
+            call.done.set()
+
+
+class _SyncCall:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
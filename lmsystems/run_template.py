@@ -0,0 +1,144 @@
+import copy
+from typing import Any, Optional
+
+from .exceptions import APIError
+
+_UNSET = object()
+
+# Run arguments only the streaming endpoints accept
+STREAM_ONLY_KWARGS = frozenset({'stream_mode', 'stream_subgraphs', 'stream_resumable', 'feedback_keys'})
+
+
+def without_stream_kwargs(run_kwargs: dict) -> dict:
+    """Drop the streaming-only arguments from run arguments bound for ``runs.wait``."""
+    if STREAM_ONLY_KWARGS.isdisjoint(run_kwargs):
+        return run_kwargs
+    return {k: v for k, v in run_kwargs.items() if k not in STREAM_ONLY_KWARGS}
+
+
+def merge_config(stored_config: Optional[dict], user_config: Optional[dict]) -> dict:
+    """
+    Merge a user config over a graph's stored configurables.
+
+    User-provided values take precedence, ``configurable`` is merged key by key,
+    and neither argument is modified.
+    """
+    stored_config = stored_config or {}
+    merged = {**stored_config, **(user_config or {})}
+    if 'configurable' in merged:
+        merged['configurable'] = {
+            **stored_config.get('configurable', {}),
+            **(user_config or {}).get('configurable', {}),
+        }
+    return merged
+
+
+class RunTemplate:
+    """
+    Pre-resolved run settings that can be reused for many runs.
+
+    The assistant ID, the config merged over the graph's stored configurables,
+    stream modes and default input are resolved and copied once. Each run only
+    layers its own values on top with a few shallow dict merges, and never
+    modifies the template, so one template can be shared by concurrent tasks.
+
+    Attributes:
+        assistant_id: Assistant the runs use
+        stream_mode: Default stream mode(s), if any
+    """
+
+    def __init__(
+        self,
+        assistant_id: Optional[str],
+        config: Optional[dict] = None,
+        *,
+        stream_mode: Optional[Any] = None,
+        input: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize the template.
+
+        Args:
+            assistant_id: Assistant the runs use
+            config: Fully merged config; it is copied, later changes to it have no effect
+            stream_mode: Default stream mode(s) for the runs
+            input: Default input; dict inputs given per run are merged over it
+            **kwargs: Other default arguments for ``runs.create``
+        """
+        self.assistant_id = assistant_id
+        self.stream_mode = stream_mode
+        self._config = copy.deepcopy(config or {})
+        self._configurable = self._config.get('configurable')
+        self._input = copy.deepcopy(input)
+        self._kwargs = copy.deepcopy(kwargs)
+
+    @property
+    def config(self) -> dict:
+        """A copy of the template's config."""
+        return copy.deepcopy(self._config)
+
+    def with_overrides(
+        self,
+        *,
+        assistant_id: Optional[str] = None,
+        config: Optional[dict] = None,
+        stream_mode: Optional[Any] = None,
+        input: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> "RunTemplate":
+        """Return a new template with the given values layered over this one."""
+        return RunTemplate(
+            assistant_id or self.assistant_id,
+            self.config_for(config),
+            stream_mode=stream_mode if stream_mode is not None else self.stream_mode,
+            input=self.input_for(input),
+            **{**self._kwargs, **kwargs},
+        )
+
+    def config_for(self, config: Optional[dict] = None) -> dict:
+        """
+        Config for one run: ``config`` overlaid on the template's config.
+
+        ``configurable`` is copied too, so callers may modify the result freely.
+        """
+        merged = {**self._config, **config} if config else {**self._config}
+        if 'configurable' in merged:
+            merged['configurable'] = {**(self._configurable or {}), **(config or {}).get('configurable', {})}
+        return merged
+
+    def input_for(self, input: Optional[Any] = None) -> Any:
+        """Input for one run: dict inputs are merged over the default input."""
+        if input is None:
+            return self._input
+        if isinstance(input, dict) and isinstance(self._input, dict):
+            return {**self._input, **input}
+        return input
+
+    def bind(
+        self,
+        *,
+        assistant_id: Optional[str] = None,
+        config: Optional[dict] = None,
+        input: Any = _UNSET,
+        **kwargs: Any,
+    ) -> dict:
+        """
+        Build the keyword arguments for one run.
+
+        Returns a dict with ``assistant_id``, ``config``, ``input`` and the
+        remaining run arguments, ready to pass to ``runs.create``.
+        """
+        assistant_id = assistant_id or self.assistant_id
+        if assistant_id is None:
+            raise APIError("No assistant_id provided and no default available")
+
+        run_kwargs = {**self._kwargs, **kwargs} if self._kwargs else kwargs
+        if self.stream_mode is not None and run_kwargs.get('stream_mode') is None:
+            run_kwargs['stream_mode'] = self.stream_mode
+        run_kwargs['assistant_id'] = assistant_id
+        run_kwargs['config'] = self.config_for(config)
+        input = self.input_for(None if input is _UNSET else input)
+        if input is not None:
+            run_kwargs['input'] = input
+        return run_kwargs
@@ -0,0 +1,147 @@
+"""Server-sent events decoding for LangGraph run streams."""
+from typing import Any, AsyncIterator, Iterator, Optional
+
+import httpx
+
+from .codec import loads
+from .projection import project_raw
+
+
+class StreamEvent:
+    """
+    One event of a run stream.
+
+    A compact ``__slots__`` object that behaves like ``langgraph_sdk``'s
+    ``StreamPart``: it has ``event``, ``data`` and ``id`` attributes, and unpacks,
+    indexes and compares like the tuple ``(event, data, id)``. ``run_id`` is
+    the run the event belongs to, taken from the stream's ``metadata`` event.
+    """
+
+    __slots__ = ("event", "data", "id", "run_id")
+
+    def __init__(self, event: str, data: Any, id: Optional[str] = None, run_id: Optional[str] = None) -> None:
+        self.event = event
+        self.data = data
+        self.id = id
+        self.run_id = run_id
+
+    def __iter__(self) -> Iterator:
+        return iter((self.event, self.data, self.id))
+
+    def __getitem__(self, index: Any) -> Any:
+        return (self.event, self.data, self.id)[index]
+
+    def __len__(self) -> int:
+        return 3
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, StreamEvent):
+            return (self.event, self.data, self.id) == (other.event, other.data, other.id)
+        if isinstance(other, tuple):
+            return (self.event, self.data, self.id) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"StreamEvent(event={self.event!r}, data={self.data!r}, id={self.id!r}, run_id={self.run_id!r})"
+
+
+class SSEDecoder:
+    """
+    Incremental decoder turning raw stream bytes into ``StreamEvent`` objects.
+
+    Works on bytes end to end and only JSON-decodes each event's ``data`` field,
+    without first splitting the body into ``str`` lines. With ``output_keys``,
+    ``values`` and ``updates`` events are projected onto those state keys
+    before decoding, so the other fields are skipped over rather than decoded.
+
+    Attributes:
+        run_id: Run the stream belongs to, updated from ``metadata`` events
+        bytes_received: Total number of bytes fed to the decoder
+        output_keys: State keys kept in ``values`` and ``updates`` events (None keeps all)
+    """
+
+    __slots__ = ("run_id", "bytes_received", "output_keys", "_buffer", "_pending_cr")
+
+    def __init__(self, run_id: Optional[str] = None, output_keys: Optional[frozenset] = None) -> None:
+        self.run_id = run_id
+        self.bytes_received = 0
+        self.output_keys = output_keys
+        self._buffer = b""
+        # A trailing b"\r" may be the first half of a b"\r\n" split across reads
+        self._pending_cr = False
+
+    def reset(self) -> None:
+        """Drop a partially received event, e.g. before reconnecting."""
+        self._buffer = b""
+        self._pending_cr = False
+
+    def feed(self, chunk: bytes) -> list:
+        """Add bytes from the response and return the events they complete."""
+        self.bytes_received += len(chunk)
+        if self._pending_cr:
+            chunk = b"\r" + chunk
+            self._pending_cr = False
+        if chunk.endswith(b"\r"):
+            chunk = chunk[:-1]
+            self._pending_cr = True
+        if b"\r" in chunk:
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        buffer = self._buffer + chunk if self._buffer else chunk
+
+        events = []
+        start = 0
+        while True:
+            end = buffer.find(b"\n\n", start)
+            if end == -1:
+                break
+            event = self._decode_block(buffer[start:end])
+            if event is not None:
+                events.append(event)
+            start = end + 2
+        self._buffer = buffer[start:]
+        return events
+
+    def _decode_block(self, block: bytes) -> Optional[StreamEvent]:
+        event = ""
+        event_id = None
+        data_lines = []
+        for line in block.split(b"\n"):
+            if not line or line[0] == 58:  # b":" starts a comment
+                continue
+            field, _, value = line.partition(b":")
+            if value[:1] == b" ":
+                value = value[1:]
+            if field == b"data":
+                data_lines.append(value)
+            elif field == b"event":
+                event = value.decode("utf-8")
+            elif field == b"id":
+                event_id = value.decode("utf-8")
+
+        if not event and not data_lines:
+            return None
+        data = None
+        if data_lines:
+            payload = b"\n".join(data_lines)
+            mode = event.split("|", 1)[0]
+            if self.output_keys is not None and mode in ("values", "updates"):
+                data = project_raw(payload, mode, self.output_keys)
+            else:
+                data = loads(payload)
+        if event == "metadata" and isinstance(data, dict) and data.get("run_id"):
+            self.run_id = data["run_id"]
+        return StreamEvent(event or "message", data, event_id, self.run_id)
+
+
+async def aiter_events(response: httpx.Response, decoder: SSEDecoder) -> AsyncIterator[StreamEvent]:
+    """Yield the events of an async streaming response."""
+    async for chunk in response.aiter_bytes():
+        for event in decoder.feed(chunk):
+            yield event
+
+
+def iter_events(response: httpx.Response, decoder: SSEDecoder) -> Iterator[StreamEvent]:
+    """Yield the events of a sync streaming response."""
+    for chunk in response.iter_bytes():
+        for event in decoder.feed(chunk):
+            yield event
@@ -0,0 +1,283 @@
+import asyncio
+import copy
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Generator, Iterator, Optional
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def checkpoint_key(config: Optional[dict], subgraphs: bool = False) -> Optional[tuple]:
+    """
+    Cache key of the checkpoint a config points at, or None if it doesn't name one.
+
+    Only configs with both ``thread_id`` and ``checkpoint_id`` are keyed: a
+    checkpoint never changes once written, while "latest state" does.
+    """
+    configurable = (config or {}).get("configurable") or {}
+    thread_id = configurable.get("thread_id")
+    checkpoint_id = configurable.get("checkpoint_id")
+    if not thread_id or not checkpoint_id:
+        return None
+    return (str(thread_id), configurable.get("checkpoint_ns") or "", str(checkpoint_id), subgraphs)
+
+
+class StateSnapshotCache:
+    """
+    In-process LRU of state snapshots keyed by checkpoint.
+
+    A snapshot for a given ``(thread_id, checkpoint_ns, checkpoint_id)`` never
+    changes, so entries don't expire; they are only evicted once ``maxsize``
+    is exceeded. Snapshots are copied in and out, so callers can't change a
+    cached snapshot.
+
+    Attributes:
+        maxsize: Maximum number of snapshots kept
+        hits: Lookups answered from the cache
+        misses: Lookups that had to go to the server
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, config: Optional[dict], subgraphs: bool = False) -> Optional[Any]:
+        """Return the cached snapshot for the checkpoint in ``config``, if any."""
+        key = checkpoint_key(config, subgraphs)
+        if key is None:
+            return None
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(snapshot)
+
+    def set(self, snapshot: Any, subgraphs: bool = False) -> None:
+        """Store a snapshot under the checkpoint of its own ``config``."""
+        key = checkpoint_key(getattr(snapshot, "config", None), subgraphs)
+        if key is None or self.maxsize <= 0:
+            return
+        snapshot = copy.deepcopy(snapshot)
+        with self._lock:
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _Pages:
+    """Bookkeeping shared by the sync and async history iterators."""
+
+    def __init__(self, limit: Optional[int], page_size: int, before: Optional[dict]) -> None:
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.remaining = limit
+        self.page_size = page_size
+        self.before = before
+        self.exhausted = limit is not None and limit <= 0
+        self.page: list = []
+        self.position = 0
+
+    def next_size(self) -> int:
+        return self.page_size if self.remaining is None else min(self.page_size, self.remaining)
+
+    def accept(self, page: list, requested: int) -> None:
+        """Make ``page`` current and work out where the next one starts."""
+        self.page = page
+        self.position = 0
+        if self.remaining is not None:
+            self.remaining -= len(page)
+        if len(page) < requested or (self.remaining is not None and self.remaining <= 0):
+            self.exhausted = True
+        elif page:
+            self.before = page[-1].config
+
+    def take(self) -> Any:
+        snapshot = self.page[self.position]
+        self.position += 1
+        return snapshot
+
+    @property
+    def buffered(self) -> bool:
+        return self.position < len(self.page)
+
+
+class StateHistory:
+    """
+    Lazy iterator over a thread's state history, newest first.
+
+    History is fetched one page at a time, each page starting before the last
+    snapshot of the previous one. While a page is being consumed the next one
+    is fetched on a background thread, so only about two pages are held in
+    memory and iterating rarely waits on the server.
+
+    Attributes:
+        page_size: Snapshots requested per page
+        pages: Number of pages fetched so far
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[Optional[dict], int], list],
+        *,
+        limit: Optional[int] = None,
+        before: Optional[dict] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> None:
+        """
+        Initialize the iterator. Nothing is fetched until iteration starts.
+
+        Args:
+            fetch_page: Called with ``(before, size)``, returns up to ``size`` snapshots
+            limit: Total number of snapshots to return (None for the whole history)
+            before: Only return snapshots before this checkpoint config
+            page_size: Snapshots requested per page
+            prefetch: Fetch the next page in the background while one is consumed
+        """
+        # Set before validating page_size so __del__ works if that raises
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._next: Optional[tuple] = None
+        self.page_size = page_size
+        self.pages = 0
+        self._fetch_page = fetch_page
+        self._pages = _Pages(limit, page_size, before)
+        self._prefetch = prefetch
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self) -> Any:
+        pages = self._pages
+        while not pages.buffered:
+            if pages.exhausted:
+                self.close()
+                raise StopIteration
+            page, requested = self._load()
+            pages.accept(page, requested)
+            self.pages += 1
+            if self._prefetch and not pages.exhausted:
+                self._start_prefetch()
+        return pages.take()
+
+    def close(self) -> None:
+        """Stop prefetching and release the background thread."""
+        if self._next is not None:
+            self._next[0].cancel()
+            self._next = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _load(self) -> tuple:
+        if self._next is not None:
+            future, requested = self._next
+            self._next = None
+            return future.result(), requested
+        requested = self._pages.next_size()
+        return self._fetch_page(self._pages.before, requested), requested
+
+    def _start_prefetch(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lmsystems-history")
+        requested = self._pages.next_size()
+        future: Future = self._executor.submit(self._fetch_page, self._pages.before, requested)
+        self._next = (future, requested)
+
+    def __del__(self) -> None:
+        self.close()
+
+
+class AsyncStateHistory:
+    """
+    Async counterpart of ``StateHistory``; the next page is fetched by a task
+    on the running event loop.
+
+    Awaiting it returns the iterator itself, so code written for the earlier
+    coroutine API (``async for s in await graph.aget_state_history(...)``)
+    keeps working.
+
+    Attributes:
+        page_size: Snapshots requested per page
+        pages: Number of pages fetched so far
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[Optional[dict], int], Awaitable[list]],
+        *,
+        limit: Optional[int] = None,
+        before: Optional[dict] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> None:
+        """
+        Initialize the iterator. Nothing is fetched until iteration starts.
+
+        Args:
+            fetch_page: Coroutine function called with ``(before, size)``
+            limit: Total number of snapshots to return (None for the whole history)
+            before: Only return snapshots before this checkpoint config
+            page_size: Snapshots requested per page
+            prefetch: Fetch the next page in the background while one is consumed
+        """
+        self.page_size = page_size
+        self.pages = 0
+        self._fetch_page = fetch_page
+        self._pages = _Pages(limit, page_size, before)
+        self._prefetch = prefetch
+        self._next: Optional[tuple] = None
+
+    def __aiter__(self) -> "AsyncStateHistory":
+        return self
+
+    def __await__(self) -> Generator[Any, None, "AsyncStateHistory"]:
+        return self._self().__await__()
+
+    async def _self(self) -> "AsyncStateHistory":
+        return self
+
+    async def __anext__(self) -> Any:
+        pages = self._pages
+        while not pages.buffered:
+            if pages.exhausted:
+                await self.aclose()
+                raise StopAsyncIteration
+            page, requested = await self._load()
+            pages.accept(page, requested)
+            self.pages += 1
+            if self._prefetch and not pages.exhausted:
+                requested = pages.next_size()
+                task = asyncio.get_running_loop().create_task(self._fetch_page(pages.before, requested))
+                self._next = (task, requested)
+        return pages.take()
+
+    async def aclose(self) -> None:
+        """Cancel a prefetch still in flight."""
+        if self._next is not None:
+            task = self._next[0]
+            self._next = None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _load(self) -> tuple:
+        if self._next is not None:
+            task, requested = self._next
+            self._next = None
+            return await task, requested
+        requested = self._pages.next_size()
+        return await self._fetch_page(self._pages.before, requested), requested
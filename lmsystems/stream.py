@@ -0,0 +1,454 @@
+import asyncio
+import re
+import time
+import weakref
+from collections import deque
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+from urllib.parse import quote
+
+import httpx
+
+from .codec import dumps
+from .coalesce import DeltaCoalescer
+from .deadline import Deadline, RunGuard
+from .exceptions import DeadlineExceededError
+from .projection import output_key_set
+from .sse import SSEDecoder, aiter_events, iter_events
+
+_SSE_HEADERS = {"Accept": "text/event-stream", "Cache-Control": "no-store"}
+_RUN_LOCATION = re.compile(r"(/threads/(?P<thread_id>[^/]+))?/runs/(?P<run_id>[^/]+)")
+# Recent event IDs remembered to drop duplicates replayed after a reconnect
+SEEN_WINDOW = 1024
+
+
+class _ResumeState:
+    """Bookkeeping shared by the async and sync resumable streams."""
+
+    def __init__(self, client: Any, max_reconnects: int) -> None:
+        self.client = client
+        self.max_reconnects = max_reconnects
+        self.last_event_id: Optional[str] = None
+        self.reconnects = 0
+        self.duplicates = 0
+        self.received_any = False
+        self.chunks = 0
+        self.first_chunk_at: Optional[float] = None
+        self._seen: set = set()
+        self._seen_order: deque = deque()
+        self._attempt = 0
+
+    def accept(self, chunk: Any) -> bool:
+        """Record a chunk, returning False for a replayed duplicate."""
+        chunk_id = getattr(chunk, "id", None)
+        if chunk_id is not None:
+            if chunk_id in self._seen:
+                self.duplicates += 1
+                return False
+            # A rejoined stream replays from last_event_id, so only recent IDs can repeat
+            if len(self._seen_order) >= SEEN_WINDOW:
+                self._seen.discard(self._seen_order.popleft())
+            self._seen.add(chunk_id)
+            self._seen_order.append(chunk_id)
+            self.last_event_id = chunk_id
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.perf_counter()
+        self.received_any = True
+        self.chunks += 1
+        return True
+
+    def on_error(self, error: Exception, progressed: bool, *, idempotent: bool = True, resumable: bool = True) -> float:
+        """
+        Decide how to handle a failed connection.
+
+        Returns the delay before rejoining the stream, or raises the APIError when
+        the failure isn't retryable, the stream can't be resumed (events carry no
+        IDs, or the run can't be rejoined) or the reconnect budget is spent.
+        ``idempotent`` is False while the request that creates the run may have
+        reached the server.
+        """
+        api_error = self.client._to_api_error("stream run", error)
+        if progressed:
+            self._attempt = 0
+        self._attempt += 1
+
+        # Without event IDs we can't ask the server to continue where we stopped
+        resumable = resumable and (not self.received_any or self.last_event_id is not None)
+        if (
+            not resumable
+            or self.reconnects >= self.max_reconnects
+            or not self.client.retry_policy.should_retry(self._attempt, api_error, idempotent)
+        ):
+            raise api_error from error
+
+        if self.received_any:
+            self.reconnects += 1
+        return self.client.retry_policy.delay(self._attempt, api_error.retry_after)
+
+    def request(self, thread_id: str, run_id: str, kwargs: dict) -> tuple:
+        """Build the path, query params and headers to (re)join a run's stream."""
+        path = f"/threads/{quote(str(thread_id), safe='')}/runs/{quote(str(run_id), safe='')}/stream"
+        params = {
+            "cancel_on_disconnect": kwargs.get("cancel_on_disconnect", False),
+            "stream_mode": kwargs.get("stream_mode"),
+            **(kwargs.get("params") or {}),
+        }
+        params = {k: v for k, v in params.items() if v is not None}
+        headers = {**_SSE_HEADERS, **(kwargs.get("headers") or {})}
+        if self.last_event_id:
+            headers["Last-Event-ID"] = self.last_event_id
+        return path, params, headers
+
+    def report(self, started: float, bytes_received: int, error: Optional[BaseException]) -> None:
+        """Report the finished stream to the client's instrumentation."""
+        self.client.instrumentation.stream(
+            self.client.graph_name,
+            duration=time.perf_counter() - started,
+            chunks=self.chunks,
+            time_to_first_chunk=self.first_chunk_at - started if self.first_chunk_at is not None else None,
+            bytes_received=bytes_received,
+            error=error,
+        )
+
+    def on_complete(self) -> None:
+        if self.client.rate_limiter is not None:
+            self.client.rate_limiter.on_success()
+
+
+class RunStream:
+    """
+    Async iterator over a run's stream that survives dropped connections.
+
+    It remembers the ID of the last event it delivered. If the connection drops,
+    it rejoins the run's stream from that event with ``Last-Event-ID``, so the run
+    keeps going on the server instead of being restarted. Events replayed by the
+    server are dropped. Resuming needs event IDs, which LangGraph sends for runs
+    created with ``stream_resumable=True``.
+
+    The response is read as raw bytes and decoded straight into ``StreamEvent``
+    objects, which unpack like ``langgraph_sdk``'s ``StreamPart``. With
+    ``output_keys``, ``values`` and ``updates`` events only carry those state
+    keys, and the other fields are skipped before they are decoded.
+
+    Given a ``create`` payload, the first request creates the run and streams it
+    in one round trip (``POST /runs/stream``, or ``/threads/{id}/runs/stream``
+    when ``thread_id`` is set). That request is only repeated when the server
+    rejected it with a 429; once the run exists, dropped connections rejoin it
+    like any other run. Stateless runs (no ``thread_id``) can't be rejoined.
+
+    With ``cancel_on_abandon``, a stream abandoned before the run finishes (the
+    consuming task is cancelled, ``aclose`` is called early or the stream is
+    garbage collected) cancels the run with ``runs.cancel`` so it stops using
+    deployment capacity. With a ``deadline`` the run is also cancelled when the
+    deadline passes, and iteration raises ``DeadlineExceededError``.
+
+    It can stand in for the async generator ``stream_run`` used to return:
+    ``asend`` works like ``__anext__``, but ``athrow`` isn't supported.
+
+    Attributes:
+        thread_id: Thread of the streamed run
+        run_id: The streamed run
+        reconnects: Number of times the stream was rejoined after progress
+        duplicates: Number of replayed events that were dropped
+        last_event_id: ID of the last delivered event
+        bytes_received: Raw bytes read from the server, across reconnects
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        thread_id: Optional[str],
+        run_id: Optional[str],
+        *,
+        max_reconnects: int = 10,
+        create: Optional[dict] = None,
+        coalesce: Optional[DeltaCoalescer] = None,
+        output_keys: Optional[Sequence[str]] = None,
+        deadline: Optional[Deadline] = None,
+        guard: Optional[RunGuard] = None,
+        cancel_on_abandon: bool = False,
+        **kwargs: Any
+    ) -> None:
+        """
+        Initialize the stream. Nothing is sent until iteration starts.
+
+        Args:
+            client: The ``LmsystemsClient`` the run belongs to
+            thread_id: Thread of the run (None for a stateless run)
+            run_id: The run to stream (None when ``create`` is given)
+            max_reconnects: Maximum number of times to rejoin after progress
+            create: Request body to create the run with on the first request
+            coalesce: Optional ``DeltaCoalescer`` merging per-token message deltas
+            output_keys: State keys to keep in ``values`` and ``updates`` events
+            deadline: When to stop streaming and cancel the run
+            guard: ``RunGuard`` already watching the run (e.g. from ``create_run``)
+            cancel_on_abandon: Cancel the run if the stream is abandoned before it finishes
+            **kwargs: ``stream_mode``, ``cancel_on_disconnect``, ``headers`` and
+                ``params``, as accepted by ``runs.join_stream``
+        """
+        self.thread_id = thread_id
+        self.run_id = run_id
+        self._kwargs = kwargs
+        self._create = create
+        self._created = create is None
+        self._coalesce = coalesce
+        self._state = _ResumeState(client, max_reconnects)
+        self._decoder = SSEDecoder(run_id, output_key_set(output_keys))
+        self._iterator: Optional[AsyncIterator] = None
+        self._deadline = deadline
+        self._guard = guard
+        if guard is None and (cancel_on_abandon or deadline is not None):
+            self._guard = RunGuard(client, thread_id, run_id, deadline)
+        self._finalizer = None
+        if self._guard is not None and cancel_on_abandon:
+            # The finalizer must not keep the stream alive, so it only holds the guard
+            self._finalizer = weakref.finalize(self, self._guard.abandon)
+            self._finalizer.atexit = False
+
+    @property
+    def reconnects(self) -> int:
+        return self._state.reconnects
+
+    @property
+    def duplicates(self) -> int:
+        return self._state.duplicates
+
+    @property
+    def last_event_id(self) -> Optional[str]:
+        return self._state.last_event_id
+
+    @property
+    def bytes_received(self) -> int:
+        return self._decoder.bytes_received
+
+    def __aiter__(self) -> "RunStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._iterator is None:
+            # Only pay for measurements when the client is instrumented
+            instrumented = self._state.client.instrumentation is not None
+            self._iterator = self._instrumented() if instrumented else self._stream()
+            if self._coalesce is not None:
+                self._iterator = self._coalesce(self._iterator)
+            if self._guard is not None:
+                self._guard.arm()
+        guard = self._guard
+        if guard is None:
+            return await self._iterator.__anext__()
+
+        try:
+            if self._deadline is None:
+                chunk = await self._iterator.__anext__()
+            else:
+                chunk = await asyncio.wait_for(self._iterator.__anext__(), self._deadline.remaining())
+        except StopAsyncIteration:
+            self._finish()
+            raise
+        except asyncio.TimeoutError:
+            self._bind_guard()
+            await guard.cancel()
+            raise DeadlineExceededError("Deadline exceeded while streaming the run") from None
+        except asyncio.CancelledError:
+            # The consumer gave up, so nobody is waiting for the run any more
+            self._bind_guard()
+            guard.abandon()
+            raise
+        except Exception:
+            # A failed stream isn't abandoned: the run can still be joined again
+            if self._finalizer is not None:
+                self._finalizer.detach()
+            raise
+        if guard.run_id is None:
+            self._bind_guard()
+        return chunk
+
+    async def asend(self, value: Any) -> Any:
+        """Return the next chunk; the value is ignored, as the old generator did."""
+        return await self.__anext__()
+
+    async def aclose(self) -> None:
+        """Close the stream, cancelling the run if it hasn't finished and ``cancel_on_abandon`` is set."""
+        if self._finalizer is not None and self._finalizer.alive:
+            self._bind_guard()
+            await self._guard.cancel()
+        if self._iterator is not None:
+            await self._iterator.aclose()
+
+    def _bind_guard(self) -> None:
+        self._guard.bind(self.thread_id, self.run_id or self._decoder.run_id)
+
+    def _finish(self) -> None:
+        self._guard.finish()
+        if self._finalizer is not None:
+            self._finalizer.detach()
+
+    def _create_request(self) -> tuple:
+        """Build the method, path, params, headers and body of the next request."""
+        if self._created:
+            path, params, headers = self._state.request(self.thread_id, self.run_id, self._kwargs)
+            return "GET", path, params, headers, None
+        path = "/runs/stream"
+        if self.thread_id is not None:
+            path = f"/threads/{quote(str(self.thread_id), safe='')}/runs/stream"
+        headers = {**_SSE_HEADERS, "Content-Type": "application/json", **(self._kwargs.get("headers") or {})}
+        return "POST", path, self._kwargs.get("params"), headers, dumps(self._create)
+
+    def _on_created(self, response: Any) -> None:
+        """Record the run the server created, from its Content-Location header."""
+        self._created = True
+        match = _RUN_LOCATION.search(response.headers.get("content-location", ""))
+        if match:
+            self.run_id = match.group("run_id")
+            self.thread_id = self.thread_id or match.group("thread_id")
+
+    def _can_rejoin(self) -> bool:
+        self.run_id = self.run_id or self._decoder.run_id
+        return self.thread_id is not None and self.run_id is not None
+
+    async def _instrumented(self) -> AsyncIterator:
+        started = time.perf_counter()
+        error = None
+        stream = self._stream()
+        try:
+            async for chunk in stream:
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            await stream.aclose()
+            self._state.report(started, self.bytes_received, error)
+
+    async def _stream(self) -> AsyncIterator:
+        state = self._state
+        client = state.client
+        while True:
+            progressed = False
+            creating = not self._created
+            if client.rate_limiter is not None:
+                await client.rate_limiter.acquire()
+            method, path, params, headers, content = self._create_request()
+            try:
+                # Read client.client on every (re)join so swapped credentials are picked up
+                async with client.client.http.client.stream(
+                    method, path, params=params, headers=headers, content=content
+                ) as response:
+                    self._decoder.reset()
+                    if response.is_error:
+                        await response.aread()
+                        response.raise_for_status()
+                    if creating:
+                        self._on_created(response)
+                    async for chunk in aiter_events(response, self._decoder):
+                        if state.accept(chunk):
+                            progressed = True
+                            yield chunk
+            except Exception as e:
+                delay = state.on_error(
+                    e,
+                    progressed,
+                    # A refused connection never reached the server, so creating can be retried
+                    idempotent=self._created or isinstance(e, httpx.ConnectError),
+                    resumable=not self._created or self._can_rejoin(),
+                )
+                await asyncio.sleep(delay)
+                continue
+            state.on_complete()
+            return
+
+
+class SyncRunStream:
+    """
+    Sync counterpart of ``RunStream`` used by ``SyncLmsystemsClient.join_run``.
+
+    Attributes:
+        thread_id: Thread of the streamed run
+        run_id: The streamed run
+        reconnects: Number of times the stream was rejoined after progress
+        duplicates: Number of replayed events that were dropped
+        last_event_id: ID of the last delivered event
+        bytes_received: Raw bytes read from the server, across reconnects
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        thread_id: str,
+        run_id: str,
+        *,
+        max_reconnects: int = 10,
+        output_keys: Optional[Sequence[str]] = None,
+        **kwargs: Any
+    ) -> None:
+        self.thread_id = thread_id
+        self.run_id = run_id
+        self._kwargs = kwargs
+        self._state = _ResumeState(client, max_reconnects)
+        self._decoder = SSEDecoder(run_id, output_key_set(output_keys))
+        self._iterator: Optional[Iterator] = None
+
+    @property
+    def reconnects(self) -> int:
+        return self._state.reconnects
+
+    @property
+    def duplicates(self) -> int:
+        return self._state.duplicates
+
+    @property
+    def last_event_id(self) -> Optional[str]:
+        return self._state.last_event_id
+
+    @property
+    def bytes_received(self) -> int:
+        return self._decoder.bytes_received
+
+    def __iter__(self) -> "SyncRunStream":
+        return self
+
+    def __next__(self) -> Any:
+        if self._iterator is None:
+            instrumented = self._state.client.instrumentation is not None
+            self._iterator = self._instrumented() if instrumented else self._stream()
+        return next(self._iterator)
+
+    def close(self) -> None:
+        if self._iterator is not None:
+            self._iterator.close()
+
+    def _instrumented(self) -> Iterator:
+        started = time.perf_counter()
+        error = None
+        try:
+            yield from self._stream()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._state.report(started, self.bytes_received, error)
+
+    def _stream(self) -> Iterator:
+        state = self._state
+        client = state.client
+        while True:
+            progressed = False
+            if client.rate_limiter is not None:
+                client.rate_limiter.acquire_sync()
+            path, params, headers = state.request(self.thread_id, self.run_id, self._kwargs)
+            try:
+                with client.client.http.client.stream(
+                    "GET", path, params=params, headers=headers
+                ) as response:
+                    self._decoder.reset()
+                    if response.is_error:
+                        response.read()
+                        response.raise_for_status()
+                    for chunk in iter_events(response, self._decoder):
+                        if state.accept(chunk):
+                            progressed = True
+                            yield chunk
+            except Exception as e:
+                time.sleep(state.on_error(e, progressed))
+                continue
+            state.on_complete()
+            return
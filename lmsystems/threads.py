@@ -0,0 +1,277 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Hashable, Optional
+
+from .batch import bounded_map
+
+MANAGED_METADATA_KEY = "lmsystems_thread_manager"
+OWNER_METADATA_KEY = "lmsystems_thread_owner"
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    """Turn a thread's ISO ``created_at``/``updated_at`` into a Unix timestamp."""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class ThreadManager:
+    """
+    Keeps LangGraph threads ready for new sessions and cleans up old ones.
+
+    A pool of pre-created threads is refilled in the background, so ``acquire``
+    usually returns without a round trip. Session keys map to threads in an LRU
+    with a sliding TTL; evicted sessions' threads are queued and deleted in bulk
+    by ``cleanup``, which can also sweep the threads this manager created that
+    haven't been updated for a while. Managed threads are tagged with the
+    ``lmsystems_thread_manager`` metadata key and with the creating manager's
+    ``owner`` under ``lmsystems_thread_owner``, so workers sharing a tag never
+    sweep each other's pooled or in-use threads.
+
+    Attributes:
+        pool_size: Number of idle threads kept ready
+        max_sessions: Maximum number of session mappings kept
+        session_ttl: Seconds a session mapping stays valid after its last use, if set
+        tag: Metadata value identifying this manager's threads
+        owner: Metadata value identifying the threads created by this manager
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        pool_size: int = 8,
+        max_sessions: int = 1024,
+        session_ttl: Optional[float] = 3600.0,
+        tag: Optional[str] = None,
+        owner: Optional[str] = None,
+        metadata: Optional[dict] = None,
+    ) -> None:
+        """
+        Initialize the manager. Call ``start`` to fill the pool ahead of time.
+
+        Args:
+            client: The ``LmsystemsClient`` used to create and delete threads
+            pool_size: Number of idle threads kept ready (0 disables the pool)
+            max_sessions: Maximum number of session mappings kept
+            session_ttl: Seconds a session mapping stays valid after its last use
+            tag: Metadata value identifying managed threads (defaults to the graph name)
+            owner: Metadata value identifying this manager's own threads (defaults to
+                a random ID; pass a stable one, unique per worker, so a restarted
+                worker can sweep what its previous run left behind)
+            metadata: Extra metadata set on every created thread
+        """
+        self.client = client
+        self.pool_size = pool_size
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.tag = tag or client.graph_name
+        self.owner = owner or uuid.uuid4().hex
+        self._metadata = {**(metadata or {}), MANAGED_METADATA_KEY: self.tag, OWNER_METADATA_KEY: self.owner}
+
+        self._pool: deque = deque()
+        self._sessions: "OrderedDict[Hashable, tuple[dict, float]]" = OrderedDict()
+        self._expired: list = []
+        self._refilling: Optional[asyncio.Task] = None
+        self._creating = 0
+
+    @property
+    def idle(self) -> int:
+        """Number of pre-created threads ready to hand out."""
+        return len(self._pool)
+
+    @property
+    def sessions(self) -> int:
+        """Number of live session mappings."""
+        return len(self._sessions)
+
+    async def start(self) -> None:
+        """Fill the pool and wait until it is full."""
+        await self._refill()
+
+    async def acquire(self) -> dict:
+        """Return a fresh thread, from the pool when one is ready."""
+        if self._pool:
+            thread = self._pool.popleft()
+            self._schedule_refill()
+            return thread
+        self._schedule_refill()
+        return await self._create()
+
+    async def for_session(self, session_key: Hashable) -> dict:
+        """Return the thread mapped to ``session_key``, mapping a fresh one if needed."""
+        thread = self._lookup(session_key)
+        if thread is not None:
+            return thread
+
+        thread = await self.acquire()
+        existing = self._lookup(session_key)
+        if existing is not None:
+            # Another task mapped the session while we waited; keep its thread
+            self._pool.appendleft(thread)
+            return existing
+        self._sessions[session_key] = (thread, time.monotonic())
+        self._evict()
+        return thread
+
+    def release(self, session_key: Hashable, *, delete: bool = True) -> Optional[dict]:
+        """Forget a session, queueing its thread for deletion unless ``delete`` is False."""
+        entry = self._sessions.pop(session_key, None)
+        if entry is None:
+            return None
+        if delete:
+            self._expired.append(self.client._get_thread_id(entry[0]))
+        return entry[0]
+
+    async def cleanup(
+        self,
+        *,
+        older_than: Optional[float] = None,
+        page_size: int = 100,
+        concurrency: int = 8,
+    ) -> int:
+        """
+        Delete expired threads in bulk.
+
+        Deletes the threads of evicted sessions and, with ``older_than``, every
+        thread this manager (that is, its ``owner``) created that wasn't updated
+        in that many seconds, except threads that are pooled or still mapped to
+        a session. Threads of other managers with the same tag are left alone.
+
+        Args:
+            older_than: Also sweep this manager's threads idle for this many seconds
+            page_size: Number of threads fetched per search request
+            concurrency: Maximum number of concurrent delete requests
+
+        Returns:
+            The number of deleted threads
+        """
+        self._evict()
+        thread_ids = self._expired
+        self._expired = []
+        if older_than is not None:
+            thread_ids.extend(await self._find_stale(time.time() - older_than, page_size))
+
+        deleted = 0
+
+        async def delete(index: int, thread_id: str) -> bool:
+            try:
+                await self.client._call(
+                    "delete thread",
+                    lambda: self.client.client.threads.delete(thread_id),
+                    idempotent=True,
+                )
+            except Exception as e:
+                if getattr(e, "status_code", None) == 404:
+                    return True
+                # Retry on the next cleanup
+                self._expired.append(thread_id)
+                return False
+            return True
+
+        async for ok in bounded_map(delete, list(dict.fromkeys(thread_ids)), concurrency):
+            deleted += ok
+        return deleted
+
+    async def aclose(self, *, delete_idle: bool = True) -> None:
+        """Stop refilling and, by default, delete the unused pooled threads."""
+        if self._refilling is not None and not self._refilling.done():
+            self._refilling.cancel()
+            try:
+                await self._refilling
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._refilling = None
+        if delete_idle:
+            while self._pool:
+                self._expired.append(self.client._get_thread_id(self._pool.popleft()))
+            await self.cleanup()
+
+    def _lookup(self, session_key: Hashable) -> Optional[dict]:
+        entry = self._sessions.get(session_key)
+        if entry is None:
+            return None
+        thread, last_used = entry
+        now = time.monotonic()
+        if self.session_ttl is not None and now - last_used > self.session_ttl:
+            self.release(session_key)
+            return None
+        self._sessions[session_key] = (thread, now)
+        self._sessions.move_to_end(session_key)
+        return thread
+
+    def _evict(self) -> None:
+        """Drop sessions over the size limit or past their TTL, oldest first."""
+        now = time.monotonic()
+        while self._sessions:
+            key, (_, last_used) = next(iter(self._sessions.items()))
+            expired = self.session_ttl is not None and now - last_used > self.session_ttl
+            if not expired and len(self._sessions) <= self.max_sessions:
+                break
+            self.release(key)
+
+    async def _create(self) -> dict:
+        return await self.client.create_thread(metadata=self._metadata)
+
+    def _schedule_refill(self) -> None:
+        if self.pool_size <= 0 or len(self._pool) + self._creating >= self.pool_size:
+            return
+        if self._refilling is None or self._refilling.done():
+            self._refilling = asyncio.get_running_loop().create_task(self._refill())
+
+    async def _refill(self) -> None:
+        missing = self.pool_size - len(self._pool) - self._creating
+        if missing <= 0:
+            return
+        self._creating += missing
+        try:
+            results = await asyncio.gather(
+                *(self._create() for _ in range(missing)), return_exceptions=True
+            )
+        finally:
+            self._creating -= missing
+        for result in results:
+            if isinstance(result, dict):
+                self._pool.append(result)
+
+    async def _find_stale(self, cutoff: float, page_size: int) -> list:
+        """Collect IDs of this manager's threads last updated before ``cutoff``."""
+        in_use = {self.client._get_thread_id(t) for t in self._pool}
+        in_use.update(self.client._get_thread_id(t) for t, _ in self._sessions.values())
+
+        stale = []
+        offset = 0
+        while True:
+            page = await self.client._call(
+                "search threads",
+                lambda: self.client.client.threads.search(
+                    metadata={MANAGED_METADATA_KEY: self.tag, OWNER_METADATA_KEY: self.owner},
+                    limit=page_size,
+                    offset=offset,
+                    sort_by="updated_at",
+                    sort_order="asc",
+                ),
+                idempotent=True,
+            )
+            for thread in page:
+                updated_at = _parse_timestamp(thread.get("updated_at") or thread.get("created_at"))
+                if updated_at is not None and updated_at >= cutoff:
+                    return stale
+                thread_id = self.client._get_thread_id(thread)
+                if thread_id not in in_use:
+                    stale.append(thread_id)
+            if len(page) < page_size:
+                return stale
+            offset += len(page)
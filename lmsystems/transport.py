@@ -0,0 +1,252 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Union
+
+import httpx
+
+if TYPE_CHECKING:
+    from langgraph_sdk.client import LangGraphClient, SyncLangGraphClient
+
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5, read=300, write=300, pool=5)
+
+
+class _LoopPools(httpx.AsyncBaseTransport):
+    """
+    Async transport that sends each request through a pool of the running event loop.
+
+    An ``httpx.AsyncHTTPTransport`` only works on the loop it was first used on,
+    so one is created per loop. Pools of loops that have been closed are dropped
+    when the next pool is created.
+    """
+
+    def __init__(self, limits: httpx.Limits, http2: bool, retries: int) -> None:
+        self._limits = limits
+        self._http2 = http2
+        self._retries = retries
+        self._lock = threading.Lock()
+        self._pools: "dict[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = {}
+
+    def _pool(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                self._pools = {key: value for key, value in self._pools.items() if not key.is_closed()}
+                pool = self._pools[loop] = httpx.AsyncHTTPTransport(
+                    limits=self._limits, http2=self._http2, retries=self._retries
+                )
+            return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the running loop's pool; pools of other loops are only dropped."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.pop(loop, None)
+            self._pools.clear()
+        if pool is not None:
+            await pool.aclose()
+
+
+class Transport:
+    """
+    Pooled HTTP transport shared by control-plane and LangGraph calls.
+
+    One ``Transport`` owns a single async and a single sync connection pool. The
+    ``/api/get_graph_info`` lookups and every LangGraph client handed out by
+    ``get_client``/``get_sync_client`` go through those pools, so connections to
+    the marketplace and to each deployment are reused across clients and graphs.
+
+    httpx async pools only work on the event loop they were first used on, so
+    each event loop gets its own async pool. Clients handed out by ``get_client``
+    pick the pool of the loop they are awaited on and keep working across
+    ``asyncio.run`` calls.
+
+    LangGraph clients are kept per ``(url, api_key)`` in an LRU of
+    ``max_clients`` entries, so clients built for credentials that were since
+    refreshed away are dropped. Dropping a client doesn't close anything: it
+    only wraps the shared pools, and calls still using it keep working.
+
+    Attributes:
+        limits: Connection pool limits
+        timeout: Default timeout for every request
+        http2: Whether HTTP/2 is negotiated (requires ``httpx[http2]``)
+        max_clients: Most LangGraph clients of each kind kept for reuse
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 30.0,
+        http2: bool = False,
+        timeout: Union[float, httpx.Timeout, None] = None,
+        retries: int = 5,
+        max_clients: int = 32,
+    ) -> None:
+        """
+        Initialize the transport. Pools are created lazily on first use.
+
+        Args:
+            max_connections: Maximum number of open connections per pool
+            max_keepalive_connections: Maximum number of idle connections kept alive
+            keepalive_expiry: Seconds an idle connection is kept before closing
+            http2: Negotiate HTTP/2 where the server supports it
+            timeout: Request timeout in seconds or an ``httpx.Timeout``
+            retries: Number of connection retries (connect errors only)
+            max_clients: Most LangGraph clients of each kind kept for reuse
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout) if timeout is not None else DEFAULT_TIMEOUT
+        self.http2 = http2
+        self.retries = retries
+        self.max_clients = max_clients
+
+        self._lock = threading.Lock()
+        self._async_pool: Optional[_LoopPools] = None
+        self._sync_pool: Optional[httpx.HTTPTransport] = None
+        self._async_http: Optional[httpx.AsyncClient] = None
+        self._sync_http: Optional[httpx.Client] = None
+        self._clients: "OrderedDict[tuple, LangGraphClient]" = OrderedDict()
+        self._sync_clients: "OrderedDict[tuple, SyncLangGraphClient]" = OrderedDict()
+
+    def _get_async_pool(self) -> _LoopPools:
+        if self._async_pool is None:
+            self._async_pool = _LoopPools(self.limits, self.http2, self.retries)
+        return self._async_pool
+
+    def _get_sync_pool(self) -> httpx.HTTPTransport:
+        if self._sync_pool is None:
+            self._sync_pool = httpx.HTTPTransport(
+                limits=self.limits, http2=self.http2, retries=self.retries
+            )
+        return self._sync_pool
+
+    @property
+    def async_http(self) -> httpx.AsyncClient:
+        """Async HTTP client for control-plane calls."""
+        with self._lock:
+            if self._async_http is None:
+                self._async_http = httpx.AsyncClient(
+                    transport=self._get_async_pool(), timeout=self.timeout
+                )
+            return self._async_http
+
+    @property
+    def sync_http(self) -> httpx.Client:
+        """Sync HTTP client for control-plane calls."""
+        with self._lock:
+            if self._sync_http is None:
+                self._sync_http = httpx.Client(
+                    transport=self._get_sync_pool(), timeout=self.timeout
+                )
+            return self._sync_http
+
+    @staticmethod
+    def _headers(api_key: Optional[str]) -> dict:
+        """The LangGraph SDK's default headers, such as its User-Agent, with the API key merged in."""
+        try:
+            from langgraph_sdk._shared.utilities import _get_headers
+        except ImportError:
+            # langgraph_sdk before 0.4 keeps it in the client module
+            from langgraph_sdk.client import _get_headers
+        return _get_headers(api_key, None)
+
+    def _remember(self, clients: OrderedDict, key: tuple, client: object) -> None:
+        clients[key] = client
+        while len(clients) > self.max_clients:
+            clients.popitem(last=False)
+
+    def get_client(self, url: str, api_key: Optional[str]) -> "LangGraphClient":
+        """Return an async LangGraph client for a deployment, backed by the shared pool."""
+        key = (url.rstrip('/'), api_key)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+            else:
+                # langgraph_sdk is slow to import, so only load it once a client is needed
+                from langgraph_sdk.client import LangGraphClient
+
+                client = LangGraphClient(
+                    httpx.AsyncClient(
+                        base_url=key[0],
+                        transport=self._get_async_pool(),
+                        timeout=self.timeout,
+                        headers=self._headers(api_key),
+                    )
+                )
+                self._remember(self._clients, key, client)
+            return client
+
+    def get_sync_client(self, url: str, api_key: Optional[str]) -> "SyncLangGraphClient":
+        """Return a sync LangGraph client for a deployment, backed by the shared pool."""
+        key = (url.rstrip('/'), api_key)
+        with self._lock:
+            client = self._sync_clients.get(key)
+            if client is not None:
+                self._sync_clients.move_to_end(key)
+            else:
+                from langgraph_sdk.client import SyncLangGraphClient
+
+                client = SyncLangGraphClient(
+                    httpx.Client(
+                        base_url=key[0],
+                        transport=self._get_sync_pool(),
+                        timeout=self.timeout,
+                        headers=self._headers(api_key),
+                    )
+                )
+                self._remember(self._sync_clients, key, client)
+            return client
+
+    async def aclose(self) -> None:
+        """Close the running loop's async pool and forget clients built on the pools."""
+        with self._lock:
+            pool, self._async_pool = self._async_pool, None
+            self._async_http = None
+            self._clients.clear()
+        if pool is not None:
+            await pool.aclose()
+
+    def close(self) -> None:
+        """Close the sync pool and forget clients built on it."""
+        with self._lock:
+            pool, self._sync_pool = self._sync_pool, None
+            self._sync_http = None
+            self._sync_clients.clear()
+        if pool is not None:
+            pool.close()
+
+    async def __aenter__(self) -> "Transport":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_default_transport: Optional[Transport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    """Return the process-wide transport used when a client isn't given one."""
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+        return _default_transport
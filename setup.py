@@ -7,14 +7,21 @@ with open("README.md", "r", encoding="utf-8") as fh:
 setup(
     name='lmsystems',
     version='0.0.6',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*', 'tests', 'tests.*']),
     install_requires=[
-        'requests>=2.25.1',
-        'langgraph>=0.2.53',
-        'langgraph_sdk>=0.1.36',
+        'langgraph>=1.0.5',
+        'langgraph_sdk>=0.3.0',
         'httpx>=0.24.0',
         'pyjwt>=2.0.0',
     ],
+    extras_require={
+        'http2': ['httpx[http2]>=0.24.0'],
+        'fast': ['orjson>=3.9.0'],
+        'otel': ['opentelemetry-api>=1.20.0'],
+    },
+    entry_points={
+        'console_scripts': ['lmsystems=lmsystems.cli:main'],
+    },
     author='Sean Sullivan',
     author_email='sean.sullivan3@yahoo.com',
     description='SDK for integrating purchased graphs from the lmsystems marketplace.',
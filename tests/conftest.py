@@ -0,0 +1,25 @@
+import pytest
+
+from benchmarks.server import FakeServer, ServerSettings
+from lmsystems.client import LmsystemsClient
+from lmsystems.graph_info import GraphInfoCache
+from lmsystems.transport import Transport
+
+
+@pytest.fixture
+def server():
+    with FakeServer(ServerSettings(chunks=3, chunk_size=16)) as server:
+        yield server
+
+
+@pytest.fixture
+def make_client(server):
+    """Coroutine function returning an initialized client talking to the fake server."""
+
+    async def make(**kwargs):
+        kwargs.setdefault("graph_info_cache", GraphInfoCache())
+        kwargs.setdefault("transport", Transport())
+        kwargs.setdefault("refresh_credentials", False)
+        return await LmsystemsClient.create("test-graph", "test-api-key", server.url, **kwargs)
+
+    return make
@@ -0,0 +1,218 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from lmsystems.batch import bounded_map
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_unordered_yields_every_result():
+    async def double(index, item):
+        await asyncio.sleep(0.001 * (item % 3))
+        return item * 2
+
+    results = asyncio.run(collect(bounded_map(double, range(50), 8)))
+    assert sorted(results) == [i * 2 for i in range(50)]
+
+
+def test_ordered_keeps_input_order():
+    async def echo(index, item):
+        await asyncio.sleep(0.001 * ((7 * item) % 5))
+        return index, item
+
+    results = asyncio.run(collect(bounded_map(echo, iter(range(100)), 8, ordered=True)))
+    assert results == [(i, i) for i in range(100)]
+
+
+def test_async_iterable_input():
+    async def items():
+        for i in range(20):
+            yield i
+
+    async def identity(index, item):
+        return item
+
+    assert asyncio.run(collect(bounded_map(identity, items(), 4, ordered=True))) == list(range(20))
+
+
+def test_ordered_window_bounds_buffering_behind_slow_item():
+    started = []
+    release = None
+
+    async def run(index, item):
+        started.append(index)
+        if index == 0:
+            await release.wait()
+        return index
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        iterator = bounded_map(run, range(1000), 4, ordered=True, window=10)
+        first = asyncio.ensure_future(iterator.__anext__())
+        await asyncio.sleep(0.05)
+        # The slow head item holds back everything past the window
+        assert max(started) < 10
+        release.set()
+        results = [await first] + await collect(iterator)
+        return results
+
+    assert asyncio.run(main()) == list(range(1000))
+
+
+def test_escaping_exception_stops_the_batch():
+    async def fail(index, item):
+        if item == 3:
+            raise RuntimeError("boom")
+        return item
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect(bounded_map(fail, range(10), 2)))
+
+
+def test_invalid_limits():
+    async def identity(index, item):
+        return item
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect(bounded_map(identity, range(3), 0)))
+    with pytest.raises(ValueError):
+        asyncio.run(collect(bounded_map(identity, range(3), 4, ordered=True, window=2)))
+
+
+def test_run_many_leaves_no_threads(server, make_client):
+    async def main():
+        client = await make_client()
+        try:
+            return await collect(client.run_many([{"n": i} for i in range(10)], concurrency=4, ordered=True))
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(main())
+    assert [r.index for r in results] == list(range(10))
+    assert all(r.ok and r.thread is None for r in results)
+    assert server.requests.get("create_thread", 0) == 0
+    assert server.requests["wait_run"] == 10
+
+
+def test_run_many_stream_is_stateless(server, make_client):
+    async def main():
+        client = await make_client()
+        try:
+            return await collect(client.run_many([{"n": i} for i in range(3)], stream=True))
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(main())
+    assert all(r.ok and r.output for r in results)
+    assert server.requests.get("create_thread", 0) == 0
+
+
+class FakeRemoteGraph:
+    """Stands in for RemoteGraph: slower for small inputs, failing on ``fail``."""
+
+    config = None
+    assistant_id = "a"
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.kwargs = []
+
+    def _enter(self, kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.kwargs.append(kwargs)
+
+    def _leave(self):
+        with self.lock:
+            self.active -= 1
+
+    @staticmethod
+    def _output(input):
+        if input.get("fail"):
+            raise ValueError(f"bad input {input['n']}")
+        return {"n": input["n"] * 2, "default": input.get("default")}
+
+    def invoke(self, input, config=None, **kwargs):
+        self._enter(kwargs)
+        try:
+            time.sleep(0.002 * (10 - input["n"] % 10))
+            return self._output(input)
+        finally:
+            self._leave()
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        self._enter(kwargs)
+        try:
+            await asyncio.sleep(0.002 * (10 - input["n"] % 10))
+            return self._output(input)
+        finally:
+            self._leave()
+
+
+def make_graph(**kwargs):
+    from lmsystems.purchased_graph import PurchasedGraph
+
+    graph = PurchasedGraph("g", "key", lazy=True, default_state_values={"default": 1}, **kwargs)
+    graph._remote_graph = FakeRemoteGraph()
+    return graph
+
+
+def test_graph_batch_keeps_input_order_and_caps_concurrency():
+    graph = make_graph(max_concurrency=3)
+    inputs = [{"n": n} for n in range(20)]
+    assert graph.batch(inputs) == [{"n": n * 2, "default": 1} for n in range(20)]
+    assert 1 < graph._remote_graph.peak <= 3
+    assert all(kwargs["on_disconnect"] == "cancel" for kwargs in graph._remote_graph.kwargs)
+
+    graph = make_graph(max_concurrency=3)
+    assert asyncio.run(graph.abatch(inputs, {"max_concurrency": 5})) == [{"n": n * 2, "default": 1} for n in range(20)]
+    assert graph._remote_graph.peak == 5
+
+
+def test_graph_batch_as_completed_yields_every_index():
+    graph = make_graph(max_concurrency=4)
+    inputs = [{"n": n} for n in range(12)]
+    pairs = list(graph.batch_as_completed(inputs))
+    assert sorted(index for index, _ in pairs) == list(range(12))
+    assert all(output["n"] == inputs[index]["n"] * 2 for index, output in pairs)
+
+    async def collect_pairs():
+        return [pair async for pair in graph.abatch_as_completed(inputs)]
+
+    assert sorted(index for index, _ in asyncio.run(collect_pairs())) == list(range(12))
+
+
+def test_graph_batch_return_exceptions():
+    inputs = [{"n": 0}, {"n": 1, "fail": True}, {"n": 2}]
+
+    outputs = make_graph().batch(inputs, return_exceptions=True)
+    assert outputs[0]["n"] == 0 and outputs[2]["n"] == 4
+    assert isinstance(outputs[1], Exception) and "bad input 1" in str(outputs[1])
+    with pytest.raises(Exception, match="bad input 1"):
+        make_graph().batch(inputs)
+
+    outputs = asyncio.run(make_graph().abatch(inputs, return_exceptions=True))
+    assert isinstance(outputs[1], ValueError) and outputs[2]["n"] == 4
+    with pytest.raises(ValueError, match="bad input 1"):
+        asyncio.run(make_graph().abatch(inputs))
+
+
+def test_graph_batch_config_per_input():
+    from lmsystems.exceptions import InputError
+
+    graph = make_graph()
+    assert graph.batch([{"n": 1}, {"n": 2}], [{"max_concurrency": 1}, None]) == [
+        {"n": 2, "default": 1}, {"n": 4, "default": 1}
+    ]
+    assert graph._remote_graph.peak == 1
+    with pytest.raises(InputError):
+        graph.batch([{"n": 1}, {"n": 2}], [None])
@@ -0,0 +1,63 @@
+import json
+
+from lmsystems.cli import Checkpoint, main
+
+
+def batch(server, tmp_path, *extra):
+    return main([
+        "batch", str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"),
+        "--graph", "test-graph", "--api-key", "test-api-key", "--base-url", server.url,
+        "--stats-interval", "0", *extra,
+    ])
+
+
+def read_output(tmp_path):
+    return [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+
+
+def test_checkpoint_skips_torn_lines(tmp_path):
+    path = tmp_path / "checkpoint"
+    path.write_text("0 ok\n1 error\n2 ok\n1 ok\n3 err")
+    checkpoint = Checkpoint(str(path))
+    checkpoint.close()
+    assert checkpoint.done == {0, 1, 2}
+    assert checkpoint.failed == set()
+
+
+def test_batch_writes_results_and_checkpoint(server, tmp_path):
+    (tmp_path / "in.jsonl").write_text("".join(json.dumps({"n": i}) + "\n" for i in range(5)) + "not json\n")
+    assert batch(server, tmp_path, "--ordered") == 1
+
+    records = read_output(tmp_path)
+    assert [r["index"] for r in records if "output" in r] == [0, 1, 2, 3, 4]
+    assert [r["index"] for r in records if "error" in r] == [5]
+    checkpoint = Checkpoint(str(tmp_path / "out.jsonl.checkpoint"))
+    checkpoint.close()
+    assert checkpoint.done == {0, 1, 2, 3, 4}
+    assert checkpoint.failed == {5}
+    assert server.requests.get("create_thread", 0) == 0
+
+
+def test_batch_resumes_from_checkpoint(server, tmp_path):
+    (tmp_path / "in.jsonl").write_text("".join(json.dumps({"n": i}) + "\n" for i in range(10)))
+    # A previous attempt finished items 0-3 and crashed while recording item 4
+    (tmp_path / "out.jsonl.checkpoint").write_text("0 ok\n1 ok\n2 ok\n3 ok\n4")
+
+    assert batch(server, tmp_path) == 0
+    assert sorted(r["index"] for r in read_output(tmp_path)) == list(range(4, 10))
+    assert server.requests["wait_run"] == 6
+
+    # Running again finds nothing left to do
+    server.reset_counts()
+    assert batch(server, tmp_path) == 0
+    assert server.requests.get("wait_run", 0) == 0
+
+
+def test_batch_retry_errors(server, tmp_path):
+    (tmp_path / "in.jsonl").write_text(json.dumps({"n": 0}) + "\n" + json.dumps({"n": 1}) + "\n")
+    (tmp_path / "out.jsonl.checkpoint").write_text("0 ok\n1 error\n")
+
+    assert batch(server, tmp_path) == 0
+    assert server.requests.get("wait_run", 0) == 0
+    assert batch(server, tmp_path, "--retry-errors") == 0
+    assert [r["index"] for r in read_output(tmp_path)] == [1]
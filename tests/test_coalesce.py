@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from lmsystems.coalesce import DeltaCoalescer
+from lmsystems.sse import StreamEvent
+
+METADATA = {"langgraph_node": "agent"}
+
+
+def delta(message_id, content, id=None):
+    return StreamEvent("messages", [{"type": "AIMessageChunk", "id": message_id, "content": content}, METADATA], id)
+
+
+async def source(chunks, delay=0.0):
+    for chunk in chunks:
+        if delay:
+            await asyncio.sleep(delay)
+        yield chunk
+
+
+def coalesce(chunks, delay=0.0, **kwargs):
+    async def main():
+        return [chunk async for chunk in DeltaCoalescer(**kwargs)(source(chunks, delay))]
+
+    return asyncio.run(main())
+
+
+def contents(chunks):
+    return [chunk.data[0]["content"] if chunk.event == "messages" else chunk.event for chunk in chunks]
+
+
+def test_merges_deltas_by_message_id():
+    chunks = coalesce([delta("m1", "Hel", "1"), delta("m1", "lo", "2"), delta("m2", " wor", "3"), delta("m2", "ld", "4")])
+    assert contents(chunks) == ["Hello", " world"]
+    # The merged chunk carries the ID of the last merged event, so resuming skips what it holds
+    assert [chunk.id for chunk in chunks] == ["2", "4"]
+    assert chunks[0].data[1] == METADATA
+
+
+def test_other_events_flush_and_pass_through_in_order():
+    values = StreamEvent("values", {"step": 1}, "3")
+    chunks = coalesce([delta("m1", "a"), delta("m1", "b"), values, delta("m1", "c")])
+    assert contents(chunks) == ["ab", "values", "c"]
+    assert chunks[1] is values
+
+
+def test_flushes_at_size_limits():
+    assert contents(coalesce([delta("m1", "x")] * 5, max_chunks=2)) == ["xx", "xx", "x"]
+    assert contents(coalesce([delta("m1", "abc")] * 3, max_chars=5)) == ["abcabc", "abc"]
+
+
+def test_flushes_after_max_latency():
+    chunks = coalesce([delta("m1", "a"), delta("m1", "b"), delta("m1", "c")], delay=0.05, max_latency=0.01)
+    assert contents(chunks) == ["a", "b", "c"]
+
+
+def test_flushes_at_end_of_stream():
+    assert contents(coalesce([delta("m1", "a"), delta("m1", "b")], max_latency=10)) == ["ab"]
+    assert coalesce([]) == []
+
+
+def test_serialized_tool_call_chunks_are_not_merged():
+    tool_delta = StreamEvent("messages", [{"id": "m1", "content": "", "tool_call_chunks": [{"args": "{"}]}, METADATA])
+    chunks = coalesce([delta("m1", "a"), tool_delta, delta("m1", "b")])
+    assert len(chunks) == 3 and chunks[1] is tool_delta
+
+
+def test_partial_messages_keep_the_latest():
+    partial = [StreamEvent("messages/partial", [{"id": "m1", "content": text}]) for text in ("H", "He", "Hel")]
+    assert coalesce(partial) == [partial[-1]]
+
+
+def test_tuple_chunks_from_remote_graph():
+    chunks = coalesce([({"id": "m1", "content": "a"}, METADATA), ({"id": "m1", "content": "b"}, METADATA)])
+    assert chunks == [({"id": "m1", "content": "ab"}, METADATA)]
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        DeltaCoalescer(max_chunks=0)
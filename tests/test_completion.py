@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from lmsystems.completion import CompletionTracker
+from lmsystems.exceptions import APIError, GraphError
+
+
+class FakeRuns:
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.gets = 0
+
+    async def get(self, thread_id, run_id):
+        self.gets += 1
+        if run_id not in self.statuses:
+            raise LookupError("missing")
+        return {"run_id": run_id, "thread_id": thread_id, "status": self.statuses[run_id]}
+
+    async def join(self, thread_id, run_id):
+        return {"result": run_id}
+
+    async def list(self, thread_id, limit=10):
+        return [{"run_id": run_id, "status": status} for run_id, status in self.statuses.items()]
+
+
+class OldThreads:
+    """Threads API of an SDK whose search doesn't take ``ids``/``select``."""
+
+    def __init__(self):
+        self.searches = 0
+
+    async def search(self, metadata=None, limit=10):
+        self.searches += 1
+        raise AssertionError("unreachable")
+
+
+class FakeLangGraph:
+    def __init__(self, statuses, threads):
+        self.runs = FakeRuns(statuses)
+        self.threads = threads
+
+
+class FakeClient:
+    def __init__(self, statuses, threads=None):
+        self.client = FakeLangGraph(statuses, threads or OldThreads())
+        self.finished = []
+
+    def _get_thread_id(self, thread):
+        return thread["thread_id"]
+
+    def _run_finished(self, run_id):
+        self.finished.append(run_id)
+
+    async def _call(self, action, func, *, idempotent):
+        try:
+            return await func()
+        except Exception as e:
+            raise APIError.from_exception(f"Failed to {action}", e) from e
+
+
+def tracker_for(client):
+    return CompletionTracker(client, min_interval=0.01, max_interval=0.05)
+
+
+def test_search_without_status_code_falls_back_to_get():
+    async def main():
+        statuses = {"r1": "success", "r2": "error"}
+        client = FakeClient(statuses)
+        tracker = tracker_for(client)
+        ok = tracker.track({"thread_id": "t1"}, {"run_id": "r1"})
+        failed = tracker.track({"thread_id": "t2"}, {"run_id": "r2"})
+        try:
+            assert await asyncio.wait_for(ok, 2) == {"result": "r1"}
+            with pytest.raises(GraphError):
+                await asyncio.wait_for(failed, 2)
+            assert not tracker._search_threads
+            assert client.client.threads.searches == 0
+            assert sorted(client.finished) == ["r1", "r2"]
+        finally:
+            await tracker.aclose()
+
+    asyncio.run(main())
+
+
+def test_runs_keep_polling_until_terminal():
+    async def main():
+        statuses = {"r1": "running"}
+        client = FakeClient(statuses)
+        tracker = tracker_for(client)
+        future = tracker.track({"thread_id": "t1"}, {"run_id": "r1"})
+        try:
+            await asyncio.sleep(0.1)
+            assert not future.done()
+            statuses["r1"] = "success"
+            assert await asyncio.wait_for(future, 2) == {"result": "r1"}
+        finally:
+            await tracker.aclose()
+
+    asyncio.run(main())
+
+
+def test_multiple_runs_per_thread_use_list():
+    async def main():
+        statuses = {"r1": "success", "r2": "success"}
+        client = FakeClient(statuses)
+        tracker = tracker_for(client)
+        futures = [tracker.track({"thread_id": "t1"}, {"run_id": run_id}) for run_id in statuses]
+        try:
+            results = await asyncio.wait_for(asyncio.gather(*futures), 2)
+            assert results == [{"result": "r1"}, {"result": "r2"}]
+            assert client.client.runs.gets == 0
+        finally:
+            await tracker.aclose()
+
+    asyncio.run(main())
+
+
+def test_unexpected_scheduler_error_fails_pending_futures():
+    async def main():
+        client = FakeClient({"r1": "running"})
+        tracker = tracker_for(client)
+
+        async def broken(batch):
+            raise RuntimeError("scheduler bug")
+
+        tracker._statuses = broken
+        future = tracker.track({"thread_id": "t1"}, {"run_id": "r1"})
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(future, 2)
+        assert tracker.pending == 0
+        await tracker.aclose()
+
+    asyncio.run(main())
+
+
+def test_webhook_completes_run():
+    async def main():
+        client = FakeClient({"r1": "running"})
+        tracker = tracker_for(client)
+        url = await tracker.start_webhook_receiver()
+        future = tracker.track({"thread_id": "t1"}, {"run_id": "r1"})
+        try:
+            host, port = url.split("//", 1)[1].split("/", 1)[0].split(":")
+            path = "/" + url.split("//", 1)[1].split("/", 1)[1]
+            body = b'{"run_id": "r1", "status": "success", "values": {"answer": 42}}'
+            reader, writer = await asyncio.open_connection(host, int(port))
+            writer.write(
+                f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            assert (await reader.readline()).startswith(b"HTTP/1.1 200")
+            writer.close()
+            assert await asyncio.wait_for(future, 2) == {"answer": 42}
+        finally:
+            await tracker.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+import asyncio
+import inspect
+import time
+
+import jwt
+
+from lmsystems.credentials import CredentialManager, token_expiry
+from lmsystems.graph_info import GraphInfoCache
+from lmsystems.registry import GraphRegistry
+from lmsystems.transport import Transport
+
+
+def make_token(expires_in: float) -> str:
+    return jwt.encode({"exp": int(time.time() + expires_in), "lgraph_api_key": "key"}, "test-secret-" * 3, algorithm="HS256")
+
+
+def graph_info(expires_in: float = 3600) -> dict:
+    return {
+        "graph_name": "g",
+        "graph_url": "http://127.0.0.1:1",
+        "lgraph_api_key": make_token(expires_in),
+        "assistant_id": "a",
+        "configurables": {},
+    }
+
+
+def make_registry(refresh_credentials: bool = True) -> GraphRegistry:
+    registry = GraphRegistry(["g"], "api-key", "http://127.0.0.1:1", graph_info_cache=GraphInfoCache(),
+                             transport=Transport(), refresh_credentials=refresh_credentials)
+    registry._graph_info["g"] = graph_info()
+    return registry
+
+
+def test_token_expiry():
+    info = graph_info(600)
+    assert abs(token_expiry(info) - (time.time() + 600)) < 2
+    assert token_expiry({"lgraph_api_key": "not-a-jwt"}) is None
+
+
+def test_registry_client_starts_refresh():
+    async def main():
+        client = make_registry().client("g")
+        try:
+            assert client.credentials.expires_at is not None
+            assert client.credentials._task is not None and not client.credentials._task.done()
+        finally:
+            await client.aclose()
+
+    asyncio.run(main())
+
+
+def test_refresh_is_opt_in():
+    from lmsystems.client import LmsystemsClient, SyncLmsystemsClient
+    from lmsystems.purchased_graph import PurchasedGraph
+
+    assert make_registry(refresh_credentials=False).client("g").credentials is None
+    assert LmsystemsClient("g", "api-key").credentials is None
+    assert PurchasedGraph("g", "api-key", lazy=True).credentials is None
+    # The sync client fetches graph info on construction, so check its default instead
+    assert inspect.signature(SyncLmsystemsClient).parameters["refresh_credentials"].default is False
+
+
+def test_registry_client_outside_loop_defers_refresh():
+    client = make_registry().client("g")
+    assert client.credentials.deferred
+
+    async def main():
+        # The first graph call starts the refresh on the loop it runs on
+        client.credentials.start(client.graph_info)
+        assert not client.credentials.deferred
+        await client.aclose()
+
+    asyncio.run(main())
+
+
+def test_refresh_applies_new_credentials():
+    applied = []
+    manager = CredentialManager(applied.append, fetch=lambda: graph_info(7200))
+    manager.start(graph_info(3600))
+    try:
+        assert manager.refresh()
+        assert applied and manager.refreshes == 1
+        assert manager.expires_at > time.time() + 7000
+    finally:
+        manager.stop()
+
+
+def test_failed_refresh_keeps_credentials():
+    def fail():
+        raise RuntimeError("backend down")
+
+    errors = []
+    manager = CredentialManager(lambda info: None, fetch=fail, on_error=errors.append)
+    manager.start(graph_info(3600))
+    expires_at = manager.expires_at
+    try:
+        assert not manager.refresh()
+        assert manager.failures == 1 and isinstance(manager.last_error, RuntimeError)
+        assert manager.expires_at == expires_at
+        assert errors == [manager.last_error]
+        assert manager.next_delay() > 0
+    finally:
+        manager.stop()
+
+
+class Owner:
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self.applied = []
+        self.credentials = CredentialManager(self.apply, fetch=self.refresh_graph_info, retry_interval=0.01)
+
+    def apply(self, info):
+        self.applied.append(info)
+
+    def refresh_graph_info(self):
+        return self.fetch()
+
+
+def test_sync_refreshes_share_one_thread():
+    import threading
+
+    owners = [Owner(lambda: graph_info(3600)) for _ in range(20)]
+    for owner in owners:
+        owner.credentials.start(graph_info(3600))
+    refresh_threads = [t for t in threading.enumerate() if t.name == "lmsystems-credentials"]
+    assert len(refresh_threads) == 1
+    for owner in owners:
+        owner.credentials.stop()
+
+
+def test_sync_refresh_runs_when_due_and_stops_with_owner():
+    import gc
+
+    # Credentials inside the refresh margin are refreshed right away
+    owner = Owner(lambda: graph_info(3600))
+    owner.credentials.start(graph_info(60))
+    deadline = time.time() + 2
+    while not owner.applied and time.time() < deadline:
+        time.sleep(0.01)
+    assert owner.credentials.refreshes == 1
+
+    manager = owner.credentials
+    del owner
+    gc.collect()
+    assert manager._stopped.is_set()
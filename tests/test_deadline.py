@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from lmsystems.deadline import Deadline, as_deadline, iter_until
+from lmsystems.exceptions import DeadlineExceededError
+
+
+def test_as_deadline():
+    assert as_deadline(None) is None
+    deadline = Deadline.after(10)
+    assert as_deadline(deadline) is deadline
+    assert 0 < as_deadline(5).remaining() <= 5
+    assert Deadline.after(-1).expired
+
+
+def test_iter_until_stops_at_deadline():
+    async def slow():
+        yield 1
+        await asyncio.sleep(1)
+        yield 2
+
+    async def main():
+        chunks = []
+        with pytest.raises(DeadlineExceededError):
+            async for chunk in iter_until(slow(), Deadline.after(0.05)):
+                chunks.append(chunk)
+        return chunks
+
+    assert asyncio.run(main()) == [1]
+
+
+def test_no_cancel_after_run_joined(server, make_client):
+    async def main():
+        client = await make_client()
+        thread = await client.create_thread()
+        run = await client.create_run(thread, input={}, deadline=0.2)
+        await client.join_run(thread, run)
+        await asyncio.sleep(0.4)
+        await client.aclose()
+
+    asyncio.run(main())
+    assert server.requests["join_run"] == 1
+    assert server.requests.get("cancel_run", 0) == 0
+
+
+def test_no_cancel_after_tracked_run_completes(server, make_client):
+    async def main():
+        client = await make_client()
+        client.completion_tracker.min_interval = 0.01
+        thread = await client.create_thread()
+        future = await client.completion_tracker.submit(thread, input={}, deadline=0.3)
+        client.completion_tracker._search_threads = False
+        await asyncio.wait_for(future, 2)
+        await asyncio.sleep(0.5)
+        await client.aclose()
+
+    asyncio.run(main())
+    assert server.requests.get("cancel_run", 0) == 0
+
+
+def test_unfinished_run_is_cancelled_at_deadline(server, make_client):
+    async def main():
+        client = await make_client()
+        thread = await client.create_thread()
+        await client.create_run(thread, input={}, deadline=0.05)
+        await asyncio.sleep(0.3)
+        await client.aclose()
+
+    asyncio.run(main())
+    assert server.requests["cancel_run"] == 1
+
+
+def test_deadline_guards_runs_identified_by_id(server, make_client):
+    async def main():
+        client = await make_client()
+        thread = await client.create_thread()
+
+        async def create(**kwargs):
+            return {"id": "run-by-id", "thread_id": thread["thread_id"], "status": "pending"}
+
+        client.client.runs.create = create
+        run = await client.create_run(thread, input={}, deadline=0.05)
+        assert run["id"] in client._run_guards
+        await asyncio.sleep(0.3)
+        await client.aclose()
+
+    asyncio.run(main())
+    assert server.requests["cancel_run"] == 1
+
+
+def test_breaking_out_of_a_stream_leaves_the_run_running(server, make_client):
+    async def main():
+        client = await make_client()
+        thread = await client.create_thread()
+        run = await client.create_run(thread, input={})
+        stream = client.stream_run(thread, run)
+        assert (await stream.asend(None)).event == "metadata"
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        await client.aclose()
+
+    asyncio.run(main())
+    assert server.requests.get("cancel_run", 0) == 0
+
+
+def test_cancel_on_abandon_cancels_the_run(server, make_client):
+    async def main():
+        client = await make_client()
+        thread = await client.create_thread()
+        run = await client.create_run(thread, input={})
+        stream = client.stream_run(thread, run, cancel_on_abandon=True)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        await client.aclose()
+
+    asyncio.run(main())
+    assert server.requests["cancel_run"] == 1
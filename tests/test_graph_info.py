@@ -0,0 +1,102 @@
+import asyncio
+import os
+import stat
+import time
+
+import httpx
+import jwt
+import pytest
+
+from lmsystems.exceptions import APIError
+from lmsystems.graph_info import GraphInfoCache
+
+
+def make_token(expires_in: float) -> str:
+    return jwt.encode({"exp": int(time.time() + expires_in)}, "test-secret-" * 3, algorithm="HS256")
+
+
+def test_lookups_are_cached(server, make_client):
+    cache = GraphInfoCache()
+
+    async def main():
+        first = await make_client(graph_info_cache=cache)
+        second = await make_client(graph_info_cache=cache)
+        return first.graph_info, second.graph_info
+
+    first, second = asyncio.run(main())
+    assert first == second
+    assert server.requests["get_graph_info"] == 1
+
+
+def test_entries_expire_after_ttl(server, make_client):
+    cache = GraphInfoCache(ttl=0.05)
+
+    async def main():
+        await make_client(graph_info_cache=cache)
+        await make_client(graph_info_cache=cache)
+        await asyncio.sleep(0.1)
+        await make_client(graph_info_cache=cache)
+
+    asyncio.run(main())
+    assert server.requests["get_graph_info"] == 2
+
+
+def test_entries_round_trip_through_disk(server, make_client, tmp_path):
+    async def main():
+        await make_client(graph_info_cache=GraphInfoCache(cache_dir=str(tmp_path)))
+        # A fresh cache on the same directory stands in for a restarted process
+        return await make_client(graph_info_cache=GraphInfoCache(cache_dir=str(tmp_path)))
+
+    client = asyncio.run(main())
+    assert client.graph_info["graph_url"] == server.url
+    assert server.requests["get_graph_info"] == 1
+    [name] = os.listdir(tmp_path)
+    assert stat.S_IMODE(os.stat(tmp_path / name).st_mode) == 0o600
+    assert "test-api-key" not in name
+
+
+def test_returned_info_is_a_copy():
+    cache = GraphInfoCache()
+    cache.set("http://backend", "key", "g", {"configurables": {"configurable": {"a": 1}}})
+    cache.get("http://backend", "key", "g")["configurables"]["configurable"]["a"] = 2
+    assert cache.get("http://backend", "key", "g") == {"configurables": {"configurable": {"a": 1}}}
+
+
+def test_entries_never_outlive_their_token(tmp_path):
+    cache = GraphInfoCache(ttl=3600, cache_dir=str(tmp_path))
+    cache.set("http://backend", "key", "g", {"lgraph_api_key": make_token(10)})
+    [(expires_at, _)] = cache._entries.values()
+    assert expires_at <= time.time() + 10
+
+    cache.set("http://backend", "key", "expired", {"lgraph_api_key": make_token(-10)})
+    assert cache.get("http://backend", "key", "expired") is None
+    assert GraphInfoCache(cache_dir=str(tmp_path)).get("http://backend", "key", "expired") is None
+
+
+def test_rejected_lookup_is_not_cached(server, make_client, tmp_path):
+    cache = GraphInfoCache(cache_dir=str(tmp_path))
+    server.settings.graph_info_status = 401
+    with pytest.raises(APIError, match="Invalid API key"):
+        asyncio.run(make_client(graph_info_cache=cache))
+    server.settings.graph_info_status = 403
+    with pytest.raises(APIError, match="has not been purchased"):
+        asyncio.run(make_client(graph_info_cache=cache))
+    assert os.listdir(tmp_path) == []
+
+    server.settings.graph_info_status = 200
+    asyncio.run(make_client(graph_info_cache=cache))
+    assert server.requests["get_graph_info"] == 3
+
+
+@pytest.mark.parametrize("status", [401, 403])
+def test_graph_auth_errors_invalidate_cached_info(server, make_client, tmp_path, status):
+    cache = GraphInfoCache(cache_dir=str(tmp_path))
+    client = asyncio.run(make_client(graph_info_cache=cache))
+    assert cache.get(client.base_url, client.api_key, client.graph_name) is not None
+
+    request = httpx.Request("POST", f"{server.url}/threads")
+    error = httpx.HTTPStatusError("rejected", request=request, response=httpx.Response(status, request=request))
+    client._to_api_error("create thread", error)
+
+    assert cache.get(client.base_url, client.api_key, client.graph_name) is None
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.imports import FORBIDDEN
+
+_PROBE = """
+import sys
+import {module}
+print(*[name for name in {forbidden!r} if name in sys.modules])
+"""
+
+
+def loaded_modules(module, forbidden):
+    return subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, forbidden=forbidden)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+
+
+@pytest.mark.parametrize("module", sorted(FORBIDDEN))
+def test_entry_points_do_not_load_heavy_modules(module):
+    assert loaded_modules(module, FORBIDDEN[module]) == []
+
+
+def test_lazy_attributes_resolve():
+    code = (
+        "import sys, lmsystems\n"
+        "from lmsystems.purchased_graph import PurchasedGraph\n"
+        "assert lmsystems.PurchasedGraph is PurchasedGraph\n"
+        "from lmsystems import LmsystemsClient, SyncLmsystemsClient\n"
+        "assert LmsystemsClient.__module__ == SyncLmsystemsClient.__module__ == 'lmsystems.client'\n"
+        "assert set(lmsystems.__all__) <= set(dir(lmsystems))\n"
+        "try:\n"
+        "    lmsystems.Missing\n"
+        "except AttributeError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise SystemExit('lmsystems.Missing resolved')\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
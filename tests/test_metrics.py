@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from lmsystems.exceptions import APIError
+from lmsystems.graph_info import GraphInfoCache
+from lmsystems.metrics import (
+    ERRORS,
+    OPERATION_DURATION,
+    STREAM_BYTES,
+    STREAM_CHUNKS,
+    STREAM_DURATION,
+    STREAM_TIME_TO_FIRST_CHUNK,
+    CallbackInstrumentation,
+    InMemoryInstrumentation,
+)
+from lmsystems.transport import Transport
+
+
+def test_calls_and_invoke_record_latency(server, make_client):
+    metrics = InMemoryInstrumentation()
+
+    async def main():
+        client = await make_client(instrumentation=metrics)
+        await client.create_thread()
+        await client.invoke({"messages": []})
+
+    asyncio.run(main())
+    for operation in ("graph_info", "create_thread", "run_graph"):
+        [duration] = metrics.get(OPERATION_DURATION, graph_name="test-graph", operation=operation)
+        assert duration > 0
+    assert metrics.count(ERRORS) == 0
+
+
+def test_streams_record_throughput(server, make_client):
+    metrics = InMemoryInstrumentation()
+
+    async def main():
+        client = await make_client(instrumentation=metrics)
+        thread = await client.create_thread()
+        run = await client.create_run(thread, input={})
+        stream = client.stream_run(thread, run)
+        chunks = [chunk async for chunk in stream]
+        chunks += [chunk async for chunk in client.stream({"messages": []})]
+        return len(chunks), stream.bytes_received
+
+    total_chunks, bytes_received = asyncio.run(main())
+    assert sum(metrics.get(STREAM_CHUNKS, graph_name="test-graph")) == total_chunks
+    assert metrics.get(STREAM_BYTES)[0] == bytes_received > 0
+    assert len(metrics.get(STREAM_DURATION)) == 2
+    first_chunk, duration = metrics.get(STREAM_TIME_TO_FIRST_CHUNK)[0], metrics.get(STREAM_DURATION)[0]
+    assert 0 < first_chunk <= duration
+
+
+def test_failures_are_counted_by_error_class(server, make_client):
+    metrics = InMemoryInstrumentation()
+    server.settings.graph_info_status = 401
+    with pytest.raises(APIError):
+        asyncio.run(make_client(instrumentation=metrics))
+    assert metrics.count(ERRORS, operation="graph_info", error_class="AuthenticationError") == 1
+    assert len(metrics.get(OPERATION_DURATION, operation="graph_info")) == 1
+
+
+def test_purchased_graph_records_invoke(server):
+    from lmsystems.purchased_graph import PurchasedGraph
+
+    metrics = InMemoryInstrumentation()
+    graph = PurchasedGraph("test-graph", "test-api-key", base_url=server.url, lazy=True,
+                           graph_info_cache=GraphInfoCache(), transport=Transport(), instrumentation=metrics)
+    asyncio.run(graph.ainvoke({"messages": []}))
+    graph.invoke({"messages": []})
+    assert len(metrics.get(OPERATION_DURATION, operation="graph_info")) == 1
+    assert len(metrics.get(OPERATION_DURATION, operation="invoke")) == 2
+
+
+def test_callback_instrumentation_forwards_measurements():
+    recorded, added = [], []
+    metrics = CallbackInstrumentation(on_record=lambda *args: recorded.append(args),
+                                      on_add=lambda *args: added.append(args))
+    metrics.operation("g", "create_run", 0.5, ValueError("boom"))
+    metrics.stream("g", duration=2.0, chunks=3, time_to_first_chunk=0.1)
+
+    assert recorded == [
+        (OPERATION_DURATION, 0.5, {"graph_name": "g", "operation": "create_run"}),
+        (STREAM_TIME_TO_FIRST_CHUNK, 0.1, {"graph_name": "g"}),
+        (STREAM_DURATION, 2.0, {"graph_name": "g"}),
+        (STREAM_CHUNKS, 3, {"graph_name": "g"}),
+    ]
+    assert added == [(ERRORS, 1, {"graph_name": "g", "operation": "create_run", "error_class": "ValueError"})]
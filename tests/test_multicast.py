@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from lmsystems.exceptions import SlowConsumerError
+from lmsystems.multicast import DEFAULT_REPLAY_SIZE, MulticastStream
+
+
+async def numbers(count, gate=None):
+    for i in range(count):
+        if gate is not None:
+            await gate.wait()
+        yield i
+
+
+def test_replay_window_is_bounded_by_default():
+    async def main():
+        shared = MulticastStream(numbers(DEFAULT_REPLAY_SIZE + 10))
+        async for _ in shared.subscribe():
+            pass
+        return shared.chunks
+
+    assert asyncio.run(main()) == list(range(10, DEFAULT_REPLAY_SIZE + 10))
+
+
+def test_late_subscriber_gets_replay():
+    async def main():
+        shared = MulticastStream(numbers(5), replay_size=3)
+        first = [chunk async for chunk in shared.subscribe()]
+        late = [chunk async for chunk in shared.subscribe()]
+        return first, late
+
+    assert asyncio.run(main()) == ([0, 1, 2, 3, 4], [2, 3, 4])
+
+
+def test_abandoned_blocking_subscriber_is_disconnected():
+    async def main():
+        shared = MulticastStream(numbers(10), buffer_size=1, policy="block", block_timeout=0.05)
+        abandoned = shared.subscribe()
+        reader = shared.subscribe(buffer_size=10, policy="drop")
+        received = [chunk async for chunk in reader]
+        with pytest.raises(SlowConsumerError):
+            async for _ in abandoned:
+                pass
+        return received, shared.subscribers
+
+    received, subscribers = asyncio.run(main())
+    assert received == list(range(10))
+    assert subscribers == 0
+
+
+def test_block_timeout_override_per_subscription():
+    async def main():
+        shared = MulticastStream(numbers(3), buffer_size=1, policy="block", block_timeout=0.01)
+        patient = shared.subscribe(block_timeout=None)
+        await asyncio.sleep(0.05)
+        return [chunk async for chunk in patient]
+
+    assert asyncio.run(main()) == [0, 1, 2]
+
+
+def test_disconnect_policy():
+    async def main():
+        gate = asyncio.Event()
+        shared = MulticastStream(numbers(5, gate), buffer_size=2, policy="disconnect")
+        slow = shared.subscribe()
+        gate.set()
+        await asyncio.sleep(0.01)
+        return [chunk async for chunk in slow]
+
+    with pytest.raises(SlowConsumerError):
+        asyncio.run(main())
@@ -0,0 +1,99 @@
+from lmsystems.offload import REF_KEY, REFRESH_FRACTION, StateOffload, content_hash, is_reference, resolve_references
+
+
+class Item:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeStore:
+    def __init__(self):
+        self.items = {}
+        self.puts = 0
+
+    def put_item(self, namespace, key, value, index=None, ttl=None):
+        self.puts += 1
+        self.items[(tuple(namespace), key)] = Item(value)
+
+    def get(self, namespace, key):
+        return self.items.get((tuple(namespace), key))
+
+
+def test_large_values_are_uploaded_once_and_referenced():
+    store = FakeStore()
+    offload = StateOffload(min_bytes=100)
+    values = {"doc": "x" * 500, "small": 1}
+
+    state = offload.offload(values, store)
+    assert is_reference(state["doc"]) and state["small"] == 1
+    assert state["doc"][REF_KEY]["key"] == content_hash(values["doc"])[0]
+    assert offload.offload(values, store) == state
+    assert store.puts == 1
+    assert resolve_references(state, store) == values
+
+
+def test_values_are_uploaded_again_after_half_the_ttl():
+    store = FakeStore()
+    offload = StateOffload(min_bytes=0, ttl=10)
+    state = offload.offload({"doc": "x"}, store)
+    assert offload.fresh(state)
+
+    # Pretend the upload happened six minutes ago
+    digest = state["doc"][REF_KEY]["key"]
+    offload.stored[digest] -= 6 * 60
+    assert not offload.fresh(state)
+    offload.offload({"doc": "x"}, store)
+    assert store.puts == 2
+    assert offload.fresh(state)
+
+
+def test_values_are_uploaded_again_before_the_store_expires_them():
+    store = FakeStore()
+    offload = StateOffload(min_bytes=0, ttl=10)
+    assert offload.refresh_after == 10 * 60 * REFRESH_FRACTION < 10 * 60
+    state = offload.offload({"doc": "x"}, store)
+    digest = state["doc"][REF_KEY]["key"]
+
+    offload.stored[digest] -= offload.refresh_after - 1
+    offload.offload({"doc": "x"}, store)
+    assert store.puts == 1
+
+    # Past the refresh point but well inside the ten minute TTL
+    offload.stored[digest] -= 2
+    offload.offload({"doc": "x"}, store)
+    assert store.puts == 2
+
+
+def test_without_ttl_records_never_expire():
+    store = FakeStore()
+    offload = StateOffload(min_bytes=0)
+    state = offload.offload({"doc": "x"}, store)
+    offload.stored[state["doc"][REF_KEY]["key"]] -= 10 ** 6
+    assert offload.fresh(state)
+    offload.offload({"doc": "x"}, store)
+    assert store.puts == 1
+
+
+def test_purchased_graph_detects_in_place_changes():
+    from lmsystems.purchased_graph import PurchasedGraph
+
+    store = FakeStore()
+
+    class Remote:
+        class sync_client:
+            pass
+
+    Remote.sync_client.store = store
+    graph = PurchasedGraph("g", "key", lazy=True, default_state_values={"doc": "a" * 200},
+                           offload=StateOffload(min_bytes=100))
+    graph._remote_graph = Remote()
+
+    graph._offload_defaults()
+    first = graph._defaults()
+    graph._offload_defaults()
+    assert store.puts == 1 and graph._defaults() == first
+
+    graph.default_state_values["doc"] = "b" * 200
+    graph._offload_defaults()
+    assert store.puts == 2
+    assert resolve_references(graph._defaults(), store) == {"doc": "b" * 200}
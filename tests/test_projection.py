@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from lmsystems.projection import ALWAYS_KEPT, output_key_set, project_chunk, project_part, project_raw
+
+KEYS = output_key_set(["messages", "answer"])
+
+VALUES_PAYLOADS = [
+    {"messages": [{"content": "hi"}], "scratch": {"big": list(range(50))}},
+    {"answer": 'quote " and brace } and bracket ]', "other": "{[\"nested\"]}"},
+    {"answer": {"deep": [[{"x": [1, {"y": []}]}]]}, "tail": [[[]]]},
+    {"answer": None, "messages": True, "n": -1.5e3, "empty": {}},
+    {"été": 1, "answer": "café ☃", "__interrupt__": [{"value": "ask"}]},
+    {"scratch": 1},
+    {},
+]
+
+UPDATES_PAYLOADS = [
+    {"agent": {"messages": [{"content": "hi"}], "scratch": "x"}, "tools": {"answer": 42, "log": ["}"]}},
+    {"agent": None, "tools": ["not", "a", "dict"], "final": {"answer": {"a": [1, 2]}}},
+    {"__interrupt__": [{"value": "ask", "resumable": True}]},
+    {"agent": {}},
+]
+
+
+def dump(payload, **kwargs):
+    return json.dumps(payload, **kwargs).encode()
+
+
+@pytest.mark.parametrize("payload", VALUES_PAYLOADS)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_raw_values_match_decoded_projection(payload, indent):
+    raw = dump(payload, indent=indent)
+    assert project_raw(raw, "values", KEYS) == project_part("values", json.loads(raw), KEYS)
+
+
+@pytest.mark.parametrize("payload", UPDATES_PAYLOADS)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_raw_updates_match_decoded_projection(payload, indent):
+    raw = dump(payload, indent=indent)
+    assert project_raw(raw, "updates", KEYS) == project_part("updates", json.loads(raw), KEYS)
+
+
+def test_escaped_keys_are_decoded():
+    raw = b'{"\\u0061nswer": 1, "messages\\"": 2}'
+    assert project_raw(raw, "values", KEYS) == {"answer": 1}
+
+
+def test_missing_keys_are_left_out():
+    assert project_raw(dump({"scratch": 1}), "values", KEYS) == {}
+    assert project_part("values", {"scratch": 1}, KEYS) == {}
+    assert project_part("updates", {"agent": {"scratch": 1}}, KEYS) == {"agent": {}}
+
+
+@pytest.mark.parametrize("payload", [[1, {"answer": 2}], "text", 3, None, True])
+def test_non_dict_payloads_are_returned_whole(payload):
+    raw = dump(payload)
+    assert project_raw(raw, "values", KEYS) == payload
+    assert project_raw(b"  " + raw, "updates", KEYS) == payload
+    assert project_part("values", payload, KEYS) == payload
+
+
+def test_nested_updates_keep_node_names_and_non_dict_updates():
+    data = {"agent": {"answer": 1, "scratch": 2}, "tools": None, "log": ["x"]}
+    assert project_part("updates", data, KEYS) == {"agent": {"answer": 1}, "tools": None, "log": ["x"]}
+    # Only the top level of each node's update is projected
+    nested = {"agent": {"answer": {"scratch": 1}}}
+    assert project_part("updates", nested, KEYS) == nested
+
+
+def test_other_modes_are_not_projected():
+    data = {"scratch": 1}
+    assert project_part("messages", data, KEYS) is data
+    assert project_part("custom", data, KEYS) is data
+
+
+def test_interrupts_are_always_kept():
+    assert ALWAYS_KEPT <= KEYS
+    assert output_key_set(None) is None
+    assert output_key_set("answer") == frozenset({"answer"}) | ALWAYS_KEPT
+
+
+@pytest.mark.parametrize("raw", [b'{"answer": "open', b'{"answer": [1, 2', b'{"answer" 1}', b'{"a": 1 "b": 2}', b"{1: 2}"])
+def test_malformed_payloads_raise(raw):
+    with pytest.raises(ValueError):
+        project_raw(raw, "values", KEYS)
+
+
+def test_project_chunk_shapes():
+    values = {"answer": 1, "scratch": 2}
+    assert project_chunk(values, KEYS, "values") == {"answer": 1}
+    # RemoteGraph defaults to updates
+    assert project_chunk({"agent": values}, KEYS, None) == {"agent": {"answer": 1}}
+    assert project_chunk(("values", values), KEYS, ["values"]) == ("values", {"answer": 1})
+    assert project_chunk((("sub",), "values", values), KEYS, ["values"]) == (("sub",), "values", {"answer": 1})
+    assert project_chunk((("sub",), values), KEYS, "values", subgraphs=True) == (("sub",), {"answer": 1})
+    v2 = {"type": "values", "ns": (), "data": values}
+    assert project_chunk(v2, KEYS, "values", version="v2") == {"type": "values", "ns": (), "data": {"answer": 1}}
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+
+import pytest
+
+from lmsystems.exceptions import APIError
+from lmsystems.graph_info import GraphInfoCache
+from lmsystems.purchased_graph import PurchasedGraph
+from lmsystems.transport import Transport
+
+
+def make_graph(server, **kwargs):
+    kwargs.setdefault("lazy", True)
+    return PurchasedGraph("test-graph", "test-api-key", base_url=server.url,
+                          graph_info_cache=GraphInfoCache(), transport=Transport(), **kwargs)
+
+
+def test_lazy_graph_does_no_io_until_used(server):
+    graph = make_graph(server)
+    assert server.requests.get("get_graph_info", 0) == 0
+    assert graph.remote_graph is graph.remote_graph
+    assert server.requests["get_graph_info"] == 1
+
+
+def test_concurrent_async_first_calls_share_one_resolution(server):
+    server.settings.graph_info_latency = 0.05
+    graph = make_graph(server)
+
+    async def main():
+        return await asyncio.gather(*(graph._aresolve() for _ in range(5)))
+
+    remote_graphs = asyncio.run(main())
+    assert all(remote_graph is remote_graphs[0] for remote_graph in remote_graphs)
+    assert server.requests["get_graph_info"] == 1
+
+
+def test_concurrent_sync_first_calls_share_one_resolution(server):
+    server.settings.graph_info_latency = 0.05
+    graph = make_graph(server)
+    resolved = []
+    threads = [threading.Thread(target=lambda: resolved.append(graph.remote_graph)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(resolved) == 5 and all(remote_graph is resolved[0] for remote_graph in resolved)
+    assert server.requests["get_graph_info"] == 1
+
+
+def test_failed_async_resolution_is_retried(server):
+    server.settings.graph_info_status = 404
+    graph = make_graph(server)
+
+    async def main():
+        with pytest.raises(APIError, match="not found"):
+            await graph._aresolve()
+        server.settings.graph_info_status = 200
+        return await graph._aresolve()
+
+    assert asyncio.run(main()) is graph.remote_graph
+    assert server.requests["get_graph_info"] == 2
+
+
+def test_failed_sync_resolution_is_retried(server):
+    server.settings.graph_info_status = 404
+    graph = make_graph(server)
+    with pytest.raises(APIError, match="not found"):
+        graph.remote_graph
+    server.settings.graph_info_status = 200
+    assert graph.remote_graph is not None
+    assert server.requests["get_graph_info"] == 2
+
+
+def test_acreate_resolves_without_blocking(server):
+    async def main():
+        return await PurchasedGraph.acreate("test-graph", "test-api-key", base_url=server.url,
+                                            graph_info_cache=GraphInfoCache(), transport=Transport())
+
+    graph = asyncio.run(main())
+    assert graph.graph_info["graph_url"] == server.url
+    assert server.requests["get_graph_info"] == 1
@@ -0,0 +1,44 @@
+import asyncio
+
+from lmsystems.exceptions import APIError
+from lmsystems.ratelimit import AdaptiveRateLimiter, RetryPolicy
+
+
+def test_should_retry_respects_attempts_and_idempotency():
+    policy = RetryPolicy(max_attempts=3)
+    unavailable = APIError("down", status_code=503, retryable=True)
+    throttled = APIError("slow down", status_code=429, retryable=True)
+    rejected = APIError("bad request", status_code=400)
+
+    assert policy.should_retry(1, unavailable, idempotent=True)
+    assert not policy.should_retry(1, unavailable, idempotent=False)
+    assert policy.should_retry(1, throttled, idempotent=False)
+    assert not policy.should_retry(1, rejected, idempotent=True)
+    assert not policy.should_retry(3, unavailable, idempotent=True)
+
+
+def test_delay_is_capped_and_honours_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    for attempt in range(1, 10):
+        assert 0 <= policy.delay(attempt) <= min(4.0, 2 ** (attempt - 1))
+    assert policy.delay(1, retry_after=3.0) >= 3.0
+    assert policy.delay(1, retry_after=60.0) == 4.0
+
+
+def test_limiter_backs_off_and_recovers():
+    limiter = AdaptiveRateLimiter(rate=10.0, min_rate=1.0, increase=1.0)
+    limiter.on_throttle()
+    assert limiter.rate == 5.0
+    limiter.on_success()
+    assert limiter.rate == 6.0
+    for _ in range(100):
+        limiter.on_throttle()
+    assert limiter.rate == 1.0
+
+
+def test_limiter_burst_then_waits():
+    limiter = AdaptiveRateLimiter(rate=100.0, burst=2)
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() > 0.0
+    asyncio.run(limiter.acquire())
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from lmsystems.exceptions import GraphError
+from lmsystems.graph_info import GraphInfoCache
+from lmsystems.registry import GraphRegistry
+from lmsystems.transport import Transport
+
+
+def make_registry(server, graph_names, **transport_kwargs):
+    return GraphRegistry(graph_names, "test-api-key", server.url,
+                         graph_info_cache=GraphInfoCache(), transport=Transport(**transport_kwargs))
+
+
+def test_warm_up_fetches_each_graph_once(server):
+    registry = make_registry(server, ["a", "b", "c", "a"])
+    timings = asyncio.run(registry.warm_up())
+
+    assert sorted(timings) == ["a", "b", "c"]
+    assert all(timing.error is None for timing in timings.values())
+    assert server.requests["get_graph_info"] == 3
+    assert server.requests["ok"] == 3
+
+    # Handles are built from the warm state without further lookups
+    assert registry.client("b").graph_info["graph_name"] == "b"
+    assert registry.purchased_graph("c").graph_info["graph_name"] == "c"
+    asyncio.run(registry.warm_up())
+    assert server.requests["get_graph_info"] == 3
+
+
+def test_one_failing_graph_does_not_break_the_others(server):
+    server.settings.missing_graphs = ("broken",)
+    registry = make_registry(server, ["a", "broken", "b"])
+    timings = asyncio.run(registry.warm_up())
+
+    assert "not found" in timings["broken"].error
+    assert timings["a"].error is None and timings["b"].error is None
+    assert registry.client("a").graph_info["graph_name"] == "a"
+    with pytest.raises(GraphError, match="failed to warm up"):
+        registry.client("broken")
+    assert registry.slowest(1)[0].graph_name in ("a", "broken", "b")
+
+
+def test_raise_on_error(server):
+    server.settings.missing_graphs = ("broken",)
+    registry = make_registry(server, ["a", "broken"])
+    with pytest.raises(GraphError, match="not found"):
+        asyncio.run(registry.warm_up(raise_on_error=True))
+
+
+def test_failed_preconnect_is_ignored(server):
+    # Without connection retries the refused connection fails straight away
+    registry = make_registry(server, ["a"], retries=0)
+
+    async def main():
+        await registry._preconnect({"graph_url": "http://127.0.0.1:1", "lgraph_api_key": "key"})
+        return await registry.warm_up()
+
+    assert asyncio.run(main())["a"].error is None
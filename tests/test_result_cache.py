@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+from lmsystems.result_cache import MemoryResultCache, SingleFlight, cacheable_config, make_cache_key
+
+
+def test_cache_key_ignores_dict_order():
+    first = make_cache_key("graph", None, {"configurable": {"a": 1, "b": 2}}, {"x": [1, 2]})
+    second = make_cache_key("graph", None, {"configurable": {"b": 2, "a": 1}}, {"x": [1, 2]})
+    assert first == second
+    assert first != make_cache_key("graph", None, {"configurable": {"a": 1, "b": 2}}, {"x": [2, 1]})
+    assert first != make_cache_key("other", None, {"configurable": {"a": 1, "b": 2}}, {"x": [1, 2]})
+
+
+def test_cacheable_config_drops_internal_entries():
+    config = {"configurable": {"model": "m", "__pregel_send": object()}, "tags": ["b", "a"], "callbacks": []}
+    assert cacheable_config(config) == {"configurable": {"model": "m"}, "tags": ["a", "b"]}
+    assert cacheable_config(None) is None
+
+
+def test_memory_cache_returns_copies_and_evicts():
+    cache = MemoryResultCache(maxsize=2)
+    cache.set("a", {"n": 1})
+    cache.get("a")["n"] = 2
+    assert cache.get("a") == {"n": 1}
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+
+def test_single_flight_coalesces_async_calls():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": 1}
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == [{"value": 1}] * 5
+    assert calls == 1
+
+
+def test_single_flight_shares_errors():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(main()))
+
+
+def test_single_flight_coalesces_threads():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(1)
+        return 7
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do_sync("k", work)))
+    leader.start()
+    started.wait(1)
+    followers = [threading.Thread(target=lambda: results.append(flight.do_sync("k", work))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    # Give the followers time to find the call in flight before it finishes
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(1)
+    assert results == [7] * 4
+    assert len(calls) == 1
@@ -0,0 +1,53 @@
+from lmsystems.run_template import RunTemplate, merge_config, without_stream_kwargs
+
+
+def test_merge_config_copies_configurable():
+    stored = {"configurable": {"model": "a"}, "tags": ["x"]}
+    merged = merge_config(stored, None)
+    merged["configurable"]["model"] = "b"
+    assert stored["configurable"]["model"] == "a"
+
+    merged = merge_config(stored, {"configurable": {"temperature": 0}})
+    assert merged["configurable"] == {"model": "a", "temperature": 0}
+    assert stored == {"configurable": {"model": "a"}, "tags": ["x"]}
+
+
+def test_config_for_never_shares_the_template_configurable():
+    template = RunTemplate("assistant", {"configurable": {"model": "a"}})
+    for config in (None, {}, {"tags": ["t"]}, {"configurable": {"extra": 1}}):
+        merged = template.config_for(config)
+        merged["configurable"]["model"] = "changed"
+    assert template.config == {"configurable": {"model": "a"}}
+
+
+def test_bind_layers_run_values():
+    template = RunTemplate("assistant", {"configurable": {"model": "a"}}, stream_mode="values", input={"x": 1})
+    run_kwargs = template.bind(config={"configurable": {"model": "b"}}, input={"y": 2})
+    assert run_kwargs == {
+        "assistant_id": "assistant",
+        "config": {"configurable": {"model": "b"}},
+        "input": {"x": 1, "y": 2},
+        "stream_mode": "values",
+    }
+    assert template.bind(assistant_id="other")["assistant_id"] == "other"
+
+
+def test_without_stream_kwargs():
+    run_kwargs = {"assistant_id": "a", "stream_mode": "values", "stream_subgraphs": True}
+    assert without_stream_kwargs(run_kwargs) == {"assistant_id": "a"}
+    plain = {"assistant_id": "a"}
+    assert without_stream_kwargs(plain) is plain
+
+
+def test_invoke_with_stream_template(server, make_client):
+    import asyncio
+
+    async def main():
+        client = await make_client()
+        template = client.template(stream_mode=["values", "updates"])
+        try:
+            return await client.invoke({"n": 1}, template=template)
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(main())["step"] == 2
@@ -0,0 +1,72 @@
+from lmsystems.sse import SSEDecoder, StreamEvent
+
+
+def feed_all(decoder, chunks):
+    events = []
+    for chunk in chunks:
+        events.extend(decoder.feed(chunk))
+    return events
+
+
+def test_lf_separated_events():
+    events = SSEDecoder().feed(b'event: values\ndata: {"a":1}\nid: 1\n\n')
+    assert events == [StreamEvent("values", {"a": 1}, "1")]
+
+
+def test_crlf_separated_events():
+    events = SSEDecoder().feed(b'event: values\r\ndata: {"a":1}\r\nid: 1\r\n\r\n')
+    assert events == [StreamEvent("values", {"a": 1}, "1")]
+
+
+def test_crlf_split_across_chunks():
+    events = feed_all(SSEDecoder(), [b"event: values\r", b'\ndata: {"a":1}\r\nid: 1\r\n\r\n'])
+    assert events == [StreamEvent("values", {"a": 1}, "1")]
+
+
+def test_crlf_split_at_every_byte():
+    raw = b'event: metadata\r\ndata: {"run_id":"r1"}\r\nid: 0\r\n\r\nevent: values\r\ndata: {"a":1}\r\nid: 1\r\n\r\n'
+    decoder = SSEDecoder()
+    events = feed_all(decoder, [raw[i:i + 1] for i in range(len(raw))])
+    assert events == [
+        StreamEvent("metadata", {"run_id": "r1"}, "0"),
+        StreamEvent("values", {"a": 1}, "1"),
+    ]
+    assert events[1].run_id == "r1"
+    assert decoder.bytes_received == len(raw)
+
+
+def test_bare_cr_line_endings():
+    # A trailing b"\r" is held back until the next read shows it isn't half of b"\r\n"
+    decoder = SSEDecoder()
+    assert decoder.feed(b'event: values\rdata: {"a":1}\r\r') == []
+    assert decoder.feed(b"event: end\r\r") == [StreamEvent("values", {"a": 1})]
+
+
+def test_comments_and_multiline_data():
+    events = SSEDecoder().feed(b': ping\n\nevent: custom\ndata: [1,\ndata: 2]\n\n')
+    assert events == [StreamEvent("custom", [1, 2])]
+
+
+def test_reset_drops_partial_event():
+    decoder = SSEDecoder()
+    assert decoder.feed(b"event: values\r") == []
+    decoder.reset()
+    assert decoder.feed(b'\nevent: updates\ndata: {}\n\n') == [StreamEvent("updates", {})]
+
+
+def test_output_keys_project_values():
+    decoder = SSEDecoder(output_keys=frozenset({"a"}))
+    events = decoder.feed(b'event: values\r\ndata: {"a":1,"b":[1,2,{"c":"}"}]}\r\n\r\n')
+    assert events == [StreamEvent("values", {"a": 1})]
+
+
+def test_stream_event_behaves_like_stream_part():
+    from langgraph_sdk.schema import StreamPart
+
+    event = StreamEvent("values", {"a": 1}, "7", run_id="r1")
+    part = StreamPart("values", {"a": 1}, "7")
+    assert (event[0], event[1], event[2], event[-1]) == (part[0], part[1], part[2], part[-1])
+    assert event[:2] == part[:2]
+    assert len(event) == len(part)
+    assert event == part and part == event
+    assert event.event == part.event and event.data["a"] == 1
@@ -0,0 +1,157 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from lmsystems.purchased_graph import PurchasedGraph
+from lmsystems.state import StateSnapshotCache
+
+THREAD = {"configurable": {"thread_id": "t1"}}
+
+
+@dataclass
+class Snapshot:
+    config: dict
+    values: dict
+
+
+def snapshot(n):
+    return Snapshot({"configurable": {"thread_id": "t1", "checkpoint_ns": "", "checkpoint_id": f"c{n}"}}, {"step": n})
+
+
+class FakeRemoteGraph:
+    """Stands in for RemoteGraph over a thread with ``size`` checkpoints, newest first."""
+
+    config = None
+
+    def __init__(self, size=0):
+        self.history = [snapshot(n) for n in reversed(range(size))]
+        self.state_calls = 0
+        self.history_calls = []
+
+    def _state(self, config):
+        self.state_calls += 1
+        checkpoint_id = config["configurable"].get("checkpoint_id")
+        return next(s for s in self.history if s.config["configurable"]["checkpoint_id"] == checkpoint_id)
+
+    def _page(self, before, limit):
+        self.history_calls.append((before and before["configurable"]["checkpoint_id"], limit))
+        start = 0
+        if before is not None:
+            start = next(i for i, s in enumerate(self.history) if s.config == before) + 1
+        return self.history[start:start + limit]
+
+    def get_state(self, config, subgraphs=False):
+        return self._state(config)
+
+    async def aget_state(self, config, subgraphs=False):
+        return self._state(config)
+
+    def get_state_history(self, config, filter=None, before=None, limit=None):
+        yield from self._page(before, limit)
+
+    async def aget_state_history(self, config, filter=None, before=None, limit=None):
+        for s in self._page(before, limit):
+            yield s
+
+
+def make_graph(size=0, **kwargs):
+    graph = PurchasedGraph("g", "key", lazy=True, **kwargs)
+    graph._remote_graph = FakeRemoteGraph(size)
+    return graph
+
+
+def checkpoint(n):
+    return {"configurable": {"thread_id": "t1", "checkpoint_id": f"c{n}"}}
+
+
+def test_snapshots_are_cached_by_checkpoint():
+    graph = make_graph(3)
+    first = graph.get_state(checkpoint(1))
+    assert graph.get_state(checkpoint(1)) == first
+    assert asyncio.run(graph.aget_state(checkpoint(1))) == first
+    assert graph._remote_graph.state_calls == 1
+    assert (graph.state_cache.hits, graph.state_cache.misses) == (2, 1)
+
+    # Subgraph snapshots are keyed separately
+    graph.get_state(checkpoint(1), subgraphs=True)
+    assert graph._remote_graph.state_calls == 2
+
+
+def test_latest_state_is_not_cached():
+    graph = make_graph(3)
+    graph._remote_graph._state = lambda config: snapshot(2)
+    graph.get_state(THREAD)
+    graph.get_state(THREAD)
+    assert graph.state_cache.hits == 0 and graph.state_cache.misses == 0
+
+
+def test_cached_snapshots_are_copies_and_bounded():
+    cache = StateSnapshotCache(maxsize=2)
+    original = snapshot(0)
+    cache.set(original)
+    original.values["step"] = 99
+    cache.get(checkpoint(0)).values["step"] = 42
+    assert cache.get(checkpoint(0)).values == {"step": 0}
+
+    cache.set(snapshot(1))
+    cache.get(checkpoint(0))
+    cache.set(snapshot(2))
+    # The least recently used checkpoint (c1) was evicted
+    assert len(cache) == 2 and cache.get(checkpoint(1)) is None
+    assert cache.get(checkpoint(0)) is not None
+
+
+def test_history_is_paged_with_before_cursor():
+    graph = make_graph(7)
+    history = graph.get_state_history(THREAD, page_size=3, prefetch=False)
+    assert graph._remote_graph.history_calls == []
+
+    steps = [s.values["step"] for s in history]
+    assert steps == [6, 5, 4, 3, 2, 1, 0]
+    assert graph._remote_graph.history_calls == [(None, 3), ("c4", 3), ("c1", 3)]
+    assert history.pages == 3
+    # Every fetched snapshot is now served from the cache
+    graph.get_state(checkpoint(3))
+    assert graph._remote_graph.state_calls == 0
+
+
+def test_history_stops_at_limit():
+    graph = make_graph(10)
+    steps = [s.values["step"] for s in graph.get_state_history(THREAD, limit=5, page_size=3)]
+    assert steps == [9, 8, 7, 6, 5]
+    # The last page only asks for what is left of the limit
+    assert graph._remote_graph.history_calls == [(None, 3), ("c7", 2)]
+
+
+def test_history_starts_before_the_given_checkpoint():
+    graph = make_graph(5)
+    before = snapshot(3).config
+    steps = [s.values["step"] for s in graph.get_state_history(THREAD, before=before, page_size=2, prefetch=False)]
+    assert steps == [2, 1, 0]
+    assert graph._remote_graph.history_calls[0] == ("c3", 2)
+
+
+def test_async_history_pages_and_prefetches():
+    graph = make_graph(5)
+
+    async def main():
+        return [s.values["step"] async for s in graph.aget_state_history(THREAD, limit=4, page_size=2)]
+
+    assert asyncio.run(main()) == [4, 3, 2, 1]
+    assert graph._remote_graph.history_calls == [(None, 2), ("c3", 2)]
+
+
+def test_async_history_can_still_be_awaited():
+    graph = make_graph(3)
+
+    async def main():
+        history = await graph.aget_state_history(THREAD, page_size=2)
+        return [s.values["step"] async for s in history]
+
+    assert asyncio.run(main()) == [2, 1, 0]
+
+
+def test_invalid_page_size():
+    with pytest.raises(ValueError):
+        make_graph().get_state_history(THREAD, page_size=0)
@@ -0,0 +1,64 @@
+import asyncio
+
+from lmsystems.sse import StreamEvent
+from lmsystems.stream import SEEN_WINDOW, _ResumeState
+
+
+def test_replayed_events_are_dropped():
+    state = _ResumeState(client=None, max_reconnects=3)
+    assert state.accept(StreamEvent("values", {}, "1"))
+    assert state.accept(StreamEvent("values", {}, "2"))
+    assert not state.accept(StreamEvent("values", {}, "2"))
+    assert state.duplicates == 1
+    assert state.last_event_id == "2"
+
+
+def test_seen_ids_are_bounded():
+    state = _ResumeState(client=None, max_reconnects=3)
+    for i in range(SEEN_WINDOW * 3):
+        assert state.accept(StreamEvent("values", {}, str(i)))
+    assert len(state._seen) == SEEN_WINDOW
+    assert not state.accept(StreamEvent("values", {}, str(SEEN_WINDOW * 3 - 1)))
+    assert state.chunks == SEEN_WINDOW * 3
+
+
+def stream_all(server, make_client, **kwargs):
+    async def main():
+        client = await make_client()
+        server.reset_counts()
+        stream = client.stream({"messages": []}, **kwargs)
+        chunks = [chunk async for chunk in stream]
+        return stream, chunks
+
+    return asyncio.run(main())
+
+
+def test_stateless_stream_is_one_request(server, make_client):
+    stream, chunks = stream_all(server, make_client, stream_mode="values", cancel_on_abandon=True)
+
+    assert server.requests == {"stream_run": 1}
+    assert server.paths["stream_run"] == "/runs/stream"
+    body = server.bodies["stream_run"]
+    assert body["input"] == {"messages": []}
+    assert body["assistant_id"] == "benchmark-assistant"
+    assert body["config"]["configurable"]["model"] == "benchmark"
+    assert body["on_disconnect"] == "cancel"
+    assert "if_not_exists" not in body
+    assert [chunk.event for chunk in chunks] == ["metadata"] + ["values"] * server.settings.chunks
+    assert stream.run_id == chunks[0].data["run_id"]
+
+
+def test_stream_on_thread_creates_it_in_the_same_request(server, make_client):
+    stream, chunks = stream_all(server, make_client, thread="thread-1")
+
+    assert server.requests == {"stream_run": 1}
+    assert server.paths["stream_run"] == "/threads/thread-1/runs/stream"
+    body = server.bodies["stream_run"]
+    assert body["if_not_exists"] == "create"
+    assert "on_disconnect" not in body
+    assert (stream.thread_id, stream.run_id) == ("thread-1", chunks[0].data["run_id"])
+
+
+def test_stateless_stream_leaves_disconnect_to_the_server_by_default(server, make_client):
+    stream_all(server, make_client)
+    assert "on_disconnect" not in server.bodies["stream_run"]
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from lmsystems.exceptions import APIError
+from lmsystems.threads import MANAGED_METADATA_KEY, OWNER_METADATA_KEY, ThreadManager
+
+
+class FakeThreads:
+    def __init__(self):
+        self.threads = {}
+        self.deleted = []
+        self.created = 0
+
+    async def create(self, metadata=None, **kwargs):
+        self.created += 1
+        thread_id = f"t{self.created}"
+        self.threads[thread_id] = {
+            "thread_id": thread_id,
+            "metadata": dict(metadata or {}),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        return self.threads[thread_id]
+
+    async def delete(self, thread_id):
+        self.deleted.append(thread_id)
+        self.threads.pop(thread_id, None)
+
+    async def search(self, metadata=None, limit=10, offset=0, sort_by=None, sort_order=None):
+        matches = [
+            t for t in self.threads.values()
+            if all(t["metadata"].get(k) == v for k, v in (metadata or {}).items())
+        ]
+        matches.sort(key=lambda t: t["updated_at"])
+        return matches[offset:offset + limit]
+
+    def age(self, thread_id, seconds):
+        updated = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+        self.threads[thread_id]["updated_at"] = updated.isoformat()
+
+
+class FakeClient:
+    graph_name = "graph"
+
+    def __init__(self, threads):
+        self.client = type("LangGraph", (), {"threads": threads})()
+
+    def _get_thread_id(self, thread):
+        return thread["thread_id"]
+
+    async def create_thread(self, **kwargs):
+        return await self.client.threads.create(**kwargs)
+
+    async def _call(self, action, func, *, idempotent):
+        try:
+            return await func()
+        except Exception as e:
+            raise APIError.from_exception(f"Failed to {action}", e) from e
+
+
+def test_cleanup_only_sweeps_own_threads():
+    async def main():
+        threads = FakeThreads()
+        mine = ThreadManager(FakeClient(threads), pool_size=2, owner="worker-1")
+        theirs = ThreadManager(FakeClient(threads), pool_size=2, owner="worker-2")
+        await mine.start()
+        await theirs.start()
+        session_thread = await mine.for_session("user")
+        stale = await mine._create()
+        for thread_id in threads.threads:
+            threads.age(thread_id, 7200)
+
+        deleted = await mine.cleanup(older_than=3600)
+        assert deleted == 1
+        assert threads.deleted == [stale["thread_id"]]
+        # The other worker's pool and this worker's pool and sessions survive
+        assert all(t["thread_id"] in threads.threads for t in theirs._pool)
+        assert session_thread["thread_id"] in threads.threads
+        assert stale["metadata"][MANAGED_METADATA_KEY] == "graph"
+        assert stale["metadata"][OWNER_METADATA_KEY] == "worker-1"
+        await mine.aclose()
+        await theirs.aclose()
+
+    asyncio.run(main())
+
+
+def test_sessions_expire_and_are_deleted():
+    async def main():
+        threads = FakeThreads()
+        manager = ThreadManager(FakeClient(threads), pool_size=0, max_sessions=2)
+        first = await manager.for_session("a")
+        assert await manager.for_session("a") is first
+        await manager.for_session("b")
+        await manager.for_session("c")
+        assert manager.sessions == 2
+        assert await manager.cleanup() == 1
+        assert threads.deleted == [first["thread_id"]]
+
+    asyncio.run(main())
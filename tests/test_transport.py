@@ -0,0 +1,66 @@
+import asyncio
+
+from lmsystems.graph_info import GraphInfoCache
+from lmsystems.transport import Transport
+
+
+def test_clients_are_reused_per_deployment_and_key():
+    transport = Transport()
+    client = transport.get_client("http://deployment/", "key-1")
+    assert transport.get_client("http://deployment", "key-1") is client
+    assert transport.get_client("http://deployment", "key-2") is not client
+    assert transport.get_sync_client("http://deployment", "key-1") is transport.get_sync_client("http://deployment", "key-1")
+
+
+def test_refreshed_credentials_do_not_accumulate_clients():
+    transport = Transport(max_clients=4)
+    for refresh in range(100):
+        transport.get_client("http://deployment", f"key-{refresh}")
+        transport.get_sync_client("http://deployment", f"key-{refresh}")
+    assert len(transport._clients) == 4
+    assert len(transport._sync_clients) == 4
+
+
+def test_recently_used_clients_are_kept():
+    transport = Transport(max_clients=2)
+    first = transport.get_client("http://a", "key")
+    transport.get_client("http://b", "key")
+    assert transport.get_client("http://a", "key") is first
+    transport.get_client("http://c", "key")
+    assert transport.get_client("http://a", "key") is first
+    assert ("http://b", "key") not in transport._clients
+
+
+def test_clients_keep_default_sdk_headers():
+    import langgraph_sdk
+
+    transport = Transport()
+    headers = transport.get_client("http://deployment", "key-1").http.client.headers
+    assert headers["x-api-key"] == "key-1"
+    assert headers["user-agent"] == f"langgraph-sdk-py/{langgraph_sdk.__version__}"
+    assert transport.get_sync_client("http://deployment", "key-1").http.client.headers["user-agent"] == headers["user-agent"]
+
+
+def test_shared_transport_works_across_event_loops(server, make_client):
+    transport = Transport()
+
+    async def create_thread():
+        client = await make_client(transport=transport)
+        return await client.create_thread()
+
+    first = asyncio.run(create_thread())
+    second = asyncio.run(create_thread())
+    assert first["thread_id"] != second["thread_id"]
+    assert len(transport._async_pool._pools) == 1
+
+
+def test_purchased_graph_works_across_event_loops(server):
+    from lmsystems.purchased_graph import PurchasedGraph
+
+    transport = Transport()
+    graph = asyncio.run(PurchasedGraph.acreate(
+        "test-graph", "test-api-key", base_url=server.url,
+        graph_info_cache=GraphInfoCache(), transport=transport,
+    ))
+    result = asyncio.run(graph.ainvoke({"messages": []}))
+    assert result["step"] == server.settings.chunks - 1